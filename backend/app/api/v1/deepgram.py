@@ -1,13 +1,34 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, Form
-from pydantic import BaseModel
-from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse, StreamingResponse
+from multipart.multipart import parse_options_header
+from starlette.datastructures import UploadFile
+from starlette.formparsers import MultiPartException, MultiPartParser
+from pydantic import BaseModel, ValidationError
+from typing import Awaitable, BinaryIO, Callable, List, Optional, Tuple, Type, Union
 import base64
+import binascii
+import io
+from app.config.settings import settings
+from app.services.audio_relay import AudioRelay, RelayOverflowError
 from app.services.deepgram import deepgram_service
-from app.services.translation import translation_service
+from app.services.live_telemetry import live_telemetry
+from app.services.session_language import SessionLanguage
+from app.services.transcription_jobs import transcription_jobs
+from app.utils.audio_io import AudioTooLargeError, limit_stream, spool_audio
+from app.utils.pcm import AudioFormatError, negotiate_format
+from app.utils.vad import VoiceActivityGate
+from app.utils.word_columns import WordColumns, WordFormat
+from app.services.translation_engine import translation_engine
+from app.services.websocket_manager import manager
 from fastapi import WebSocket, WebSocketDisconnect
 from starlette.websockets import WebSocketState
 import asyncio
 import json
+import logging
+import uuid
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -26,6 +47,11 @@ class DeepgramTranscriptionResponse(BaseModel):
     words: List[dict]
     error: Optional[str] = None
 
+WORD_FORMAT_DESCRIPTION = (
+    "objects: one {word, start, end, confidence} object per word. "
+    "columns: a single {word: [...], start: [...], end: [...], confidence: [...]} object of parallel arrays"
+)
+
 class DeepgramLanguageDetectionRequest(BaseModel):
     audio_data: str  # Base64 encoded audio data
 
@@ -55,58 +81,175 @@ class LanguageInfo(BaseModel):
     code: str
     name: str
 
-@router.post("/transcribe", response_model=DeepgramTranscriptionResponse)
-async def transcribe_audio(request: DeepgramTranscriptionRequest):
+def _audio_body_openapi(model: Type[BaseModel]) -> dict:
+    """OpenAPI request body accepting the JSON model or raw binary audio"""
+    return {
+        "requestBody": {
+            "content": {
+                "application/json": {"schema": model.model_json_schema()},
+                "application/octet-stream": {"schema": {"type": "string", "format": "binary"}}
+            },
+            "required": True
+        }
+    }
+
+async def _read_audio_body(
+    http_request: Request,
+    model: Type[BaseModel],
+    max_size: Optional[int] = None,
+    **params
+) -> Tuple[BaseModel, BinaryIO]:
+    """
+    Read the audio of a request sent either as JSON or as raw binary
+
+    JSON bodies carry base64 ``audio_data`` and their options as fields.
+    Any other body (application/octet-stream, audio/*, chunked uploads) is
+    the audio itself; it is streamed into a spooled buffer without base64
+    or intermediate copies, and the options come from the query string.
+
+    Args:
+        http_request: Incoming request
+        model: Request model used for JSON bodies
+        max_size: Largest raw body accepted, in bytes (default: ``settings.max_file_size``)
+        **params: Query string options used for raw bodies
+
+    Returns:
+        Tuple of the request options and a readable audio stream. The caller
+        must close the stream.
+    """
+    content_type = http_request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type == "application/json":
+        try:
+            request = model.model_validate_json(await http_request.body())
+            return request, io.BytesIO(base64.b64decode(request.audio_data))
+        except ValidationError as e:
+            raise RequestValidationError(e.errors())
+        except binascii.Error:
+            raise HTTPException(status_code=400, detail="audio_data is not valid base64")
+
+    max_size = max_size or settings.max_file_size
+    content_length = http_request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_size:
+        raise HTTPException(status_code=413, detail=str(AudioTooLargeError(max_size)))
+    try:
+        audio = await spool_audio(http_request.stream(), max_size)
+    except AudioTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    return model.model_construct(audio_data="", **params), audio
+
+@router.post(
+    "/transcribe",
+    response_model=DeepgramTranscriptionResponse,
+    openapi_extra=_audio_body_openapi(DeepgramTranscriptionRequest)
+)
+async def transcribe_audio(
+    http_request: Request,
+    language: str = Query("en", description="Language for raw binary bodies"),
+    auto_detect: bool = Query(True, description="Detect the language for raw binary bodies"),
+    word_format: WordFormat = Query("objects", description=WORD_FORMAT_DESCRIPTION)
+):
     """Transcribe audio using Deepgram with optional language detection"""
+    request, audio_data = await _read_audio_body(
+        http_request, DeepgramTranscriptionRequest, language=language, auto_detect=auto_detect
+    )
     try:
-        # Decode base64 audio data
-        audio_data = base64.b64decode(request.audio_data)
-        
-        if request.auto_detect:
-            # First detect language
-            detection_result = await deepgram_service.detect_language(audio_data)
-            if detection_result["success"]:
-                language = detection_result["detected_language"]
-            else:
-                language = request.language
-        else:
-            language = request.language
-        
-        # Transcribe with detected or specified language
-        result = await deepgram_service.transcribe_audio_data(audio_data, language)
-        
-        if result["success"]:
-            return DeepgramTranscriptionResponse(
-                success=True,
-                transcript=result["transcript"],
-                confidence=result["confidence"],
-                detected_language=result["detected_language"],
-                detection_confidence=result["detection_confidence"],
-                is_reliable_detection=result["detection_confidence"] > 0.8,
-                words=result["words"]
-            )
-        else:
-            return DeepgramTranscriptionResponse(
-                success=False,
-                transcript="",
-                confidence=0.0,
-                detected_language="",
-                detection_confidence=0.0,
-                is_reliable_detection=False,
-                words=[],
-                error=result["error"]
-            )
+        # Transcribe with the specified language, or detect it in the same request
+        result = await deepgram_service.transcribe_audio_data(
+            audio_data,
+            request.language,
+            detect_language=request.auto_detect,
+            columnar_words=word_format == "columns"
+        )
+        return _transcription_response(result)
             
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Transcription failed: {str(e)}")
+    finally:
+        audio_data.close()
+
+@router.post(
+    "/transcribe-long",
+    response_model=DeepgramTranscriptionResponse,
+    openapi_extra=_audio_body_openapi(DeepgramTranscriptionRequest)
+)
+async def transcribe_long_audio(
+    http_request: Request,
+    language: str = Query("en", description="Language for raw binary bodies"),
+    auto_detect: bool = Query(True, description="Detect the language for raw binary bodies"),
+    word_format: WordFormat = Query("objects", description=WORD_FORMAT_DESCRIPTION)
+):
+    """
+    Transcribe a long recording as parallel overlapping segments.
+
+    Accepts the same bodies as /transcribe. PCM WAV audio is split at
+    pauses and stitched back onto one timeline; other formats fall back to
+    a single request. Raw bodies may be up to ``long_audio_max_file_size``.
+    """
+    request, audio_data = await _read_audio_body(
+        http_request,
+        DeepgramTranscriptionRequest,
+        max_size=settings.long_audio_max_file_size,
+        language=language,
+        auto_detect=auto_detect
+    )
+    try:
+        result = await deepgram_service.transcribe_long_audio(
+            audio_data,
+            request.language,
+            detect_language=request.auto_detect,
+            columnar_words=word_format == "columns"
+        )
+        return _transcription_response(result)
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Transcription failed: {str(e)}")
+    finally:
+        audio_data.close()
+
+def _transcription_response(result: dict) -> Union[DeepgramTranscriptionResponse, JSONResponse]:
+    """Build the API response for a DeepgramService transcription result"""
+    if result["success"] and isinstance(result["words"], WordColumns):
+        # Columns are serialized directly rather than validated word by word
+        return JSONResponse({
+            "success": True,
+            "transcript": result["transcript"],
+            "confidence": result["confidence"],
+            "detected_language": result["detected_language"],
+            "detection_confidence": result["detection_confidence"],
+            "is_reliable_detection": result["detection_confidence"] > 0.8,
+            "words": result["words"].to_json(),
+            "error": None
+        })
+    if result["success"]:
+        return DeepgramTranscriptionResponse(
+            success=True,
+            transcript=result["transcript"],
+            confidence=result["confidence"],
+            detected_language=result["detected_language"],
+            detection_confidence=result["detection_confidence"],
+            is_reliable_detection=result["detection_confidence"] > 0.8,
+            words=result["words"]
+        )
+    return DeepgramTranscriptionResponse(
+        success=False,
+        transcript="",
+        confidence=0.0,
+        detected_language="",
+        detection_confidence=0.0,
+        is_reliable_detection=False,
+        words=[],
+        error=result["error"]
+    )
 
-@router.post("/detect-language", response_model=DeepgramLanguageDetectionResponse)
-async def detect_language(request: DeepgramLanguageDetectionRequest):
+@router.post(
+    "/detect-language",
+    response_model=DeepgramLanguageDetectionResponse,
+    openapi_extra=_audio_body_openapi(DeepgramLanguageDetectionRequest)
+)
+async def detect_language(http_request: Request):
     """Detect language from audio using Deepgram"""
+    _, audio_data = await _read_audio_body(http_request, DeepgramLanguageDetectionRequest)
     try:
-        # Decode base64 audio data
-        audio_data = base64.b64decode(request.audio_data)
-        
         result = await deepgram_service.detect_language(audio_data)
         
         if result["success"]:
@@ -127,18 +270,29 @@ async def detect_language(request: DeepgramLanguageDetectionRequest):
             
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Language detection failed: {str(e)}")
+    finally:
+        audio_data.close()
 
-@router.post("/translate", response_model=DeepgramTranslationResponse)
-async def translate_audio(request: DeepgramTranslationRequest):
+@router.post(
+    "/translate",
+    response_model=DeepgramTranslationResponse,
+    openapi_extra=_audio_body_openapi(DeepgramTranslationRequest)
+)
+async def translate_audio(
+    http_request: Request,
+    target_language: str = Query("en", description="Target language for raw binary bodies"),
+    auto_detect: bool = Query(True, description="Detect the language for raw binary bodies")
+):
     """Transcribe and translate audio using Deepgram and Google Translate"""
+    request, audio_data = await _read_audio_body(
+        http_request, DeepgramTranslationRequest, target_language=target_language, auto_detect=auto_detect
+    )
     try:
-        # Decode base64 audio data
-        audio_data = base64.b64decode(request.audio_data)
-        
-        # First transcribe the audio
+        # Transcribe the audio, detecting its language in the same request
         transcription_result = await deepgram_service.transcribe_audio_data(
-            audio_data, 
-            "en" if request.auto_detect else "en"  # We'll detect language during transcription
+            audio_data,
+            "en",
+            detect_language=request.auto_detect
         )
         
         if not transcription_result["success"]:
@@ -170,7 +324,7 @@ async def translate_audio(request: DeepgramTranslationRequest):
             )
         
         # Translate the transcript
-        translation_result = translation_service.translate_text(
+        translation_result = await translation_engine.translate_text(
             transcript,
             detected_language,
             request.target_language,
@@ -189,28 +343,99 @@ async def translate_audio(request: DeepgramTranslationRequest):
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Translation failed: {str(e)}")
+    finally:
+        audio_data.close()
+
+# Room for the multipart boundaries and form fields around the file itself
+MULTIPART_OVERHEAD = 64 * 1024
+
+class TranscribeFileOptions(BaseModel):
+    language: str = "en"
+    auto_detect: bool = True
+
+TRANSCRIBE_FILE_OPENAPI = {
+    "requestBody": {
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "properties": {
+                        "file": {"type": "string", "format": "binary"},
+                        **TranscribeFileOptions.model_json_schema()["properties"]
+                    },
+                    "required": ["file"]
+                }
+            }
+        },
+        "required": True
+    }
+}
+
+async def _read_audio_upload(http_request: Request) -> Tuple[UploadFile, TranscribeFileOptions]:
+    """
+    Parse a multipart audio upload without holding it in memory
+
+    The body is read through a size-checking stream, so an oversized upload
+    is rejected as soon as it passes the limit instead of after it has been
+    received. The file part is spooled by the multipart parser (in memory
+    while small, on disk beyond that).
+
+    Args:
+        http_request: Incoming multipart request
+
+    Returns:
+        Tuple of the uploaded file, rewound to the start, and the form options
+    """
+    max_body = settings.max_file_size + MULTIPART_OVERHEAD
+    content_length = http_request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_body:
+        raise HTTPException(status_code=413, detail=str(AudioTooLargeError(settings.max_file_size)))
+
+    content_type, _ = parse_options_header(http_request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data":
+        raise HTTPException(status_code=415, detail="Expected a multipart/form-data upload")
 
-@router.post("/transcribe-file")
-async def transcribe_file(
-    file: UploadFile = File(...),
-    language: str = Form("en"),
-    auto_detect: bool = Form(True)
-):
-    """Transcribe uploaded audio file using Deepgram"""
     try:
-        if not file.filename.lower().endswith(('.wav', '.mp3', '.m4a', '.flac')):
+        parser = MultiPartParser(http_request.headers, limit_stream(http_request.stream(), max_body), max_files=1)
+        form = await parser.parse()
+    except AudioTooLargeError:
+        raise HTTPException(status_code=413, detail=str(AudioTooLargeError(settings.max_file_size)))
+    except MultiPartException as e:
+        raise HTTPException(status_code=400, detail=e.message)
+
+    upload = form.get("file")
+    try:
+        if not isinstance(upload, UploadFile):
+            raise HTTPException(status_code=400, detail="Missing audio file")
+        if upload.size is not None and upload.size > settings.max_file_size:
+            raise HTTPException(status_code=413, detail=str(AudioTooLargeError(settings.max_file_size)))
+        extension = (upload.filename or "").rsplit(".", 1)[-1].lower()
+        if extension not in settings.allowed_audio_formats:
             raise HTTPException(status_code=400, detail="Unsupported audio format")
+        try:
+            options = TranscribeFileOptions.model_validate(
+                {key: value for key, value in form.items() if isinstance(value, str)}
+            )
+        except ValidationError as e:
+            raise RequestValidationError(e.errors())
+    except BaseException:
+        await form.close()
+        raise
+
+    await upload.seek(0)
+    return upload, options
+
+@router.post("/transcribe-file", openapi_extra=TRANSCRIBE_FILE_OPENAPI)
+async def transcribe_file(http_request: Request):
+    """Transcribe uploaded audio file using Deepgram"""
+    file, options = await _read_audio_upload(http_request)
+    language, auto_detect = options.language, options.auto_detect
+    try:
+        # The spooled upload is forwarded as a stream rather than read into bytes
+        audio_data = file.file
         
-        audio_data = await file.read()
-        
-        if auto_detect:
-            # First detect language
-            detection_result = await deepgram_service.detect_language(audio_data)
-            if detection_result["success"]:
-                language = detection_result["detected_language"]
-        
-        # Transcribe with detected or specified language
-        result = await deepgram_service.transcribe_audio_data(audio_data, language)
+        # Transcribe with the specified language, or detect it in the same request
+        result = await deepgram_service.transcribe_audio_data(audio_data, language, detect_language=auto_detect)
         
         if result["success"]:
             return {
@@ -230,31 +455,133 @@ async def transcribe_file(
             
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"File transcription failed: {str(e)}")
+    finally:
+        await file.close()
+
+@router.post(
+    "/transcribe-jobs",
+    status_code=202,
+    openapi_extra=_audio_body_openapi(DeepgramTranscriptionRequest)
+)
+async def submit_transcription_job(
+    http_request: Request,
+    language: str = Query("en", description="Language for raw binary bodies"),
+    auto_detect: bool = Query(True, description="Detect the language for raw binary bodies"),
+    long_audio: bool = Query(False, description="Transcribe as parallel segments, as /transcribe-long does")
+):
+    """
+    Queue audio for background transcription.
+
+    Accepts the same bodies as /transcribe and returns a job id at once;
+    poll /transcribe-jobs/{job_id} or follow /transcribe-jobs/{job_id}/events
+    for progress and the result. With ``long_audio`` raw bodies may be up
+    to ``long_audio_max_file_size``.
+    """
+    request, audio_data = await _read_audio_body(
+        http_request,
+        DeepgramTranscriptionRequest,
+        max_size=settings.long_audio_max_file_size if long_audio else None,
+        language=language,
+        auto_detect=auto_detect
+    )
+    try:
+        job = await transcription_jobs.submit(
+            audio_data,
+            request.language,
+            detect_language=request.auto_detect,
+            provider="deepgram-long" if long_audio else "deepgram"
+        )
+    finally:
+        audio_data.close()
+    return {"job_id": job["id"], "status": job["status"]}
+
+@router.get("/transcribe-jobs/{job_id}")
+async def get_transcription_job(job_id: str):
+    """Get the status, progress and (once completed) result of a transcription job"""
+    job = await transcription_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Transcription job not found or expired")
+    return job
+
+@router.get("/transcribe-jobs/{job_id}/events")
+async def stream_transcription_job(job_id: str):
+    """Stream a transcription job as NDJSON lines, one per update, until it finishes"""
+    if await transcription_jobs.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="Transcription job not found or expired")
+
+    async def job_lines():
+        async for job in transcription_jobs.watch(job_id):
+            yield json.dumps(job, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(job_lines(), media_type="application/x-ndjson")
 
 @router.get("/languages", response_model=List[LanguageInfo])
 async def get_supported_languages():
     """Get list of supported languages for Deepgram"""
     return deepgram_service.get_supported_languages()
 
+@router.get("/live/telemetry")
+async def get_live_telemetry():
+    """Get live transcription telemetry: active sessions and totals for ended ones"""
+    return live_telemetry.snapshot()
+
 @router.get("/status")
 async def get_service_status():
     """Get Deepgram service status"""
     return {
         "available": deepgram_service.is_available(),
-        "api_key_configured": deepgram_service.api_key is not None
+        "api_key_configured": deepgram_service.api_key is not None,
+        "live_pool": deepgram_service.live_pool.get_stats(),
+        "transcription_jobs": transcription_jobs.get_stats(),
+        "transcription_cache": deepgram_service.result_cache.get_stats()
     }
 
-# --- NEW: Live Transcription WebSocket Endpoint ---
-@router.websocket("/ws/live-transcribe")
-async def websocket_live_transcribe(websocket: WebSocket):
+def _negotiate_live_format(websocket: WebSocket) -> dict:
+    """Read the client's audio format from the query string and plan the conversion"""
+    params = websocket.query_params
+    try:
+        sample_rate = int(params['sample_rate']) if params.get('sample_rate') else None
+        channels = int(params['channels']) if params.get('channels') else None
+    except ValueError:
+        raise AudioFormatError("sample_rate and channels must be integers")
+    return negotiate_format(params.get('encoding'), sample_rate, channels)
+
+def _live_vad(websocket: WebSocket, upstream: dict) -> Optional[VoiceActivityGate]:
+    """Voice activity gate for the session, if enabled and the upstream audio is 16-bit mono PCM"""
+    requested = websocket.query_params.get('vad')
+    enabled = settings.live_vad_enabled if requested is None else requested.lower() in ('1', 'true', 'yes', 'on')
+    if not enabled or upstream["encoding"] != "linear16" or upstream["channels"] != 1:
+        return None
+    return VoiceActivityGate(sample_rate=upstream["sample_rate"])
+
+LiveResultHandler = Callable[[dict, str, Optional[str], Optional[float]], Awaitable[None]]
+
+async def _run_live_transcription(websocket: WebSocket, on_result: LiveResultHandler):
     """
-    WebSocket endpoint for live audio transcription using Deepgram.
-    The client should send raw audio chunks (bytes) as binary messages.
-    The server streams these to Deepgram and sends back transcription results as JSON text messages.
-    Now also includes detected language and confidence for each transcript.
+    Run a live transcription session on an accepted websocket
+
+    Negotiates the audio format, gates and relays the client's audio to
+    Deepgram, and tracks the session language and telemetry. Each result
+    with a transcript is passed to ``on_result`` together with its text and
+    the session language and detection confidence.
+
+    Args:
+        websocket: Accepted client websocket sending binary audio
+        on_result: Async callback receiving each transcript result
     """
-    await websocket.accept()
-    print('WebSocket connection accepted')
+    telemetry = live_telemetry.start_session(str(uuid.uuid4()))
+    logger.info(f"Live transcription session {telemetry.session_id} accepted")
+    try:
+        audio_format = _negotiate_live_format(websocket)
+    except AudioFormatError as e:
+        live_telemetry.end_session(telemetry)
+        await websocket.close(code=1003, reason=str(e))
+        return
+    converter = audio_format["converter"]
+    vad = _live_vad(websocket, audio_format["upstream"])
+    relay = AudioRelay()
+    telemetry.vad = vad
+    session_language = SessionLanguage(translation_engine.detect_language)
     try:
         # Get language from query params
         language = websocket.query_params.get('language', 'en')
@@ -265,48 +592,189 @@ async def websocket_live_transcribe(websocket: WebSocket):
                     break
                 try:
                     data = await websocket.receive_bytes()
-                    print(f'Received audio chunk: {len(data)} bytes')
-                    yield data
                 except Exception:
                     break
-        # Stream to Deepgram and send results back
-        async for result in deepgram_service.transcribe_live_audio_stream(audio_stream(), language=language):
-            print(f'Sending transcript: {result}')
-            # Detect language of the transcript using Google Translate
-            transcript = None
+                telemetry.record_frame(len(data))
+                if telemetry.should_log():
+                    logger.debug(f"Session {telemetry.session_id} received audio chunk: {len(data)} bytes")
+                if converter is not None:
+                    data = converter.convert(data)
+                if vad is not None:
+                    data = vad.process(data)
+                if not data:
+                    continue
+                yield data
+        # Stream to Deepgram and hand results back
+        async for result in deepgram_service.transcribe_live_audio_stream(
+            audio_stream(),
+            language=language,
+            relay=relay,
+            telemetry=telemetry,
+            **audio_format["upstream"]
+        ):
+            # Detect the language on final segments only; interims reuse the session language
+            transcript = ''
             if result and result.get('channel') and result['channel'].get('alternatives'):
                 transcript = result['channel']['alternatives'][0].get('transcript', '')
             detected_language = None
             detection_confidence = None
             if transcript and transcript.strip():
-                try:
-                    detection = translation_service.detect_language(transcript)
-                    detected_language = detection.get('detected_language', '')
-                    detection_confidence = detection.get('confidence', 0.0)
-                except Exception as e:
-                    print(f'Language detection error: {e}')
-            # Send transcript + language detection to frontend
-            await websocket.send_json({
-                'result': result,
-                'detected_language': detected_language,
-                'detection_confidence': detection_confidence
-            })
+                detected_language, detection_confidence = await session_language.observe(
+                    transcript, bool(result.get('is_final'))
+                )
+            await on_result(result, transcript, detected_language, detection_confidence)
     except WebSocketDisconnect:
-        print('WebSocket disconnected')
-        pass
+        logger.info(f"Live transcription session {telemetry.session_id} disconnected")
+    except RelayOverflowError as e:
+        logger.warning(f"Live transcription session {telemetry.session_id} relay overflow: {e}")
+        await websocket.close(code=1013, reason=str(e))
     except Exception as e:
-        print(f'WebSocket error: {e}')
+        logger.error(f"Live transcription session {telemetry.session_id} error: {e}")
         await websocket.close(code=1011, reason=f"Internal error: {e}")
+    finally:
+        live_telemetry.end_session(telemetry)
+
+# --- NEW: Live Transcription WebSocket Endpoint ---
+@router.websocket("/ws/live-transcribe")
+async def websocket_live_transcribe(websocket: WebSocket):
+    """
+    WebSocket endpoint for live audio transcription using Deepgram.
+    The client should send raw audio chunks (bytes) as binary messages.
+    The server streams these to Deepgram and sends back transcription results as JSON text messages.
+    Now also includes detected language and confidence for each transcript.
+
+    The client declares its audio format with the ``encoding`` (linear16,
+    linear32, float32 or a compressed Deepgram encoding), ``sample_rate``
+    (default 44100) and ``channels`` (default 1) query params. Raw PCM is
+    downmixed and resampled to 16 kHz mono linear16 before it is forwarded;
+    audio already in that format, and compressed audio, is sent untouched.
+
+    With ``vad=true`` (default: the ``live_vad_enabled`` setting) silent PCM
+    frames are dropped before they reach Deepgram; the upstream session is
+    kept open with KeepAlive messages meanwhile.
+    """
+    await websocket.accept()
+
+    async def send_result(result, transcript, detected_language, detection_confidence):
+        # Send transcript + language detection to frontend
+        await websocket.send_json({
+            'result': result,
+            'detected_language': detected_language,
+            'detection_confidence': detection_confidence
+        })
+
+    await _run_live_transcription(websocket, send_result)
+
+@router.websocket("/ws/live-captions")
+async def websocket_live_captions(websocket: WebSocket):
+    """
+    WebSocket endpoint for audio in, translated captions out.
+
+    Combines /ws/live-transcribe, /ws/live-translate and the room relay of
+    /ws/translations in one server-side pipeline. The ``room_id`` and
+    ``user_id`` query params identify the speaker, who must have joined the
+    room over /ws/translations; the audio format params are those of
+    /ws/live-transcribe. The speaker receives the same transcript messages
+    as on /ws/live-transcribe. Each final segment is translated once per
+    target language of the other participants and delivered to them as a
+    "translation" message, in order, without blocking the transcript stream.
+    """
+    room_id = websocket.query_params.get('room_id')
+    user_id = websocket.query_params.get('user_id')
+    await websocket.accept()
+    if not room_id or not user_id:
+        await websocket.close(code=1008, reason="room_id and user_id are required")
+        return
+    if user_id not in manager.rooms.get(room_id, {}):
+        await websocket.close(code=1008, reason="Join the room over /ws/translations first")
+        return
+
+    language = websocket.query_params.get('language', 'en')
+    captions: asyncio.Queue = asyncio.Queue()
+
+    async def deliver_captions():
+        while True:
+            utterance = await captions.get()
+            if utterance is None:
+                return
+            try:
+                await manager.handle_utterance(room_id, user_id, utterance)
+            except Exception as e:
+                logger.error(f"Live caption delivery failed in room {room_id}: {e}")
+
+    async def handle_result(result, transcript, detected_language, detection_confidence):
+        await websocket.send_json({
+            'result': result,
+            'detected_language': detected_language,
+            'detection_confidence': detection_confidence
+        })
+        if result.get('is_final') and transcript.strip():
+            captions.put_nowait({
+                'text': transcript,
+                'sourceLanguage': detected_language or language
+            })
+
+    delivery_task = asyncio.create_task(deliver_captions())
+    try:
+        await _run_live_transcription(websocket, handle_result)
+    finally:
+        # Let captions already queued reach the room
+        captions.put_nowait(None)
+        await delivery_task
 
 @router.websocket("/ws/live-translate")
 async def websocket_live_translate(websocket: WebSocket):
     """
     WebSocket endpoint for real-time translation.
-    The client sends JSON messages: {"text": ..., "target_language": ...}
-    The server responds with JSON: {"translated_text": ..., "target_language": ...}
+    The client sends JSON messages: {"text": ..., "target_language": ..., "utterance_id": ...}
+    The server responds with JSON: {"translated_text": ..., "target_language": ..., "utterance_id": ...}
+
+    ``utterance_id`` is optional. When a newer text arrives for the same
+    utterance, the translation still in flight or queued for the older text
+    is cancelled, so only the latest version is translated and sent back.
+    Messages without an id are translated one after another as before.
+
+    With ``"mode": "incremental"`` growing partials are translated segment by
+    segment and settled segments are reused for the rest of the connection.
     """
     await websocket.accept()
-    print('Live-translate WebSocket connection accepted')
+    logger.info('Live-translate WebSocket connection accepted')
+    in_flight = {}
+    send_lock = asyncio.Lock()
+    stream_id = str(uuid.uuid4())
+
+    async def translate_and_send(text, target_language, utterance_id=None, incremental=False):
+        try:
+            # Use translation_engine to translate without blocking the event loop
+            if incremental:
+                result = await translation_engine.translate_incremental(
+                    stream_id,
+                    text,
+                    target_language=target_language
+                )
+            else:
+                result = await translation_engine.translate_text(
+                    text,
+                    target_language=target_language
+                )
+            response = {
+                'translated_text': result['translated_text'],
+                'target_language': target_language
+            }
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f'Live-translate error: {e}')
+            response = {'error': str(e)}
+        if utterance_id is not None:
+            response['utterance_id'] = utterance_id
+        async with send_lock:
+            await websocket.send_json(response)
+
+    def forget(utterance_id, task):
+        if in_flight.get(utterance_id) is task:
+            del in_flight[utterance_id]
+
     try:
         while True:
             data = await websocket.receive_text()
@@ -314,24 +782,31 @@ async def websocket_live_translate(websocket: WebSocket):
                 payload = json.loads(data)
                 text = payload.get('text', '')
                 target_language = payload.get('target_language', 'en')
+                utterance_id = payload.get('utterance_id')
+                incremental = payload.get('mode') == 'incremental'
                 if not text.strip():
                     continue
-                # Use translation_service to translate
-                result = translation_service.translate_text(
-                    text,
-                    target_language=target_language
-                )
-                response = {
-                    'translated_text': result['translated_text'],
-                    'target_language': target_language
-                }
-                await websocket.send_json(response)
+                if utterance_id is None:
+                    await translate_and_send(text, target_language, incremental=incremental)
+                    continue
+                # Supersede the previous version of this utterance
+                previous = in_flight.get(utterance_id)
+                if previous is not None and not previous.done():
+                    previous.cancel()
+                task = asyncio.create_task(translate_and_send(text, target_language, utterance_id, incremental))
+                in_flight[utterance_id] = task
+                task.add_done_callback(lambda t, uid=utterance_id: forget(uid, t))
             except Exception as e:
-                print(f'Live-translate error: {e}')
-                await websocket.send_json({'error': str(e)})
+                logger.error(f'Live-translate error: {e}')
+                async with send_lock:
+                    await websocket.send_json({'error': str(e)})
     except WebSocketDisconnect:
-        print('Live-translate WebSocket disconnected')
+        logger.info('Live-translate WebSocket disconnected')
         pass
     except Exception as e:
-        print(f'Live-translate WebSocket error: {e}')
-        await websocket.close(code=1011, reason=f"Internal error: {e}") 
\ No newline at end of file
+        logger.error(f'Live-translate WebSocket error: {e}')
+        await websocket.close(code=1011, reason=f"Internal error: {e}")
+    finally:
+        for task in in_flight.values():
+            task.cancel()
+        translation_engine.end_stream(stream_id)
@@ -1,9 +1,15 @@
-from fastapi import APIRouter
-from pydantic import BaseModel
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
 from typing import List, Optional
-from app.services.translation import translation_service
+import json
+import logging
+from app.config.settings import settings
+from app.services.translation_engine import translation_engine
 from app.services.tts import tts_service
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 class TranslationRequest(BaseModel):
@@ -11,15 +17,35 @@ class TranslationRequest(BaseModel):
     source_language: str = "en"
     target_language: str = "es"
     enable_punctuation: bool = True
+    bypass_cache: bool = False
 
 class TranslationWithDetectionRequest(BaseModel):
     text: str
     target_language: str = "en"
     auto_detect: bool = True
     enable_punctuation: bool = True
+    bypass_cache: bool = False
+
+class LongTranslationRequest(BaseModel):
+    text: str
+    source_language: str = "en"
+    target_language: str = "es"
+    max_chunk_chars: Optional[int] = Field(None, ge=200, le=settings.translation_max_chunk_chars)
+    stream: bool = False
+
+class BatchTranslationItem(BaseModel):
+    text: str
+    source_language: str = "en"
+    target_language: str = "es"
+
+class BatchTranslationRequest(BaseModel):
+    items: List[BatchTranslationItem]
+    enable_punctuation: bool = True
+    bypass_cache: bool = False
 
 class LanguageDetectionRequest(BaseModel):
     text: str
+    bypass_cache: bool = False
 
 class TranslationResponse(BaseModel):
     original_text: str
@@ -66,31 +92,105 @@ class TTSResponse(BaseModel):
 
 @router.post("/translate", response_model=TranslationResponse)
 async def translate_text(request: TranslationRequest):
-    result = translation_service.translate_text(
+    result = await translation_engine.translate_text(
         text=request.text,
         source_language=request.source_language,
         target_language=request.target_language,
-        enable_punctuation=request.enable_punctuation
+        enable_punctuation=request.enable_punctuation,
+        use_cache=not request.bypass_cache
     )
     return TranslationResponse(**result)
 
+@router.post("/translate-long")
+async def translate_long_text(request: LongTranslationRequest):
+    """
+    Translate a long text as concurrently translated sentence chunks.
+
+    With ``stream`` set, chunks are returned as NDJSON lines in completion
+    order, each with its ``index``; a final ``{"done": true}`` line follows.
+    """
+    if not request.stream:
+        if request.source_language == request.target_language:
+            result = await translation_engine.translate_text(
+                request.text, request.source_language, request.target_language
+            )
+        else:
+            result = await translation_engine.translate_long_text(
+                request.text, request.source_language, request.target_language, request.max_chunk_chars
+            )
+        return TranslationResponse(**result)
+
+    async def chunk_lines():
+        count = 0
+        try:
+            async for index, original, translated in translation_engine.iter_translate_long_text(
+                request.text, request.source_language, request.target_language, request.max_chunk_chars
+            ):
+                count += 1
+                yield json.dumps({
+                    "index": index,
+                    "original_text": original,
+                    "translated_text": translated
+                }, ensure_ascii=False) + "\n"
+        except Exception as e:
+            logger.error(f"Long text translation failed after {count} chunks: {e}")
+            yield json.dumps({"error": str(e)}) + "\n"
+            return
+        yield json.dumps({"done": True, "chunks": count}) + "\n"
+
+    return StreamingResponse(chunk_lines(), media_type="application/x-ndjson")
+
+@router.post("/translate-batch")
+async def translate_batch(request: BatchTranslationRequest):
+    """
+    Translate many items in one request.
+
+    Items are grouped by language pair for batched upstream calls. Results
+    stream back as NDJSON lines in completion order, each carrying the item
+    ``index``; an item that fails gets an ``error`` line without affecting
+    the rest.
+    """
+    if len(request.items) > settings.translation_batch_max_items:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {settings.translation_batch_max_items} items per batch"
+        )
+
+    items = [(item.text, item.source_language, item.target_language) for item in request.items]
+
+    async def result_lines():
+        async for index, result in translation_engine.iter_translate_items(
+            items,
+            enable_punctuation=request.enable_punctuation,
+            use_cache=not request.bypass_cache
+        ):
+            yield json.dumps({"index": index, **result}, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(result_lines(), media_type="application/x-ndjson")
+
 @router.post("/translate-with-detection", response_model=TranslationWithDetectionResponse)
 async def translate_with_detection(request: TranslationWithDetectionRequest):
     """Translate text with automatic language detection"""
-    result = translation_service.translate_with_detection(
+    result = await translation_engine.translate_with_detection(
         text=request.text,
         target_language=request.target_language,
         auto_detect=request.auto_detect,
-        enable_punctuation=request.enable_punctuation
+        enable_punctuation=request.enable_punctuation,
+        use_cache=not request.bypass_cache
     )
     return TranslationWithDetectionResponse(**result)
 
 @router.post("/detect-language", response_model=LanguageDetectionResponse)
 async def detect_language(request: LanguageDetectionRequest):
     """Detect the language of the input text"""
-    result = translation_service.detect_language(request.text)
+    result = await translation_engine.detect_language(request.text, use_cache=not request.bypass_cache)
     return LanguageDetectionResponse(**result)
 
+@router.get("/cache/stats")
+async def get_cache_stats():
+    """Get translation cache hit, miss and eviction counters for this worker"""
+    return translation_engine.cache.get_stats()
+
 @router.get("/languages")
 def get_languages():
     raise NotImplementedError("Languages endpoint must be implemented with real data.")
@@ -0,0 +1,231 @@
+"""
+Bulk transcription of audio archives.
+
+Runs DeepgramService over every audio file in a directory (recursively)
+or listed in a manifest, a bounded number at a time, and appends one JSON
+line per file to the output. The output doubles as the checkpoint:
+re-running with the same output skips files that already succeeded and
+retries the ones that failed.
+
+Usage (from the backend directory):
+    python -m app.cli.bulk_transcribe recordings/ -o results.jsonl --concurrency 8
+    python -m app.cli.bulk_transcribe manifest.jsonl -o results.jsonl --long-audio
+
+A manifest is a text file with one audio path per line, or a JSONL file of
+``{"path": ..., "language": ...}`` objects. Relative paths are resolved
+against the manifest's directory.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+import wave
+from typing import Any, Dict, IO, List, Optional, Set, Tuple
+
+from app.config.settings import settings
+from app.services.deepgram import deepgram_service
+from app.utils.word_columns import WORD_FORMATS, WordColumns, WordFormat
+
+logger = logging.getLogger(__name__)
+
+# (absolute path, language override)
+AudioItem = Tuple[str, Optional[str]]
+
+
+def discover(source: str, extensions: Optional[List[str]] = None) -> List[AudioItem]:
+    """
+    List the audio files to transcribe
+
+    Args:
+        source: Directory to walk, or a manifest file
+        extensions: Audio file extensions picked up from directories
+
+    Returns:
+        Sorted list of (absolute path, language override) pairs
+    """
+    extensions = extensions or settings.allowed_audio_formats
+    if os.path.isdir(source):
+        items = []
+        for root, _, names in os.walk(source):
+            for name in names:
+                if os.path.splitext(name)[1].lstrip(".").lower() in extensions:
+                    items.append((os.path.abspath(os.path.join(root, name)), None))
+        return sorted(items)
+
+    base = os.path.dirname(os.path.abspath(source))
+    items = []
+    with open(source, "r", encoding="utf-8") as manifest:
+        for line in manifest:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line.startswith("{"):
+                entry = json.loads(line)
+                path, language = entry["path"], entry.get("language")
+            else:
+                path, language = line, None
+            items.append((os.path.abspath(os.path.join(base, path)), language))
+    return items
+
+
+def load_checkpoint(output_path: str) -> Set[str]:
+    """Paths that already have a successful line in the output"""
+    completed = set()
+    if not os.path.exists(output_path):
+        return completed
+    with open(output_path, "r", encoding="utf-8") as output:
+        for line in output:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A line cut short by an interrupted run
+                continue
+            if record.get("success"):
+                completed.add(record["path"])
+    return completed
+
+
+def open_output(output_path: str) -> IO[str]:
+    """Open the output for appending, ending any line cut short by an interrupted run"""
+    output = open(output_path, "a+", encoding="utf-8")
+    if output.tell():
+        output.seek(output.tell() - 1)
+        if output.read(1) != "\n":
+            output.write("\n")
+    return output
+
+
+def audio_duration(path: str, result: Dict[str, Any]) -> float:
+    """Audio length in seconds from the WAV header, else the end of the last word"""
+    try:
+        with wave.open(path, "rb") as wav:
+            return wav.getnframes() / wav.getframerate()
+    except (wave.Error, EOFError, OSError):
+        pass
+    words = result.get("words") or []
+    if isinstance(words, WordColumns):
+        return words.end[-1] if len(words) else 0.0
+    return (words[-1].get("end") or 0.0) if words else 0.0
+
+
+async def transcribe_all(
+    items: List[AudioItem],
+    output: IO[str],
+    concurrency: int,
+    language: str = "en",
+    detect_language: bool = False,
+    long_audio: bool = False,
+    word_format: WordFormat = "objects",
+    completed: Optional[Set[str]] = None
+) -> Dict[str, Any]:
+    """
+    Transcribe files with at most ``concurrency`` in flight, appending results to ``output``
+
+    Returns:
+        Summary counters and throughput figures
+    """
+    completed = completed or set()
+    pending = [item for item in items if item[0] not in completed]
+    summary = {
+        "files": len(items),
+        "skipped": len(items) - len(pending),
+        "succeeded": 0,
+        "failed": 0,
+        "audio_seconds": 0.0
+    }
+    transcribe = deepgram_service.transcribe_long_audio if long_audio else deepgram_service.transcribe_audio_data
+    queue = iter(pending)
+    started = time.monotonic()
+
+    async def worker():
+        for path, item_language in queue:
+            file_started = time.monotonic()
+            try:
+                with open(path, "rb") as audio:
+                    result = await transcribe(
+                        audio,
+                        item_language or language,
+                        detect_language=detect_language and item_language is None,
+                        columnar_words=word_format == "columns"
+                    )
+            except Exception as e:
+                result = {"success": False, "error": str(e)}
+
+            record = {"path": path, "elapsed_seconds": round(time.monotonic() - file_started, 3)}
+            if result.get("success"):
+                duration = audio_duration(path, result)
+                summary["succeeded"] += 1
+                summary["audio_seconds"] += duration
+                record["audio_seconds"] = round(duration, 3)
+                logger.info(f"Transcribed {path} ({duration:.1f}s of audio)")
+            else:
+                summary["failed"] += 1
+                logger.warning(f"Failed to transcribe {path}: {result.get('error')}")
+            if isinstance(result.get("words"), WordColumns):
+                result = {**result, "words": result["words"].to_json()}
+            output.write(json.dumps({**record, **result}, ensure_ascii=False) + "\n")
+            output.flush()
+
+    await asyncio.gather(*(worker() for _ in range(max(1, min(concurrency, len(pending) or 1)))))
+
+    elapsed = time.monotonic() - started
+    processed = summary["succeeded"] + summary["failed"]
+    summary["elapsed_seconds"] = elapsed
+    summary["files_per_minute"] = processed / elapsed * 60 if elapsed else 0.0
+    summary["audio_hours_per_hour"] = summary["audio_seconds"] / elapsed if elapsed else 0.0
+    return summary
+
+
+def format_summary(summary: Dict[str, Any]) -> str:
+    return (
+        f"{summary['succeeded']} succeeded, {summary['failed']} failed, "
+        f"{summary['skipped']} skipped (already done) of {summary['files']} files in "
+        f"{summary['elapsed_seconds']:.1f}s\n"
+        f"{summary['files_per_minute']:.1f} files/min, "
+        f"{summary['audio_seconds'] / 3600:.2f} audio hours at "
+        f"{summary['audio_hours_per_hour']:.1f} audio-hours/hour"
+    )
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Transcribe a directory or manifest of audio files with Deepgram")
+    parser.add_argument("source", help="Directory of audio files, or a manifest (.txt paths or .jsonl objects)")
+    parser.add_argument("-o", "--output", required=True, help="JSONL results file; also the resume checkpoint")
+    parser.add_argument("-c", "--concurrency", type=int, default=4, help="Files transcribed at once (default: 4)")
+    parser.add_argument("-l", "--language", default="en", help="Language of the recordings (default: en)")
+    parser.add_argument("--detect-language", action="store_true", help="Let Deepgram detect each file's language")
+    parser.add_argument("--long-audio", action="store_true", help="Split long WAV recordings into parallel segments")
+    parser.add_argument("--word-format", choices=WORD_FORMATS, default="objects", help="Word layout in the output")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    if not deepgram_service.is_available():
+        print("Deepgram is not configured: set DEEPGRAM_API_KEY", file=sys.stderr)
+        return 2
+
+    items = discover(args.source)
+    completed = load_checkpoint(args.output)
+    with open_output(args.output) as output:
+        summary = asyncio.run(transcribe_all(
+            items,
+            output,
+            args.concurrency,
+            language=args.language,
+            detect_language=args.detect_language,
+            long_audio=args.long_audio,
+            word_format=args.word_format,
+            completed=completed
+        ))
+    print(format_summary(summary))
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
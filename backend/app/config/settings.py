@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List, Optional
+from typing import Dict, List, Optional
 import os
 
 class Settings(BaseSettings):
@@ -55,6 +55,51 @@ class Settings(BaseSettings):
     
     # Deepgram settings
     deepgram_api_key: Optional[str] = None
+    deepgram_live_url: str = "wss://api.deepgram.com/v1/listen"
+    deepgram_pool_size: int = 2  # Pre-opened live connections per option set (0 disables)
+    deepgram_keepalive_seconds: float = 5.0  # KeepAlive cadence for idle or silent live connections
+    deepgram_pool_max_idle_seconds: float = 300.0
+    deepgram_pool_warm_languages: List[str] = ["en"]
+    
+    # Live transcription voice activity settings
+    live_vad_enabled: bool = False  # Clients can override with ?vad=true|false
+    live_vad_energy_threshold_db: float = -45.0
+    live_vad_pre_roll_ms: int = 300
+    live_vad_hangover_ms: int = 400
+    
+    # Live transcription language settings
+    live_language_switch_after: int = 2  # Consecutive disagreeing finals before the session language changes
+    live_language_min_chars: int = 12  # Shorter finals are not sent to detection
+    
+    # Live audio relay settings
+    live_relay_max_chunks: int = 50  # Chunks buffered between the client and Deepgram
+    live_relay_overflow_policy: str = "block"  # block, drop_oldest or disconnect
+    live_telemetry_log_sample_rate: int = 100  # Debug-log one in N audio chunks / upstream messages
+    
+    # Transcription cache settings
+    transcription_cache_enabled: bool = True
+    transcription_cache_ttl_seconds: int = 7 * 86400
+    transcription_cache_redis_enabled: bool = True
+    transcription_cache_redis_max_bytes: int = 256 * 1024  # Larger results are kept on local disk
+    transcription_cache_dir: Optional[str] = None  # Defaults to a per-user directory under the system temp dir
+    transcription_cache_disk_max_bytes: int = 512 * 1024 * 1024  # Least recently used results are evicted past this
+    
+    # Long audio transcription settings
+    long_audio_segment_seconds: float = 300.0  # Nominal segment length before searching for a pause
+    long_audio_search_seconds: float = 15.0  # How far from the nominal boundary a cut may move
+    long_audio_overlap_seconds: float = 2.0  # Context added on both sides of every cut
+    long_audio_parallelism: int = 4  # Segments of one recording transcribed at once
+    long_audio_max_file_size: int = 500 * 1024 * 1024  # Raw body limit for /transcribe-long and long_audio jobs
+    
+    # Transcription job settings
+    transcription_jobs_workers: int = 4  # Jobs processed at once by this process
+    transcription_jobs_provider_limits: Dict[str, int] = {"deepgram": 4, "deepgram-long": 1}  # Concurrent jobs per provider
+    transcription_jobs_max_attempts: int = 3
+    transcription_jobs_backoff_seconds: float = 2.0  # Doubled after every failed attempt
+    transcription_jobs_result_ttl_seconds: int = 3600  # How long finished jobs can be fetched
+    transcription_jobs_lease_seconds: int = 30  # A job held by a silent worker this long is requeued
+    transcription_jobs_redis_enabled: bool = True
+    transcription_jobs_spool_dir: Optional[str] = None  # Defaults to a per-user directory under the system temp dir
     
     # Sentry settings
     sentry_dsn: Optional[str] = None
@@ -65,7 +110,8 @@ class Settings(BaseSettings):
     
     # File upload settings
     max_file_size: int = 10 * 1024 * 1024  # 10MB
-    allowed_audio_formats: List[str] = ["wav", "mp3", "m4a", "ogg"]
+    audio_spool_max_memory: int = 1024 * 1024  # Larger audio bodies spill to a temp file
+    allowed_audio_formats: List[str] = ["wav", "mp3", "m4a", "ogg", "flac"]
     
     # Rate limiting
     rate_limit_requests: int = 1000
@@ -82,6 +128,24 @@ class Settings(BaseSettings):
         "en", "es", "fr", "de", "it", "pt", "ru", "ja", "ko", "zh"
     ]
     
+    # Translation engine settings
+    translation_max_concurrency: int = 8  # Parallel upstream calls per worker
+    translation_timeout_seconds: float = 10.0  # Per-call upstream timeout
+    translation_batch_window_ms: int = 10  # Coalescing window, 0 disables batching
+    translation_batch_max_size: int = 32  # Texts per upstream request
+    translation_batch_max_chars: int = 5000  # Characters per upstream request
+    translation_cache_max_entries: int = 10000  # In-process LRU size
+    translation_cache_ttl_seconds: int = 3600
+    translation_cache_redis_enabled: bool = True
+    translation_cache_redis_ttl_seconds: int = 86400
+    language_detection_local_threshold: float = 0.9  # Below this, ask the cloud API
+    language_detection_min_latin_letters: int = 20  # Shorter Latin text is never trusted locally
+    language_detection_min_trigram_coverage: float = 0.4  # Latin text fitting its best profile worse is never trusted locally
+    streaming_translation_max_segments: int = 256  # Cached segments per live session
+    translation_max_chunk_chars: int = 2000  # Longer texts are split on sentence boundaries
+    translation_long_text_parallelism: int = 4  # Chunks of one text translated at once
+    translation_batch_max_items: int = 1000  # Items per /translate-batch request
+    
     # Meeting settings
     max_meeting_participants: int = 50
     meeting_timeout_minutes: int = 120
@@ -9,6 +9,9 @@ from contextlib import asynccontextmanager
 from app.config.settings import settings
 from app.middleware.logging import LoggingMiddleware
 from app.services.websocket_manager import manager
+from app.services.translation_engine import translation_engine, TranslationTimeoutError
+from app.services.deepgram import deepgram_service
+from app.services.transcription_jobs import transcription_jobs
 from app.api.v1 import auth, meetings, transcripts, translation, users, deepgram
 
 # Configure logging
@@ -35,9 +38,14 @@ if settings.sentry_dsn:
 async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting LinguaLive API server...")
+    deepgram_service.warm_live_connections(settings.deepgram_pool_warm_languages)
+    await transcription_jobs.start()
     yield
     # Shutdown
     logger.info("Shutting down LinguaLive API server...")
+    await transcription_jobs.shutdown()
+    await deepgram_service.live_pool.close()
+    await translation_engine.shutdown()
 
 app = FastAPI(
     title="LinguaLive API",
@@ -112,6 +120,8 @@ async def websocket_translations(websocket: WebSocket):
                     
                     if message.get("type") == "translation":
                         await manager.handle_translation(room_id, user_id, message)
+                    elif message.get("type") == "utterance":
+                        await manager.handle_utterance(room_id, user_id, message)
                     elif message.get("type") == "update_settings":
                         await manager.handle_settings_update(room_id, user_id, message.get("settings", {}))
                     elif message.get("type") == "ping":
@@ -359,6 +369,15 @@ async def websocket_stats():
     except Exception as e:
         return {"status": "error", "error": str(e)}
 
+@app.exception_handler(TranslationTimeoutError)
+async def translation_timeout_handler(request: Request, exc: TranslationTimeoutError):
+    """Report upstream translation timeouts as a gateway timeout"""
+    logger.warning(f"Translation timeout: {exc}")
+    return JSONResponse(
+        status_code=504,
+        content={"detail": str(exc)}
+    )
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """Global exception handler"""
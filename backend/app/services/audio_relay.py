@@ -0,0 +1,100 @@
+import asyncio
+import logging
+import time
+from typing import Optional, Tuple
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+OVERFLOW_POLICIES = ("block", "drop_oldest", "disconnect")
+
+_END_OF_STREAM = None
+
+
+class RelayOverflowError(RuntimeError):
+    """Raised when the relay is full and its policy is to disconnect"""
+
+
+class AudioRelay:
+    """
+    Bounded queue between a live client and the upstream recognizer.
+
+    The client side ``put``s chunks and the upstream side iterates them.
+    When the queue is full the overflow policy decides what happens:
+    ``block`` waits for room (backpressure onto the client connection),
+    ``drop_oldest`` discards the oldest queued chunk, and ``disconnect``
+    raises ``RelayOverflowError``. Queue depth and queueing lag are
+    tracked for the session.
+    """
+
+    def __init__(self, max_chunks: Optional[int] = None, overflow_policy: Optional[str] = None):
+        self.max_chunks = max_chunks or settings.live_relay_max_chunks
+        self.overflow_policy = overflow_policy or settings.live_relay_overflow_policy
+        if self.overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {self.overflow_policy}")
+        self._queue: "asyncio.Queue[Optional[Tuple[float, bytes]]]" = asyncio.Queue(self.max_chunks)
+        self._closed = False
+        self.stats = {
+            "enqueued": 0,
+            "forwarded": 0,
+            "dropped": 0,
+            "dropped_bytes": 0,
+            "max_depth": 0,
+            "total_lag_ms": 0.0,
+            "max_lag_ms": 0.0
+        }
+
+    async def put(self, chunk: bytes):
+        """
+        Queue a chunk for upstream
+
+        Raises:
+            RelayOverflowError: When the queue is full under the ``disconnect`` policy
+        """
+        item = (time.monotonic(), chunk)
+        if self._queue.full():
+            if self.overflow_policy == "disconnect":
+                raise RelayOverflowError(f"Audio relay overflow ({self.max_chunks} chunks queued)")
+            if self.overflow_policy == "drop_oldest":
+                _, dropped = self._queue.get_nowait()
+                self.stats["dropped"] += 1
+                self.stats["dropped_bytes"] += len(dropped)
+        await self._queue.put(item)
+        self.stats["enqueued"] += 1
+        self.stats["max_depth"] = max(self.stats["max_depth"], self._queue.qsize())
+
+    def close(self):
+        """Mark the end of the client stream; queued chunks are still delivered"""
+        if self._closed:
+            return
+        self._closed = True
+        # Wakes a consumer waiting on an empty queue; a full queue is drained
+        # first and the consumer then sees the relay closed
+        if not self._queue.full():
+            self._queue.put_nowait(_END_OF_STREAM)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> bytes:
+        if self._closed and self._queue.empty():
+            raise StopAsyncIteration
+        item = await self._queue.get()
+        if item is _END_OF_STREAM:
+            raise StopAsyncIteration
+        enqueued_at, chunk = item
+        lag_ms = (time.monotonic() - enqueued_at) * 1000
+        self.stats["forwarded"] += 1
+        self.stats["total_lag_ms"] += lag_ms
+        self.stats["max_lag_ms"] = max(self.stats["max_lag_ms"], lag_ms)
+        return chunk
+
+    def get_stats(self) -> dict:
+        """Get relay statistics"""
+        stats = dict(self.stats)
+        stats["depth"] = self._queue.qsize()
+        stats["avg_lag_ms"] = round(stats.pop("total_lag_ms") / stats["forwarded"], 3) if stats["forwarded"] else 0.0
+        stats["max_lag_ms"] = round(stats["max_lag_ms"], 3)
+        stats["overflow_policy"] = self.overflow_policy
+        return stats
@@ -1,12 +1,21 @@
 import asyncio
 import logging
 import os
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple, Union, BinaryIO
+import io
+import wave
 from deepgram import DeepgramClient, PrerecordedOptions
 from app.config.settings import settings
 from deepgram import LiveOptions
+from urllib.parse import urlencode
 import websockets
 import json
+from app.services.audio_relay import AudioRelay
+from app.services.deepgram_pool import KEEPALIVE_MESSAGE, LiveConnectionPool
+from app.services.live_telemetry import LiveSessionTelemetry
+from app.services.transcription_cache import TranscriptionCache, hash_audio
+from app.utils.audio_segmentation import AudioSegment, encode_wav, plan_segments, read_wav, stitch_words
+from app.utils.word_columns import WordColumns
 
 logger = logging.getLogger(__name__)
 
@@ -19,67 +28,119 @@ class DeepgramService:
         else:
             self.client = DeepgramClient(self.api_key)
             self.live_client = self.client.listen.asyncwebsocket.v("1")
+        self.live_pool = LiveConnectionPool(self._open_live_connection)
+        self.result_cache = TranscriptionCache()
     
     def is_available(self) -> bool:
         """Check if Deepgram service is available"""
         return self.client is not None and self.api_key is not None
     
-    async def transcribe_audio_file(self, audio_file_path: str, language: str = "en") -> Dict[str, Any]:
+    def _prerecorded_options(self, language: Optional[str] = "en", detect_language: bool = False) -> PrerecordedOptions:
+        """Build prerecorded options; with detect_language the language is left to Deepgram"""
+        if detect_language:
+            return PrerecordedOptions(
+                model="nova-2",
+                detect_language=True,
+                smart_format=True,
+                punctuate=True,
+                diarize=True,
+                utterances=True
+            )
+        return PrerecordedOptions(
+            model="nova-2",
+            language=language,
+            smart_format=True,
+            punctuate=True,
+            diarize=True,
+            utterances=True
+        )
+
+    @staticmethod
+    def _as_stream(audio_data: Union[bytes, BinaryIO]) -> BinaryIO:
+        """Wrap raw bytes in a stream; file-like audio is passed through without copying"""
+        if isinstance(audio_data, (bytes, bytearray, memoryview)):
+            return io.BytesIO(audio_data)
+        return audio_data
+
+    async def _prerecorded(self, audio, options: PrerecordedOptions):
+        """Send one prerecorded transcription request to Deepgram"""
+        return await self.client.transcription.prerecorded(audio, options)
+
+    async def transcribe_audio_file(
+        self,
+        audio_file_path: str,
+        language: str = "en",
+        detect_language: bool = False
+    ) -> Dict[str, Any]:
         if not self.is_available():
             raise RuntimeError("Deepgram service is not available")
         try:
             with open(audio_file_path, 'rb') as audio:
-                options = PrerecordedOptions(
-                    model="nova-2",
-                    language=language,
-                    smart_format=True,
-                    punctuate=True,
-                    diarize=True,
-                    utterances=True
-                )
-                response = await self.client.transcription.prerecorded(audio, options)
+                options = self._prerecorded_options(language, detect_language)
+                response = await self._prerecorded(audio, options)
                 return self._parse_response(response, language)
         except Exception as e:
             logger.error(f"Deepgram transcription error: {e}")
             return self._error_response(str(e))
 
-    async def transcribe_audio_data(self, audio_data: bytes, language: str = "en") -> Dict[str, Any]:
+    async def transcribe_audio_data(
+        self,
+        audio_data: Union[bytes, BinaryIO],
+        language: str = "en",
+        detect_language: bool = False,
+        columnar_words: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Transcribe audio held in memory
+
+        Args:
+            audio_data: Raw audio bytes, or a readable binary stream
+            language: Language to transcribe in, or the fallback when detection fails
+            detect_language: Let Deepgram detect the language in the same request,
+                filling both the transcript and ``detected_language`` from one response
+            columnar_words: Return ``words`` as ``WordColumns`` instead of a list of dicts
+
+        Returns:
+            Dictionary with transcription results
+        """
         if not self.is_available():
             raise RuntimeError("Deepgram service is not available")
         try:
-            import io
-            audio = io.BytesIO(audio_data)
-            options = PrerecordedOptions(
-                model="nova-2",
-                language=language,
-                smart_format=True,
-                punctuate=True,
-                diarize=True,
-                utterances=True
-            )
-            response = await self.client.transcription.prerecorded(audio, options)
-            return self._parse_response(response, language)
+            audio = self._as_stream(audio_data)
+            options = self._prerecorded_options(language, detect_language)
+            cache_key = await self._result_cache_key(audio, options, language)
+            if cache_key is not None:
+                cached = await self.result_cache.get(cache_key)
+                if cached is not None:
+                    if not columnar_words:
+                        cached["words"] = cached["words"].to_dicts()
+                    return cached
+            response = await self._prerecorded(audio, options)
+            result = self._parse_response(response, language, columnar_words)
+            if cache_key is not None and result["success"]:
+                await self.result_cache.set(cache_key, result)
+            return result
         except Exception as e:
             logger.error(f"Deepgram transcription error: {e}")
             return self._error_response(str(e))
 
-    async def detect_language(self, audio_data: bytes) -> Dict[str, Any]:
+    async def _result_cache_key(self, audio: BinaryIO, options: PrerecordedOptions, language: str) -> Optional[str]:
+        """Content-addressed cache key for a request, or None when caching does not apply"""
+        if not self.result_cache.enabled:
+            return None
+        audio_digest = await asyncio.to_thread(hash_audio, audio)
+        if audio_digest is None:
+            return None
+        return self.result_cache.result_key(audio_digest, options.to_dict(), language)
+
+    async def detect_language(self, audio_data: Union[bytes, BinaryIO]) -> Dict[str, Any]:
         if not self.is_available():
             raise RuntimeError("Deepgram service is not available")
         try:
-            import io
-            audio = io.BytesIO(audio_data)
-            options = PrerecordedOptions(
-                model="nova-2",
-                smart_format=True,
-                punctuate=True,
-                diarize=True,
-                utterances=True
-            )
-            response = await self.client.transcription.prerecorded(audio, options)
-            # Language detection is in response['metadata']['language']
-            detected_language = response['metadata'].get('language', 'en')
-            confidence = response['metadata'].get('confidence', 0.0)
+            audio = self._as_stream(audio_data)
+            options = self._prerecorded_options(detect_language=True)
+            response = await self._prerecorded(audio, options)
+            detected_language, confidence = self._detected_language(response, "en")
             return {
                 "success": True,
                 "detected_language": detected_language,
@@ -96,18 +157,116 @@ class DeepgramService:
                 "is_reliable": False
             }
 
-    def _parse_response(self, response, language: str) -> Dict[str, Any]:
+    async def transcribe_long_audio(
+        self,
+        audio_data: Union[bytes, BinaryIO],
+        language: str = "en",
+        detect_language: bool = False,
+        segment_seconds: Optional[float] = None,
+        overlap_seconds: Optional[float] = None,
+        parallelism: Optional[int] = None,
+        columnar_words: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Transcribe a long recording as overlapping segments in parallel
+
+        PCM WAV audio is cut at low-energy points near every
+        ``segment_seconds``, the segments (each padded with
+        ``overlap_seconds`` of context) are transcribed at most
+        ``parallelism`` at a time, and their words are shifted onto the
+        recording's timeline with the overlap duplicates removed. Other
+        formats, and recordings shorter than one segment, are sent in a
+        single request.
+
+        Returns:
+            Dictionary with transcription results, shaped like ``transcribe_audio_data``
+        """
+        if not self.is_available():
+            raise RuntimeError("Deepgram service is not available")
+        segment_seconds = segment_seconds or settings.long_audio_segment_seconds
+        overlap_seconds = settings.long_audio_overlap_seconds if overlap_seconds is None else overlap_seconds
+        parallelism = parallelism or settings.long_audio_parallelism
+
+        audio = self._as_stream(audio_data)
+        try:
+            pcm = await asyncio.to_thread(read_wav, audio)
+            segments = await asyncio.to_thread(
+                plan_segments, pcm, segment_seconds, overlap_seconds, settings.long_audio_search_seconds
+            )
+        except (wave.Error, EOFError):
+            segments = None
+        if not segments or len(segments) == 1:
+            audio.seek(0)
+            return await self.transcribe_audio_data(audio, language, detect_language, columnar_words)
+
+        slots = asyncio.Semaphore(parallelism)
+        # Segments are read from the one source stream, so reads must not interleave seeks
+        source_lock = asyncio.Lock()
+
+        async def transcribe_segment(segment: AudioSegment) -> Dict[str, Any]:
+            async with slots:
+                async with source_lock:
+                    wav = await asyncio.to_thread(encode_wav, pcm, segment.start, segment.end)
+                return await self.transcribe_audio_data(wav, language, detect_language)
+
+        logger.info(f"Transcribing {pcm.duration:.1f}s of audio as {len(segments)} segments")
+        results = await asyncio.gather(*(transcribe_segment(segment) for segment in segments))
+        for index, result in enumerate(results):
+            if not result["success"]:
+                return self._error_response(f"Segment {index} failed: {result['error']}")
+
+        rate = pcm.sample_rate
+        stitched_input = []
+        for segment, result in zip(segments, results):
+            # Carry the punctuated transcript tokens with their words when they line up
+            tokens = result["transcript"].split()
+            if len(tokens) != len(result["words"]):
+                tokens = [word["word"] for word in result["words"]]
+            words = [{**word, "text": token} for word, token in zip(result["words"], tokens)]
+            stitched_input.append((segment.start / rate, segment.own_start / rate, segment.own_end / rate, words))
+        words = stitch_words(stitched_input)
+        transcript = " ".join(word.pop("text") for word in words)
+
+        # The language (and confidence) reported by the segments holding the most words wins
+        word_counts: Dict[Tuple[str, float], int] = {}
+        for result in results:
+            key = (result["detected_language"], result["detection_confidence"])
+            word_counts[key] = word_counts.get(key, 0) + len(result["words"])
+        detected_language, detection_confidence = max(word_counts, key=word_counts.get)
+
+        weights = [max(len(result["words"]), 1) for result in results]
+        confidence = sum(result["confidence"] * weight for result, weight in zip(results, weights)) / sum(weights)
+        return {
+            "success": True,
+            "transcript": transcript,
+            "confidence": confidence,
+            "words": WordColumns.from_words(words) if columnar_words else words,
+            "language": language,
+            "detected_language": detected_language,
+            "detection_confidence": detection_confidence
+        }
+
+    def _detected_language(self, response, default: str) -> Tuple[str, float]:
+        """Read the detected language from the first channel, falling back to metadata"""
+        channels = response['results']['channels'] if response['results'] else []
+        if channels and channels[0].get('detected_language'):
+            return channels[0]['detected_language'], channels[0].get('language_confidence') or 0.0
+        metadata = response['metadata']
+        return metadata.get('language', default), metadata.get('confidence', 0.0)
+
+    def _parse_response(self, response, language: str, columnar_words: bool = False) -> Dict[str, Any]:
         try:
             # Deepgram v3+ response structure
             results = response['results']
             if results and results['channels']:
                 alt = results['channels'][0]['alternatives'][0]
                 words = alt.get('words', [])
+                detected_language, detection_confidence = self._detected_language(response, language)
                 return {
                     "success": True,
                     "transcript": alt.get('transcript', ''),
                     "confidence": alt.get('confidence', 1.0),
-                    "words": [
+                    "words": WordColumns.from_words(words) if columnar_words else [
                         {
                             "word": w.get('word'),
                             "start": w.get('start'),
@@ -116,8 +275,8 @@ class DeepgramService:
                         } for w in words
                     ],
                     "language": language,
-                    "detected_language": response['metadata'].get('language', language),
-                    "detection_confidence": response['metadata'].get('confidence', 0.0)
+                    "detected_language": detected_language,
+                    "detection_confidence": detection_confidence
                 }
             else:
                 return self._error_response("No transcription results")
@@ -161,47 +320,135 @@ class DeepgramService:
             {"code": "fa", "name": "Persian"}
         ]
 
-    async def transcribe_live_audio_stream(self, audio_stream_generator, language: str = "en"):
-        if not self.is_available():
-            raise RuntimeError("Deepgram service is not available")
-        # Build the Deepgram WebSocket URL with query params
-        url = (
-            f"wss://api.deepgram.com/v1/listen"
-            f"?model=nova-2"
-            f"&language={language}"
-            f"&smart_format=true"
-            f"&punctuate=true"
-            f"&interim_results=true"
-            f"&diarize=true"
-            f"&encoding=linear16"
-            f"&sample_rate=44100"
-        )
+    def _live_options(
+        self,
+        language: str = "en",
+        encoding: str = "linear16",
+        sample_rate: int = 16000,
+        channels: int = 1
+    ) -> Dict[str, str]:
+        """Query options for a live transcription connection"""
+        return {
+            "model": "nova-2",
+            "language": language,
+            "smart_format": "true",
+            "punctuate": "true",
+            "interim_results": "true",
+            "diarize": "true",
+            "encoding": encoding,
+            "sample_rate": str(sample_rate),
+            "channels": str(channels)
+        }
+
+    async def _open_live_connection(self, options: Dict[str, str]):
+        """Open a live transcription websocket to Deepgram"""
+        url = f"{settings.deepgram_live_url}?{urlencode(options)}"
         headers = {
             "Authorization": f"Token {self.api_key}"
         }
-        async with websockets.connect(url, extra_headers=headers) as ws:
+        return await websockets.connect(url, extra_headers=headers)
+
+    def warm_live_connections(self, languages: List[str]):
+        """Pre-open live connections for the given languages"""
+        if not self.is_available():
+            return
+        for language in languages:
+            self.live_pool.warm(self._live_options(language))
+
+    async def transcribe_live_audio_stream(
+        self,
+        audio_stream_generator,
+        language: str = "en",
+        encoding: str = "linear16",
+        sample_rate: int = 16000,
+        channels: int = 1,
+        relay: Optional[AudioRelay] = None,
+        telemetry: Optional[LiveSessionTelemetry] = None
+    ):
+        if not self.is_available():
+            raise RuntimeError("Deepgram service is not available")
+        relay = relay or AudioRelay()
+        telemetry = telemetry or LiveSessionTelemetry("anonymous")
+        telemetry.relay = relay
+        telemetry.set_upstream_format(encoding, sample_rate, channels)
+        # Take a pre-opened connection for these options, or open one
+        ws = await self.live_pool.acquire(self._live_options(language, encoding, sample_rate, channels))
+        tasks: List[asyncio.Task] = []
+        last_sent = asyncio.get_running_loop().time()
+        try:
+            async def receiver():
+                # Client side: move chunks into the bounded relay
+                try:
+                    async for chunk in audio_stream_generator:
+                        await relay.put(chunk)
+                finally:
+                    relay.close()
+
             async def sender():
-                async for chunk in audio_stream_generator:
+                # Upstream side: drain the relay into Deepgram
+                nonlocal last_sent
+                async for chunk in relay:
                     await ws.send(chunk)
+                    last_sent = asyncio.get_running_loop().time()
+                    telemetry.record_upstream(len(chunk))
                 await ws.send(b"")  # Send empty bytes to signal end of stream
 
+            async def keepalive():
+                # Keep the session open while the client sends no audio (e.g. gated silence)
+                # and sample the upstream round trip with a websocket ping
+                nonlocal last_sent
+                interval = settings.deepgram_keepalive_seconds
+                while True:
+                    await asyncio.sleep(interval - (asyncio.get_running_loop().time() - last_sent))
+                    if asyncio.get_running_loop().time() - last_sent >= interval:
+                        await ws.send(KEEPALIVE_MESSAGE)
+                        last_sent = asyncio.get_running_loop().time()
+                    ping_at = asyncio.get_running_loop().time()
+                    try:
+                        await asyncio.wait_for(await ws.ping(), timeout=interval / 2)
+                        telemetry.record_rtt(asyncio.get_running_loop().time() - ping_at)
+                    except asyncio.TimeoutError:
+                        logger.warning(f"No pong from Deepgram within {interval / 2}s")
+
+            def on_task_done(task: asyncio.Task):
+                # A failed relay stage ends the session now rather than at the final await
+                if not task.cancelled() and task.exception() is not None:
+                    asyncio.ensure_future(ws.close())
+
+            receiver_task = asyncio.create_task(receiver())
             sender_task = asyncio.create_task(sender())
+            tasks = [receiver_task, sender_task, asyncio.create_task(keepalive())]
+            for task in tasks:
+                task.add_done_callback(on_task_done)
+
             async for message in ws:
-                print(f"Received message from Deepgram: {message}")
                 try:
                     data = json.loads(message)
-                    # Only yield results with transcript
-                    if (
-                        data.get("channel")
-                        and data["channel"].get("alternatives")
-                        and data["channel"]["alternatives"][0].get("transcript")
-                    ):
-                        print(f"Sending transcript: {data}")
-                        yield data
                 except Exception as e:
-                    print(f"Error parsing Deepgram message: {e}")
+                    logger.warning(f"Error parsing Deepgram message: {e}")
                     continue
-            await sender_task
+                if telemetry.should_log():
+                    logger.debug(f"Deepgram message for session {telemetry.session_id}: {message}")
+                # Only yield results with transcript
+                if (
+                    data.get("channel")
+                    and data["channel"].get("alternatives")
+                    and data["channel"]["alternatives"][0].get("transcript")
+                ):
+                    telemetry.record_result(data)
+                    yield data
+
+            for task in (receiver_task, sender_task):
+                if task.done() and not task.cancelled() and task.exception() is not None:
+                    raise task.exception()
+            if not sender_task.done():
+                raise RuntimeError("Deepgram closed the live session before the audio ended")
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await ws.close()
 
 # Create a singleton instance
 deepgram_service = DeepgramService() 
\ No newline at end of file
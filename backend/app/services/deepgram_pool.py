@@ -0,0 +1,186 @@
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+ConnectFunc = Callable[[Dict[str, str]], Awaitable[Any]]
+PoolKey = Tuple[Tuple[str, str], ...]
+
+KEEPALIVE_MESSAGE = json.dumps({"type": "KeepAlive"})
+
+
+class _IdleConnection:
+    """An opened upstream connection waiting for a session"""
+
+    def __init__(self, ws: Any):
+        self.ws = ws
+        self.opened_at = time.monotonic()
+
+
+class LiveConnectionPool:
+    """
+    Pre-opened upstream live transcription connections.
+
+    Connections are keyed by their option set (language, model, encoding,
+    ...), since the options are fixed in the URL at handshake time. A session
+    takes a ready connection for its key, or opens one directly on a miss,
+    and the pool refills that key in the background. Idle connections are
+    kept open with KeepAlive messages and retired after ``max_idle_seconds``;
+    keys passed to ``warm`` are then refilled with fresh connections, so they
+    stay ready through quiet periods. Connections are single-use: once
+    acquired they belong to the session.
+    """
+
+    def __init__(
+        self,
+        connect: ConnectFunc,
+        size: Optional[int] = None,
+        keepalive_interval: Optional[float] = None,
+        max_idle_seconds: Optional[float] = None
+    ):
+        self.connect = connect
+        self.size = settings.deepgram_pool_size if size is None else size
+        self.keepalive_interval = keepalive_interval or settings.deepgram_keepalive_seconds
+        self.max_idle_seconds = max_idle_seconds or settings.deepgram_pool_max_idle_seconds
+        self._idle: Dict[PoolKey, Deque[_IdleConnection]] = {}
+        self._refills: Dict[PoolKey, asyncio.Task] = {}
+        self._warmed: Dict[PoolKey, Dict[str, str]] = {}
+        self._keepalive_task: Optional[asyncio.Task] = None
+        self._closed = False
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "opened": 0,
+            "discarded": 0,
+            "connect_errors": 0
+        }
+
+    @staticmethod
+    def key_for(options: Dict[str, Any]) -> PoolKey:
+        """Pool key for an option set"""
+        return tuple(sorted((name, str(value)) for name, value in options.items()))
+
+    async def acquire(self, options: Dict[str, str]) -> Any:
+        """
+        Take a ready connection for ``options``, opening one if none is idle
+
+        Args:
+            options: Upstream connection options
+
+        Returns:
+            An open websocket connection owned by the caller
+        """
+        key = self.key_for(options)
+        idle = self._idle.get(key)
+        ws = None
+        while idle:
+            entry = idle.popleft()
+            if self._usable(entry):
+                ws = entry.ws
+                self.stats["hits"] += 1
+                break
+            await self._discard(entry.ws)
+
+        if ws is None:
+            self.stats["misses"] += 1
+            ws = await self._open(options)
+
+        self._schedule_refill(key, options)
+        return ws
+
+    def warm(self, options: Dict[str, str]):
+        """Start opening connections for ``options`` ahead of the first session, and keep them ready"""
+        key = self.key_for(options)
+        self._warmed[key] = options
+        self._schedule_refill(key, options)
+
+    def _usable(self, entry: _IdleConnection, now: Optional[float] = None) -> bool:
+        age = (now or time.monotonic()) - entry.opened_at
+        return not entry.ws.closed and age < self.max_idle_seconds
+
+    async def _open(self, options: Dict[str, str]) -> Any:
+        ws = await self.connect(options)
+        self.stats["opened"] += 1
+        return ws
+
+    async def _discard(self, ws: Any):
+        self.stats["discarded"] += 1
+        try:
+            await ws.close()
+        except Exception:
+            pass
+
+    def _schedule_refill(self, key: PoolKey, options: Dict[str, str]):
+        if self._closed or self.size <= 0:
+            return
+        task = self._refills.get(key)
+        if task is not None and not task.done():
+            return
+        self._refills[key] = asyncio.create_task(self._refill(key, options))
+        if self._keepalive_task is None or self._keepalive_task.done():
+            self._keepalive_task = asyncio.create_task(self._keepalive_loop())
+
+    async def _refill(self, key: PoolKey, options: Dict[str, str]):
+        idle = self._idle.setdefault(key, deque())
+        while len(idle) < self.size and not self._closed:
+            try:
+                ws = await self._open(options)
+            except Exception as e:
+                self.stats["connect_errors"] += 1
+                logger.warning(f"Could not pre-open live connection for {dict(key)}: {e}")
+                return
+            if self._closed:
+                await self._discard(ws)
+                return
+            idle.append(_IdleConnection(ws))
+
+    async def _keepalive_loop(self):
+        while not self._closed:
+            await asyncio.sleep(self.keepalive_interval)
+            now = time.monotonic()
+            for key, idle in list(self._idle.items()):
+                retired = False
+                for entry in list(idle):
+                    if self._usable(entry, now):
+                        try:
+                            await entry.ws.send(KEEPALIVE_MESSAGE)
+                            continue
+                        except Exception as e:
+                            logger.debug(f"KeepAlive failed on idle live connection: {e}")
+                    if entry in idle:
+                        idle.remove(entry)
+                        retired = True
+                        await self._discard(entry.ws)
+                if not idle and self._idle.get(key) is idle:
+                    del self._idle[key]
+                if retired and key in self._warmed:
+                    self._schedule_refill(key, self._warmed[key])
+
+    async def close(self):
+        """Stop refilling and close every idle connection"""
+        self._closed = True
+        tasks = list(self._refills.values())
+        if self._keepalive_task is not None:
+            tasks.append(self._keepalive_task)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for idle in self._idle.values():
+            while idle:
+                await self._discard(idle.popleft().ws)
+        self._idle.clear()
+        self._refills.clear()
+        self._warmed.clear()
+
+    def get_stats(self) -> dict:
+        """Get pool statistics"""
+        stats = dict(self.stats)
+        stats["idle"] = sum(len(idle) for idle in self._idle.values())
+        stats["keys"] = len(self._idle)
+        return stats
@@ -0,0 +1,273 @@
+import logging
+import math
+import re
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Languages identified by their writing system alone, with the Unicode
+# ranges that belong to each script. Order matters: kana is checked before
+# Han so that Japanese text with kanji is not reported as Chinese.
+SCRIPT_RANGES = {
+    "ja": "぀-ゟ゠-ヿㇰ-ㇿｦ-ﾟ",
+    "zh": "㐀-䶿一-鿿豈-﫿",
+    "ko": "ᄀ-ᇿ㄰-㆏가-힯",
+    "ar": "؀-ۿݐ-ݿࢠ-ࣿﭐ-﷿ﹰ-﻿",
+    "he": "֐-׿יִ-ﭏ",
+    "th": "฀-๿",
+    "hi": "ऀ-ॿ",
+    "ru": "Ѐ-ӿԀ-ԯ",
+}
+
+LATIN_RANGE = "A-Za-zÀ-ÿĀ-ɏ"
+
+# Small samples of everyday meeting speech used to build the character
+# trigram profiles for Latin-script languages. A few hundred characters per
+# language is enough to separate them on sentences of normal length.
+LATIN_SAMPLES = {
+    "en": (
+        "can you hear me now? yes, I can hear you. let's get started with the agenda for today. "
+        "the next slide shows the results from the last quarter and what we are going to do about them. "
+        "I think we should move this meeting to thursday because some of the team will be out. "
+        "thank you everyone for joining, please mute your microphone when you are not speaking. "
+        "could you share your screen? what do you think about the new design? we would like to hear "
+        "your feedback before the end of the week. that is a good question, I will follow up with them."
+    ),
+    "es": (
+        "¿me puedes oír ahora? sí, te escucho bien. vamos a empezar con la agenda de hoy. "
+        "la siguiente diapositiva muestra los resultados del último trimestre y lo que vamos a hacer. "
+        "creo que deberíamos mover esta reunión al jueves porque parte del equipo no estará. "
+        "gracias a todos por venir, por favor silencien el micrófono cuando no estén hablando. "
+        "¿puedes compartir tu pantalla? ¿qué piensas del nuevo diseño? nos gustaría conocer tu "
+        "opinión antes del fin de semana. es una buena pregunta, voy a hablar con ellos y les aviso."
+    ),
+    "fr": (
+        "est-ce que vous m'entendez maintenant? oui, je vous entends bien. commençons par l'ordre du jour. "
+        "la diapositive suivante montre les résultats du dernier trimestre et ce que nous allons faire. "
+        "je pense que nous devrions déplacer cette réunion à jeudi parce qu'une partie de l'équipe sera absente. "
+        "merci à tous d'être venus, s'il vous plaît coupez votre micro quand vous ne parlez pas. "
+        "pouvez-vous partager votre écran? qu'est-ce que vous pensez du nouveau design? nous voudrions avoir "
+        "votre avis avant la fin de la semaine. c'est une bonne question, je vais voir avec eux."
+    ),
+    "de": (
+        "könnt ihr mich jetzt hören? ja, ich kann dich gut hören. fangen wir mit der tagesordnung für heute an. "
+        "die nächste folie zeigt die ergebnisse aus dem letzten quartal und was wir dagegen tun werden. "
+        "ich denke, wir sollten dieses meeting auf donnerstag verschieben, weil ein teil des teams nicht da ist. "
+        "vielen dank an alle fürs kommen, bitte schaltet euer mikrofon stumm, wenn ihr nicht sprecht. "
+        "kannst du deinen bildschirm teilen? was hältst du von dem neuen design? wir würden gerne eure "
+        "rückmeldung vor dem ende der woche hören. das ist eine gute frage, ich kläre das mit ihnen."
+    ),
+    "it": (
+        "mi senti adesso? sì, ti sento bene. cominciamo con l'ordine del giorno di oggi. "
+        "la prossima slide mostra i risultati dell'ultimo trimestre e cosa faremo al riguardo. "
+        "penso che dovremmo spostare questa riunione a giovedì perché una parte del gruppo non ci sarà. "
+        "grazie a tutti per essere qui, per favore disattivate il microfono quando non state parlando. "
+        "puoi condividere lo schermo? che cosa ne pensi del nuovo design? vorremmo sentire il tuo "
+        "parere prima della fine della settimana. è una buona domanda, ne parlo con loro e vi faccio sapere."
+    ),
+    "pt": (
+        "você consegue me ouvir agora? sim, estou te ouvindo bem. vamos começar com a pauta de hoje. "
+        "o próximo slide mostra os resultados do último trimestre e o que nós vamos fazer sobre isso. "
+        "acho que devemos mudar esta reunião para quinta-feira porque parte da equipe não vai estar. "
+        "obrigado a todos por participarem, por favor desliguem o microfone quando não estiverem falando. "
+        "você pode compartilhar a sua tela? o que você acha do novo design? gostaríamos de ouvir a sua "
+        "opinião antes do fim da semana. é uma boa pergunta, vou falar com eles e depois aviso vocês."
+    ),
+}
+
+# Unsupported languages close enough to a supported one to be mistaken for
+# it (Dutch for German, Galician for Spanish and Portuguese, Catalan for
+# Spanish, French and Italian). They are scored alongside the supported
+# profiles so that text in them wins its own profile, or at least leaves no
+# clear winner, instead of being trusted as its neighbour.
+NEIGHBOUR_SAMPLES = {
+    "nl": (
+        "kun je me nu horen? ja, ik hoor je goed. laten we beginnen met de agenda van vandaag. "
+        "de volgende dia laat de resultaten van het laatste kwartaal zien en wat we eraan gaan doen. "
+        "ik denk dat we dit overleg naar volgende week moeten schuiven omdat een deel van het team er niet is. "
+        "bedankt allemaal voor jullie komst, zet alsjeblieft je microfoon uit als je niet praat. "
+        "kun je je scherm delen? wat vind je van het nieuwe ontwerp? we willen graag jullie "
+        "mening horen voor het einde van de week. dat is een goede vraag, ik zoek het uit en laat het weten."
+    ),
+    "gl": (
+        "escoitasme agora? si, escoitote ben. imos comezar coa orde do día de hoxe. "
+        "a seguinte diapositiva mostra os resultados do último trimestre e o que imos facer respecto diso. "
+        "penso que deberiamos aprazar esta reunión porque parte do equipo non vai estar. "
+        "grazas a todos por vir, por favor apagade o micrófono cando non esteades a falar. "
+        "podes compartir a túa pantalla? que che parece o novo deseño? gustaríanos escoitar a vosa "
+        "opinión antes da fin da semana. é unha boa pregunta, falo con eles e despois avísovos. "
+        "xa vos mandei a acta onte pola noite; se queredes engadir algo, facédeo mañá pola mañá. "
+        "tamén hai que pechar o orzamento do proxecto, e aínda non temos todos os números."
+    ),
+    "ca": (
+        "em sents ara? sí, et sento bé. comencem amb l'ordre del dia d'avui. "
+        "la següent diapositiva mostra els resultats de l'últim trimestre i què hi farem. "
+        "crec que hauríem de passar aquesta reunió a dijous perquè una part de l'equip no hi serà. "
+        "gràcies a tothom per ser aquí, si us plau silencieu el micròfon quan no parleu. "
+        "pots compartir la pantalla? què en penses del nou disseny? ens agradaria saber la vostra "
+        "opinió abans del final de la setmana. és una bona pregunta, ho parlo amb ells i us ho faig saber."
+    ),
+}
+
+_SCRIPT_PATTERNS = {language: re.compile(f"[{chars}]") for language, chars in SCRIPT_RANGES.items()}
+_LATIN_PATTERN = re.compile(f"[{LATIN_RANGE}]")
+_LATIN_WORD_PATTERN = re.compile(f"[{LATIN_RANGE}']+")
+
+
+def _trigrams(text: str) -> Counter:
+    """Count character trigrams of each word, padded with spaces"""
+    counts: Counter = Counter()
+    for word in _LATIN_WORD_PATTERN.findall(text.lower()):
+        padded = f" {word} "
+        for i in range(len(padded) - 2):
+            counts[padded[i:i + 3]] += 1
+    return counts
+
+
+class TrigramModel:
+    """
+    Naive Bayes character trigram model over a fixed set of languages.
+
+    Log-likelihood differences are scaled by ``sharpness`` before they are
+    turned into posteriors; values below 1 temper the usual naive Bayes
+    overconfidence so that ambiguous text stays under the trust threshold.
+    """
+
+    def __init__(self, samples: Dict[str, str], smoothing: float = 0.5, sharpness: float = 0.5):
+        self.sharpness = sharpness
+        profiles = {language: _trigrams(text) for language, text in samples.items()}
+        vocabulary = set()
+        for profile in profiles.values():
+            vocabulary.update(profile)
+
+        self.languages = list(profiles)
+        self.log_probs: Dict[str, Dict[str, float]] = {}
+        self.unseen_log_prob: Dict[str, float] = {}
+        for language, profile in profiles.items():
+            denominator = sum(profile.values()) + smoothing * (len(vocabulary) + 1)
+            self.log_probs[language] = {
+                gram: math.log((count + smoothing) / denominator) for gram, count in profile.items()
+            }
+            self.unseen_log_prob[language] = math.log(smoothing / denominator)
+
+    def classify(self, text: str, languages: Optional[List[str]] = None) -> Dict[str, float]:
+        """Return the posterior probability of each language for the text"""
+        grams = _trigrams(text)
+        candidates = [language for language in (languages or self.languages) if language in self.log_probs]
+        if not grams or not candidates:
+            return {}
+
+        scores = {}
+        for language in candidates:
+            table = self.log_probs[language]
+            unseen = self.unseen_log_prob[language]
+            scores[language] = sum(table.get(gram, unseen) * count for gram, count in grams.items())
+
+        best = max(scores.values())
+        weights = {language: math.exp(self.sharpness * (score - best)) for language, score in scores.items()}
+        total = sum(weights.values())
+        return {language: weight / total for language, weight in weights.items()}
+
+    def coverage(self, text: str, language: str) -> float:
+        """
+        Share of the text's trigrams that occur in the language's profile
+
+        Posteriors only rank the known languages against each other; this
+        is an absolute measure of fit, low for text in a language the model
+        does not know at all.
+        """
+        grams = _trigrams(text)
+        total = sum(grams.values())
+        if not total or language not in self.log_probs:
+            return 0.0
+        table = self.log_probs[language]
+        return sum(count for gram, count in grams.items() if gram in table) / total
+
+
+class LocalLanguageDetector:
+    """
+    Offline language detector for the cases that do not need a network call.
+
+    Non-Latin scripts are identified from Unicode ranges; Latin-script text
+    is scored against the character trigram model: the languages in
+    ``settings.supported_languages`` plus the unsupported neighbours in
+    ``NEIGHBOUR_SAMPLES``. Confidence is the best supported language's
+    posterior margin over every other profile, so Dutch or Galician text,
+    which wins its own profile or leaves no clear winner, falls through to
+    the cloud API. So does short Latin text, and text whose trigrams mostly
+    do not occur in the winning profile (Vietnamese, Polish...), since
+    posteriors are only relative to the profiled languages.
+    """
+
+    def __init__(
+        self,
+        languages: Optional[List[str]] = None,
+        min_latin_letters: Optional[int] = None
+    ):
+        self.languages = languages or settings.supported_languages
+        self.min_latin_letters = min_latin_letters or settings.language_detection_min_latin_letters
+        self.min_trigram_coverage = settings.language_detection_min_trigram_coverage
+        latin_languages = [language for language in self.languages if language in LATIN_SAMPLES]
+        samples = {language: LATIN_SAMPLES[language] for language in latin_languages}
+        samples.update({
+            language: text for language, text in NEIGHBOUR_SAMPLES.items() if language not in self.languages
+        })
+        self.model = TrigramModel(samples)
+
+    def detect(self, text: str) -> Optional[Dict[str, Any]]:
+        """
+        Detect the language of the text locally
+
+        Args:
+            text: Text to detect language for
+
+        Returns:
+            Dictionary with ``detected_language``, ``confidence`` and
+            ``is_reliable``, or None if the text has no recognizable letters
+        """
+        script_counts = {
+            language: len(pattern.findall(text)) for language, pattern in _SCRIPT_PATTERNS.items()
+        }
+        latin_count = len(_LATIN_PATTERN.findall(text))
+        total = latin_count + sum(script_counts.values())
+        if total == 0:
+            return None
+
+        # Japanese mixes kana with Han characters
+        if script_counts["ja"]:
+            script_counts["ja"] += script_counts["zh"]
+            script_counts["zh"] = 0
+
+        script_language = max(script_counts, key=script_counts.get)
+        if script_counts[script_language] > latin_count:
+            confidence = script_counts[script_language] / total
+            return self._result(script_language, confidence)
+
+        posteriors = self.model.classify(text)
+        supported = {language: posterior for language, posterior in posteriors.items() if language in self.languages}
+        if not supported:
+            return None
+        language = max(supported, key=supported.get)
+        runner_up = max((posterior for other, posterior in posteriors.items() if other != language), default=0.0)
+        margin = max(posteriors[language] - runner_up, 0.0)
+        length_factor = min(1.0, latin_count / self.min_latin_letters)
+        confidence = margin * (latin_count / total) * length_factor
+        coverage = self.model.coverage(text, language)
+        if coverage < self.min_trigram_coverage:
+            confidence *= coverage
+        return self._result(language, confidence)
+
+    @staticmethod
+    def _result(language: str, confidence: float) -> Dict[str, Any]:
+        return {
+            "detected_language": language,
+            "confidence": confidence,
+            "is_reliable": confidence > 0.8
+        }
+
+
+# Create singleton instance
+local_language_detector = LocalLanguageDetector()
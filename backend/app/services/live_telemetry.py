@@ -0,0 +1,201 @@
+import itertools
+import logging
+import time
+from bisect import bisect_left
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is unbounded
+LATENCY_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class Histogram:
+    """Fixed-bucket histogram: constant memory and O(log buckets) per observation"""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS_MS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def merge(self, other: "Histogram"):
+        for index, count in enumerate(other.counts):
+            self.counts[index] += count
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the ``q`` quantile"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return float(self.buckets[index]) if index < len(self.buckets) else self.max
+        return self.max
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "avg": round(self.total / self.count, 3) if self.count else None,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "max": round(self.max, 3) if self.count else None
+        }
+
+
+class LiveSessionTelemetry:
+    """
+    Counters and latency histograms for one live transcription session.
+
+    Updates are plain attribute arithmetic so they can run per frame on the
+    event loop. ``should_log`` samples one in ``log_sample_rate`` events for
+    debug logging instead of printing every frame and message.
+    """
+
+    def __init__(self, session_id: str, log_sample_rate: Optional[int] = None):
+        self.session_id = session_id
+        self.log_sample_rate = log_sample_rate or settings.live_telemetry_log_sample_rate
+        self.started_at = time.monotonic()
+        self.counters = {
+            "frames_in": 0,
+            "bytes_in": 0,
+            "chunks_upstream": 0,
+            "bytes_upstream": 0,
+            "results": 0,
+            "partials": 0,
+            "finals": 0
+        }
+        self.time_to_first_partial_ms: Optional[float] = None
+        self.final_latency_ms = Histogram()
+        self.upstream_rtt_ms = Histogram()
+        self.relay = None
+        self.vad = None
+        self._first_frame_at: Optional[float] = None
+        self._events = itertools.count()
+        self._bytes_per_second: Optional[float] = None
+        self._upstream_seconds = 0.0
+        # (upstream audio end in seconds, wall time it was sent), oldest first
+        self._sent_marks: Deque[Tuple[float, float]] = deque(maxlen=4096)
+
+    def should_log(self) -> bool:
+        """Whether this event falls in the debug-logging sample"""
+        return next(self._events) % self.log_sample_rate == 0
+
+    def set_upstream_format(self, encoding: str, sample_rate: int, channels: int):
+        """Enable audio-time tracking (for final latency) for raw linear16 upstream audio"""
+        if encoding == "linear16":
+            self._bytes_per_second = sample_rate * channels * 2
+
+    def record_frame(self, size: int):
+        if self._first_frame_at is None:
+            self._first_frame_at = time.monotonic()
+        self.counters["frames_in"] += 1
+        self.counters["bytes_in"] += size
+
+    def record_upstream(self, size: int):
+        self.counters["chunks_upstream"] += 1
+        self.counters["bytes_upstream"] += size
+        if self._bytes_per_second:
+            self._upstream_seconds += size / self._bytes_per_second
+            self._sent_marks.append((self._upstream_seconds, time.monotonic()))
+
+    def record_rtt(self, seconds: float):
+        self.upstream_rtt_ms.observe(seconds * 1000)
+
+    def record_result(self, result: Dict[str, Any]):
+        """Count a transcript result and measure its latency"""
+        now = time.monotonic()
+        self.counters["results"] += 1
+        if self.time_to_first_partial_ms is None:
+            self.time_to_first_partial_ms = (now - (self._first_frame_at or self.started_at)) * 1000
+
+        if not result.get("is_final"):
+            self.counters["partials"] += 1
+            return
+        self.counters["finals"] += 1
+
+        # Latency from the moment the last audio of the segment went upstream
+        end = result.get("start", 0.0) + result.get("duration", 0.0)
+        sent_at = None
+        while self._sent_marks and self._sent_marks[0][0] < end:
+            self._sent_marks.popleft()
+        if self._sent_marks:
+            sent_at = self._sent_marks[0][1]
+        if sent_at is not None:
+            self.final_latency_ms.observe(max(now - sent_at, 0.0) * 1000)
+
+    def snapshot(self) -> Dict[str, Any]:
+        snapshot = {
+            "session_id": self.session_id,
+            "duration_seconds": round(time.monotonic() - self.started_at, 3),
+            **self.counters,
+            "time_to_first_partial_ms": (
+                round(self.time_to_first_partial_ms, 3) if self.time_to_first_partial_ms is not None else None
+            ),
+            "final_latency_ms": self.final_latency_ms.snapshot(),
+            "upstream_rtt_ms": self.upstream_rtt_ms.snapshot()
+        }
+        if self.relay is not None:
+            snapshot["relay"] = self.relay.get_stats()
+        if self.vad is not None:
+            snapshot["vad"] = self.vad.get_stats()
+        return snapshot
+
+
+class LiveTelemetryRegistry:
+    """Active live sessions plus totals for the sessions that have ended"""
+
+    def __init__(self):
+        self.sessions: Dict[str, LiveSessionTelemetry] = {}
+        self.completed_sessions = 0
+        self.totals = {}
+        self.final_latency_ms = Histogram()
+        self.upstream_rtt_ms = Histogram()
+        self.time_to_first_partial_ms = Histogram()
+
+    def start_session(self, session_id: str) -> LiveSessionTelemetry:
+        telemetry = LiveSessionTelemetry(session_id)
+        self.sessions[session_id] = telemetry
+        return telemetry
+
+    def end_session(self, telemetry: LiveSessionTelemetry):
+        """Fold a finished session into the totals and drop it from the active set"""
+        if self.sessions.pop(telemetry.session_id, None) is None:
+            return
+        self.completed_sessions += 1
+        for name, value in telemetry.counters.items():
+            self.totals[name] = self.totals.get(name, 0) + value
+        self.final_latency_ms.merge(telemetry.final_latency_ms)
+        self.upstream_rtt_ms.merge(telemetry.upstream_rtt_ms)
+        if telemetry.time_to_first_partial_ms is not None:
+            self.time_to_first_partial_ms.observe(telemetry.time_to_first_partial_ms)
+        logger.info(f"Live session {telemetry.session_id} ended: {telemetry.snapshot()}")
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "active_sessions": [telemetry.snapshot() for telemetry in self.sessions.values()],
+            "completed_sessions": self.completed_sessions,
+            "totals": dict(self.totals),
+            "final_latency_ms": self.final_latency_ms.snapshot(),
+            "upstream_rtt_ms": self.upstream_rtt_ms.snapshot(),
+            "time_to_first_partial_ms": self.time_to_first_partial_ms.snapshot()
+        }
+
+
+# Create a singleton instance
+live_telemetry = LiveTelemetryRegistry()
@@ -0,0 +1,90 @@
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+DetectFunc = Callable[[str], Awaitable[Dict[str, Any]]]
+
+
+class SessionLanguage:
+    """
+    Sticky spoken-language tracking for one live transcription session.
+
+    Only final results are sent to language detection; interim results
+    reuse the session language. The first confident final sets the language,
+    and it only changes after ``switch_after`` consecutive finals agree on a
+    different one, so a single misdetected phrase does not flip the session.
+    Finals shorter than ``min_chars`` are too short to detect reliably and
+    are skipped.
+    """
+
+    def __init__(
+        self,
+        detect: DetectFunc,
+        switch_after: Optional[int] = None,
+        min_chars: Optional[int] = None
+    ):
+        self.detect = detect
+        self.switch_after = switch_after or settings.live_language_switch_after
+        self.min_chars = settings.live_language_min_chars if min_chars is None else min_chars
+        self.language: Optional[str] = None
+        self.confidence: Optional[float] = None
+        self._candidate: Optional[str] = None
+        self._disagreements = 0
+        self.stats = {
+            "results": 0,
+            "detections": 0,
+            "switches": 0
+        }
+
+    async def observe(self, transcript: str, is_final: bool) -> Tuple[Optional[str], Optional[float]]:
+        """
+        Update the session language with a transcript result
+
+        Args:
+            transcript: Transcript text of the result
+            is_final: Whether the recognizer marked the result final
+
+        Returns:
+            Tuple of the session language and its detection confidence
+        """
+        self.stats["results"] += 1
+        if not is_final or len(transcript.strip()) < self.min_chars:
+            return self.language, self.confidence
+
+        try:
+            detection = await self.detect(transcript)
+        except Exception as e:
+            logger.warning(f"Language detection failed for final segment: {e}")
+            return self.language, self.confidence
+        self.stats["detections"] += 1
+
+        detected = detection.get("detected_language") or None
+        confidence = detection.get("confidence", 0.0)
+        if detected is None:
+            return self.language, self.confidence
+
+        if self.language is None or detected == self.language:
+            self.language = detected
+            self.confidence = confidence
+            self._candidate = None
+            self._disagreements = 0
+            return self.language, self.confidence
+
+        if detected == self._candidate:
+            self._disagreements += 1
+        else:
+            self._candidate = detected
+            self._disagreements = 1
+
+        if self._disagreements >= self.switch_after:
+            logger.info(f"Session language switched from {self.language} to {detected}")
+            self.language = detected
+            self.confidence = confidence
+            self._candidate = None
+            self._disagreements = 0
+            self.stats["switches"] += 1
+
+        return self.language, self.confidence
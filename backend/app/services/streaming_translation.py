@@ -0,0 +1,93 @@
+import logging
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.config.settings import settings
+from app.utils.text_segmentation import split_segments, join_translations
+
+logger = logging.getLogger(__name__)
+
+BatchTranslateFunc = Callable[[List[str], str, str], Awaitable[List[str]]]
+
+
+class StreamingTranslationSession:
+    """
+    Incremental translation of a growing partial transcript.
+
+    The text is split into sentence and clause segments. Every segment but
+    the last is considered settled and its translation is cached, so each
+    new partial only sends the changing tail (plus any settled segment the
+    recognizer revised) upstream. The segment cache is bounded LRU and lives
+    only as long as the session.
+    """
+
+    def __init__(self, translate_batch: BatchTranslateFunc, max_segments: Optional[int] = None):
+        self.translate_batch = translate_batch
+        self.max_segments = max_segments or settings.streaming_translation_max_segments
+        self._segments: "OrderedDict[Tuple[str, str, str], str]" = OrderedDict()
+        self.stats = {
+            "updates": 0,
+            "reused_segments": 0,
+            "translated_segments": 0
+        }
+
+    async def translate(self, text: str, source_language: str, target_language: str) -> Dict[str, Any]:
+        """
+        Translate the latest version of a partial transcript
+
+        Args:
+            text: Full current text of the utterance
+            source_language: Source language code
+            target_language: Target language code
+
+        Returns:
+            Dictionary with translation results, shaped like
+            ``TranslationService.translate_text``
+        """
+        self.stats["updates"] += 1
+        segments = [segment for segment in split_segments(text) if segment.strip()]
+        settled, tail = segments[:-1], segments[-1:]
+
+        translations: List[Optional[str]] = []
+        missing: List[str] = []
+        for segment in settled:
+            cached = self._segments.get((source_language, target_language, segment.strip()))
+            if cached is not None:
+                self._segments.move_to_end((source_language, target_language, segment.strip()))
+                self.stats["reused_segments"] += 1
+            else:
+                missing.append(segment)
+            translations.append(cached)
+
+        to_translate = [segment.strip() for segment in missing + tail]
+        fresh = await self.translate_batch(to_translate, source_language, target_language) if to_translate else []
+        self.stats["translated_segments"] += len(to_translate)
+
+        fresh_settled = dict(zip((segment.strip() for segment in missing), fresh))
+        for segment, translated in fresh_settled.items():
+            self._remember((source_language, target_language, segment), translated)
+
+        parts = [
+            translated if translated is not None else fresh_settled[segment.strip()]
+            for segment, translated in zip(settled, translations)
+        ]
+        if tail:
+            parts.append(fresh[-1])
+
+        return {
+            "original_text": text,
+            "translated_text": join_translations(parts, target_language),
+            "source_language": source_language,
+            "target_language": target_language,
+            "confidence": 1.0
+        }
+
+    def _remember(self, key: Tuple[str, str, str], translated: str):
+        self._segments[key] = translated
+        self._segments.move_to_end(key)
+        while len(self._segments) > self.max_segments:
+            self._segments.popitem(last=False)
+
+    def close(self):
+        """Drop the segment cache"""
+        self._segments.clear()
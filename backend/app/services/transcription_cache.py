@@ -0,0 +1,236 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Any, BinaryIO, Dict, Optional
+
+from app.config.settings import settings
+from app.services.redis import get_redis_client
+from app.utils.private_dir import default_private_dir, ensure_private_dir
+from app.utils.word_columns import WordColumns
+
+logger = logging.getLogger(__name__)
+
+# Seconds to stop using Redis after a failed call
+REDIS_RETRY_INTERVAL = 30.0
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def hash_audio(audio: BinaryIO) -> Optional[str]:
+    """
+    SHA-256 of a seekable audio stream, which is rewound afterwards
+
+    Returns:
+        Hex digest, or None when the stream cannot be rewound
+    """
+    try:
+        start = audio.tell()
+    except (AttributeError, OSError):
+        return None
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: audio.read(HASH_CHUNK_SIZE), b""):
+        digest.update(chunk)
+    audio.seek(start)
+    return digest.hexdigest()
+
+
+class DiskResultStore:
+    """
+    Directory of JSON results bounded by total size.
+
+    A file's modification time is when it was written (for expiry); its
+    access time is bumped on every hit and the least recently used files
+    are evicted once the directory grows past ``max_bytes``. The directory
+    is created private to the current user, and an existing one owned by
+    anyone else is refused rather than read from.
+    """
+
+    def __init__(self, directory: str, max_bytes: int, ttl_seconds: float):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._size: Optional[int] = None
+        self.evictions = 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".json")
+
+    def _current_size(self) -> int:
+        if self._size is None:
+            ensure_private_dir(self.directory)
+            self._size = sum(entry.stat().st_size for entry in os.scandir(self.directory) if entry.is_file())
+        return self._size
+
+    def _remove(self, path: str, size: int):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            return
+        self._size = max(self._current_size() - size, 0)
+
+    def get(self, key: str) -> Optional[str]:
+        self._current_size()
+        path = self._path(key)
+        try:
+            stat = os.stat(path)
+            if time.time() - stat.st_mtime > self.ttl_seconds:
+                self._remove(path, stat.st_size)
+                return None
+            with open(path, "r", encoding="utf-8") as cached:
+                raw = cached.read()
+            os.utime(path, (time.time(), stat.st_mtime))
+            return raw
+        except FileNotFoundError:
+            return None
+
+    def set(self, key: str, raw: str):
+        size = self._current_size()
+        path = self._path(key)
+        data = raw.encode("utf-8")
+        if len(data) > self.max_bytes:
+            return
+        try:
+            size -= os.stat(path).st_size
+        except FileNotFoundError:
+            pass
+        # Write then rename so concurrent readers never see a partial file
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as cached:
+            cached.write(data)
+        os.replace(temporary, path)
+        self._size = size + len(data)
+        if self._size > self.max_bytes:
+            self._evict()
+
+    def _evict(self):
+        entries = sorted(
+            (entry.stat().st_atime, entry.path, entry.stat().st_size)
+            for entry in os.scandir(self.directory)
+            if entry.is_file() and entry.name.endswith(".json")
+        )
+        for _, path, size in entries:
+            if self._size <= self.max_bytes:
+                break
+            self._remove(path, size)
+            self.evictions += 1
+
+
+class TranscriptionCache:
+    """
+    Content-addressed cache of parsed prerecorded transcription results.
+
+    Keys combine a hash of the audio bytes with the effective request
+    options, so an identical resubmission is answered without another
+    upload. Words are stored column-wise and returned as ``WordColumns``.
+    Results up to ``redis_max_bytes`` serialized go to the shared Redis
+    instance; larger word lists (and everything while Redis is unreachable)
+    go to a size-bounded local directory. Redis errors are logged and the
+    tier is skipped for a short while.
+    """
+
+    def __init__(
+        self,
+        enabled: Optional[bool] = None,
+        ttl_seconds: Optional[int] = None,
+        use_redis: Optional[bool] = None,
+        redis_max_bytes: Optional[int] = None,
+        cache_dir: Optional[str] = None,
+        disk_max_bytes: Optional[int] = None
+    ):
+        self.enabled = settings.transcription_cache_enabled if enabled is None else enabled
+        self.ttl_seconds = ttl_seconds or settings.transcription_cache_ttl_seconds
+        self.use_redis = settings.transcription_cache_redis_enabled if use_redis is None else use_redis
+        self.redis_max_bytes = redis_max_bytes or settings.transcription_cache_redis_max_bytes
+        self.disk = DiskResultStore(
+            cache_dir or settings.transcription_cache_dir or default_private_dir("verbaflow-transcription-cache"),
+            disk_max_bytes or settings.transcription_cache_disk_max_bytes,
+            self.ttl_seconds
+        )
+        self._redis_retry_at = 0.0
+        self.stats = {
+            "redis_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "redis_errors": 0
+        }
+
+    @staticmethod
+    def result_key(audio_digest: str, options: Dict[str, Any], language: str) -> str:
+        """Cache key for audio with the given prerecorded options and fallback language"""
+        options_digest = hashlib.sha1(
+            json.dumps({"options": options, "language": language}, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+        return f"transcription:v2:{audio_digest}:{options_digest}"
+
+    @staticmethod
+    def _decode(raw: str) -> Dict[str, Any]:
+        result = json.loads(raw)
+        result["words"] = WordColumns.from_json(result["words"])
+        return result
+
+    def _redis_available(self) -> bool:
+        return self.use_redis and time.monotonic() >= self._redis_retry_at
+
+    def _redis_failed(self, e: Exception):
+        self.stats["redis_errors"] += 1
+        self._redis_retry_at = time.monotonic() + REDIS_RETRY_INTERVAL
+        logger.warning(f"Transcription cache Redis tier unavailable, retrying in {REDIS_RETRY_INTERVAL}s: {e}")
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look a result up in Redis, then on disk"""
+        if self._redis_available():
+            try:
+                raw = await get_redis_client().get(key)
+            except Exception as e:
+                self._redis_failed(e)
+                raw = None
+            if raw is not None:
+                self.stats["redis_hits"] += 1
+                return self._decode(raw)
+
+        try:
+            raw = await asyncio.to_thread(self.disk.get, key)
+        except OSError as e:
+            logger.warning(f"Could not read transcription cache entry: {e}")
+            raw = None
+        if raw is not None:
+            self.stats["disk_hits"] += 1
+            return self._decode(raw)
+
+        self.stats["misses"] += 1
+        return None
+
+    async def set(self, key: str, result: Dict[str, Any]):
+        """Store a result in Redis when it is small enough, on disk otherwise"""
+        words = result["words"]
+        if not isinstance(words, WordColumns):
+            words = WordColumns.from_words(words)
+        raw = json.dumps({**result, "words": words.to_json()}, ensure_ascii=False)
+        self.stats["stores"] += 1
+        if len(raw.encode("utf-8")) <= self.redis_max_bytes and self._redis_available():
+            try:
+                await get_redis_client().set(key, raw, ex=self.ttl_seconds)
+                return
+            except Exception as e:
+                self._redis_failed(e)
+        try:
+            await asyncio.to_thread(self.disk.set, key, raw)
+        except OSError as e:
+            logger.warning(f"Could not write transcription cache entry: {e}")
+
+    def get_stats(self) -> dict:
+        """Get hit, miss and eviction counters"""
+        lookups = self.stats["redis_hits"] + self.stats["disk_hits"] + self.stats["misses"]
+        hits = self.stats["redis_hits"] + self.stats["disk_hits"]
+        return {
+            **self.stats,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "enabled": self.enabled,
+            "disk_bytes": self.disk._size or 0,
+            "disk_evictions": self.disk.evictions,
+            "redis_enabled": self.use_redis
+        }
@@ -0,0 +1,470 @@
+import asyncio
+import json
+import logging
+import os
+import shutil
+import time
+import uuid
+from typing import Any, AsyncIterator, Awaitable, BinaryIO, Callable, Dict, List, Optional
+
+from app.config.settings import settings
+from app.services.deepgram import deepgram_service
+from app.services.redis import get_redis_client
+from app.utils.private_dir import default_private_dir, ensure_private_dir
+
+logger = logging.getLogger(__name__)
+
+TranscribeFunc = Callable[..., Awaitable[Dict[str, Any]]]
+
+TERMINAL_STATUSES = ("completed", "failed")
+
+JOB_KEY_PREFIX = "transcription:job:v1:"
+QUEUE_KEY = "transcription:queue:v1"
+PROCESSING_KEY = "transcription:processing:v1"
+DELAYED_KEY = "transcription:delayed:v1"
+LEASE_KEY_PREFIX = "transcription:lease:v1:"
+
+# Seconds between checks for retries that are due
+SCHEDULE_INTERVAL = 0.5
+
+
+def _job_id(value) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+class MemoryJobStore:
+    """In-process job store and queue"""
+
+    name = "memory"
+
+    def __init__(self):
+        self._jobs: Dict[str, tuple] = {}
+        self._queue: "asyncio.Queue[str]" = asyncio.Queue()
+        self._delayed: Dict[str, float] = {}
+
+    async def save(self, job: Dict[str, Any], ttl_seconds: Optional[float] = None):
+        expires_at = time.monotonic() + ttl_seconds if ttl_seconds else None
+        self._jobs[job["id"]] = (expires_at, json.dumps(job))
+
+    async def load(self, job_id: str) -> Optional[Dict[str, Any]]:
+        entry = self._jobs.get(job_id)
+        if entry is None:
+            return None
+        expires_at, raw = entry
+        if expires_at is not None and expires_at < time.monotonic():
+            del self._jobs[job_id]
+            return None
+        return json.loads(raw)
+
+    async def purge_expired(self):
+        now = time.monotonic()
+        for job_id, (expires_at, _) in list(self._jobs.items()):
+            if expires_at is not None and expires_at < now:
+                del self._jobs[job_id]
+
+    async def enqueue(self, job_id: str):
+        self._queue.put_nowait(job_id)
+
+    async def dequeue(self, timeout: float) -> Optional[str]:
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def hold(self, job_id: str, lease_seconds: float):
+        pass
+
+    async def ack(self, job_id: str):
+        pass
+
+    async def release(self, job_id: str):
+        self._queue.put_nowait(job_id)
+
+    async def schedule(self, job_id: str, due_at: float):
+        self._delayed[job_id] = due_at
+
+    async def promote_due(self, now: float):
+        for job_id, due_at in list(self._delayed.items()):
+            if due_at <= now:
+                del self._delayed[job_id]
+                self._queue.put_nowait(job_id)
+
+    async def recover(self) -> int:
+        return 0
+
+
+class RedisJobStore:
+    """
+    Job records and queue kept in Redis, shared by every API process.
+
+    Dequeued ids move to a processing list and stay there, covered by a
+    lease key the worker keeps refreshing, until the job is finished or
+    scheduled for a retry. Ids whose lease has lapsed belonged to a
+    process that died and are put back on the queue by ``recover``.
+    Retries wait in a sorted set scored by due time.
+    """
+
+    name = "redis"
+
+    async def save(self, job: Dict[str, Any], ttl_seconds: Optional[float] = None):
+        await get_redis_client().set(
+            JOB_KEY_PREFIX + job["id"],
+            json.dumps(job),
+            ex=int(ttl_seconds) if ttl_seconds else None
+        )
+
+    async def load(self, job_id: str) -> Optional[Dict[str, Any]]:
+        raw = await get_redis_client().get(JOB_KEY_PREFIX + job_id)
+        return json.loads(raw) if raw else None
+
+    async def enqueue(self, job_id: str):
+        await get_redis_client().lpush(QUEUE_KEY, job_id)
+
+    async def purge_expired(self):
+        # Job keys carry their own TTL
+        pass
+
+    async def dequeue(self, timeout: float) -> Optional[str]:
+        job_id = await get_redis_client().blmove(
+            QUEUE_KEY, PROCESSING_KEY, max(int(timeout), 1), src="RIGHT", dest="LEFT"
+        )
+        return _job_id(job_id) if job_id is not None else None
+
+    async def hold(self, job_id: str, lease_seconds: float):
+        await get_redis_client().set(LEASE_KEY_PREFIX + job_id, "1", ex=max(int(lease_seconds), 1))
+
+    async def ack(self, job_id: str):
+        redis = get_redis_client()
+        await redis.lrem(PROCESSING_KEY, 0, job_id)
+        await redis.delete(LEASE_KEY_PREFIX + job_id)
+
+    async def release(self, job_id: str):
+        # Workers pop from the right, so this puts the job at the head of the queue
+        await get_redis_client().rpush(QUEUE_KEY, job_id)
+        await self.ack(job_id)
+
+    async def schedule(self, job_id: str, due_at: float):
+        await get_redis_client().zadd(DELAYED_KEY, {job_id: due_at})
+
+    async def promote_due(self, now: float):
+        redis = get_redis_client()
+        for job_id in await redis.zrangebyscore(DELAYED_KEY, "-inf", now):
+            # Only the process whose ZREM succeeds requeues the job
+            if await redis.zrem(DELAYED_KEY, job_id):
+                await redis.lpush(QUEUE_KEY, _job_id(job_id))
+
+    async def recover(self) -> int:
+        redis = get_redis_client()
+        recovered = 0
+        for job_id in await redis.lrange(PROCESSING_KEY, 0, -1):
+            job_id = _job_id(job_id)
+            if await redis.exists(LEASE_KEY_PREFIX + job_id):
+                continue
+            if await redis.lrem(PROCESSING_KEY, 1, job_id):
+                await redis.rpush(QUEUE_KEY, job_id)
+                recovered += 1
+        return recovered
+
+
+class TranscriptionJobQueue:
+    """
+    Asynchronous transcription jobs processed by a bounded worker pool.
+
+    Submitting stores the audio in a spool directory and returns the job at
+    once; workers pick job ids from the queue (Redis when reachable,
+    in-memory otherwise), transcribe under a per-provider concurrency limit,
+    and retry failures with exponential backoff. Pending retries live in the
+    store rather than in this process, and on Redis a job being worked on is
+    requeued if its process stops or dies. Finished jobs keep their result
+    for ``result_ttl_seconds``. The spool directory is private to the user
+    running the service and must be shared by every process that runs
+    workers against the same Redis queue.
+    """
+
+    def __init__(
+        self,
+        providers: Dict[str, TranscribeFunc],
+        workers: Optional[int] = None,
+        provider_limits: Optional[Dict[str, int]] = None,
+        max_attempts: Optional[int] = None,
+        backoff_seconds: Optional[float] = None,
+        result_ttl_seconds: Optional[float] = None,
+        use_redis: Optional[bool] = None,
+        spool_dir: Optional[str] = None,
+        lease_seconds: Optional[float] = None
+    ):
+        self.providers = providers
+        self.workers = workers or settings.transcription_jobs_workers
+        limits = provider_limits or settings.transcription_jobs_provider_limits
+        self._provider_slots = {
+            name: asyncio.Semaphore(limits.get(name, self.workers)) for name in providers
+        }
+        self.max_attempts = max_attempts or settings.transcription_jobs_max_attempts
+        self.backoff_seconds = settings.transcription_jobs_backoff_seconds if backoff_seconds is None else backoff_seconds
+        self.result_ttl_seconds = result_ttl_seconds or settings.transcription_jobs_result_ttl_seconds
+        self.use_redis = settings.transcription_jobs_redis_enabled if use_redis is None else use_redis
+        self.spool_dir = spool_dir or settings.transcription_jobs_spool_dir or default_private_dir(
+            "verbaflow-transcription-jobs"
+        )
+        self.lease_seconds = lease_seconds or settings.transcription_jobs_lease_seconds
+        self.store = None
+        self._tasks: List[asyncio.Task] = []
+        self._in_flight: set = set()
+        self._updates: Dict[str, asyncio.Event] = {}
+        self.stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "retries": 0,
+            "recovered": 0
+        }
+
+    async def start(self):
+        """Pick the job store and start the worker pool"""
+        if self._tasks:
+            return
+        self.store = MemoryJobStore()
+        if self.use_redis:
+            try:
+                await get_redis_client().ping()
+                self.store = RedisJobStore()
+            except Exception as e:
+                logger.warning(f"Redis unavailable for transcription jobs, using in-memory queue: {e}")
+        ensure_private_dir(self.spool_dir)
+        await self._recover()
+        self._tasks = [asyncio.create_task(self._worker(index)) for index in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._scheduler()))
+        logger.info(f"Started {self.workers} transcription workers on the {self.store.name} queue")
+
+    async def shutdown(self):
+        """Stop the workers and put jobs they were working on back on the queue"""
+        in_flight = set(self._in_flight)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for job_id in in_flight:
+            try:
+                job = await self.store.load(job_id)
+                if job is not None and job["status"] not in TERMINAL_STATUSES:
+                    if job["status"] == "processing":
+                        # The interrupted attempt does not count
+                        await self._update(job, status="queued", attempts=job["attempts"] - 1, progress=0.0)
+                    await self.store.release(job_id)
+            except Exception as e:
+                logger.error(f"Could not requeue transcription job {job_id} on shutdown: {e}")
+
+    async def submit(
+        self,
+        audio: BinaryIO,
+        language: str = "en",
+        detect_language: bool = False,
+        provider: str = "deepgram"
+    ) -> Dict[str, Any]:
+        """
+        Queue audio for transcription
+
+        Args:
+            audio: Readable binary audio stream
+            language: Language code used when not detecting
+            detect_language: Whether the provider should detect the language
+            provider: Transcription provider name
+
+        Returns:
+            The new job record
+        """
+        if provider not in self.providers:
+            raise ValueError(f"Unknown transcription provider: {provider}")
+        if self.store is None:
+            await self.start()
+
+        job_id = uuid.uuid4().hex
+        # Long-audio bodies can be hundreds of megabytes
+        await asyncio.to_thread(self._spool_audio, job_id, audio)
+
+        now = time.time()
+        job = {
+            "id": job_id,
+            "status": "queued",
+            "provider": provider,
+            "options": {"language": language, "detect_language": detect_language},
+            "attempts": 0,
+            "progress": 0.0,
+            "created_at": now,
+            "updated_at": now,
+            "result": None,
+            "error": None
+        }
+        await self.store.save(job)
+        await self.store.enqueue(job_id)
+        self.stats["submitted"] += 1
+        return job
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get a job record, or None if it is unknown or has expired"""
+        if self.store is None:
+            return None
+        return await self.store.load(job_id)
+
+    async def watch(self, job_id: str, poll_interval: float = 1.0) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield the job record each time it changes, until it finishes
+
+        Updates made in this process wake the watcher immediately; updates
+        from workers in other processes are picked up by polling.
+        """
+        last_update = None
+        while True:
+            job = await self.get(job_id)
+            if job is None:
+                return
+            if job["updated_at"] != last_update:
+                last_update = job["updated_at"]
+                yield job
+            if job["status"] in TERMINAL_STATUSES:
+                return
+            event = self._updates.setdefault(job_id, asyncio.Event())
+            try:
+                await asyncio.wait_for(event.wait(), poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            event.clear()
+
+    def _audio_path(self, job_id: str) -> str:
+        return os.path.join(self.spool_dir, f"{job_id}.audio")
+
+    def _spool_audio(self, job_id: str, audio: BinaryIO):
+        with open(self._audio_path(job_id), "wb") as spooled:
+            shutil.copyfileobj(audio, spooled)
+
+    async def _update(self, job: Dict[str, Any], **changes):
+        job.update(changes, updated_at=time.time())
+        ttl = self.result_ttl_seconds if job["status"] in TERMINAL_STATUSES else None
+        await self.store.save(job, ttl)
+        event = self._updates.get(job["id"])
+        if event is not None:
+            event.set()
+        if job["status"] in TERMINAL_STATUSES:
+            self._updates.pop(job["id"], None)
+
+    async def _recover(self):
+        try:
+            recovered = await self.store.recover()
+        except Exception as e:
+            logger.error(f"Could not recover abandoned transcription jobs: {e}")
+            return
+        if recovered:
+            self.stats["recovered"] += recovered
+            logger.warning(f"Requeued {recovered} transcription jobs abandoned by a stopped worker")
+
+    async def _scheduler(self):
+        """
+        Move retries that are due back onto the queue, drop expired results,
+        and recover abandoned jobs now and then
+        """
+        last_recovery = time.monotonic()
+        while True:
+            await asyncio.sleep(SCHEDULE_INTERVAL)
+            try:
+                await self.store.promote_due(time.time())
+                await self.store.purge_expired()
+            except Exception as e:
+                logger.error(f"Transcription job scheduler step failed: {e}")
+            if time.monotonic() - last_recovery >= self.lease_seconds:
+                last_recovery = time.monotonic()
+                await self._recover()
+
+    async def _hold_lease(self, job_id: str):
+        while True:
+            try:
+                await self.store.hold(job_id, self.lease_seconds)
+            except Exception as e:
+                logger.warning(f"Could not refresh the lease on transcription job {job_id}: {e}")
+            await asyncio.sleep(self.lease_seconds / 3)
+
+    async def _worker(self, index: int):
+        while True:
+            try:
+                job_id = await self.store.dequeue(timeout=1.0)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Transcription worker {index} could not read the queue: {e}")
+                await asyncio.sleep(1.0)
+                continue
+            if job_id is None:
+                continue
+            self._in_flight.add(job_id)
+            lease = asyncio.create_task(self._hold_lease(job_id))
+            try:
+                await self._process(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Transcription job {job_id} crashed the worker step: {e}")
+            finally:
+                lease.cancel()
+                self._in_flight.discard(job_id)
+
+    async def _process(self, job_id: str):
+        job = await self.store.load(job_id)
+        if job is None or job["status"] in TERMINAL_STATUSES:
+            await self.store.ack(job_id)
+            return
+
+        async with self._provider_slots[job["provider"]]:
+            await self._update(job, status="processing", attempts=job["attempts"] + 1, progress=0.1)
+            try:
+                with open(self._audio_path(job_id), "rb") as audio:
+                    result = await self.providers[job["provider"]](
+                        audio,
+                        job["options"]["language"],
+                        detect_language=job["options"]["detect_language"]
+                    )
+                error = None if result.get("success") else result.get("error", "Transcription failed")
+            except Exception as e:
+                result, error = None, str(e)
+
+        if error is None:
+            self.stats["completed"] += 1
+            await self._update(job, status="completed", progress=1.0, result=result, error=None)
+            await self.store.ack(job_id)
+            self._remove_audio(job_id)
+            return
+
+        if job["attempts"] < self.max_attempts:
+            delay = self.backoff_seconds * 2 ** (job["attempts"] - 1)
+            self.stats["retries"] += 1
+            logger.warning(f"Transcription job {job_id} attempt {job['attempts']} failed, retrying in {delay}s: {error}")
+            await self._update(job, status="retrying", error=error)
+            # Scheduled before the ack so a crash in between can only run it twice
+            await self.store.schedule(job_id, time.time() + delay)
+            await self.store.ack(job_id)
+            return
+
+        self.stats["failed"] += 1
+        logger.error(f"Transcription job {job_id} failed after {job['attempts']} attempts: {error}")
+        await self._update(job, status="failed", error=error)
+        await self.store.ack(job_id)
+        self._remove_audio(job_id)
+
+    def _remove_audio(self, job_id: str):
+        try:
+            os.remove(self._audio_path(job_id))
+        except FileNotFoundError:
+            pass
+
+    def get_stats(self) -> dict:
+        """Get job queue statistics"""
+        stats = dict(self.stats)
+        stats["store"] = self.store.name if self.store is not None else None
+        stats["workers"] = self.workers if self._tasks else 0
+        stats["in_flight"] = len(self._in_flight)
+        return stats
+
+
+# Create a singleton instance
+transcription_jobs = TranscriptionJobQueue({
+    "deepgram": deepgram_service.transcribe_audio_data,
+    "deepgram-long": deepgram_service.transcribe_long_audio
+})
@@ -90,7 +90,8 @@ class TranslationService:
                 mime_type="text/plain",
             )
             
-            response = self.client.detect_language(request=request)
+            # The deadline bounds the gRPC call itself, so a hung upstream frees the worker thread
+            response = self.client.detect_language(request=request, timeout=settings.translation_timeout_seconds)
             
             # Get the first detected language
             if response.languages:
@@ -230,6 +231,36 @@ class TranslationService:
                 "confidence": 1.0  # No translation needed
             }
         
+        translated_text = self.translate_batch([text], source_language, target_language)[0]
+        
+        return {
+            "original_text": text,
+            "translated_text": translated_text,
+            "source_language": source_language,
+            "target_language": target_language,
+            "confidence": 1.0
+        }
+    
+    def translate_batch(
+        self,
+        contents: List[str],
+        source_language: str,
+        target_language: str
+    ) -> List[str]:
+        """
+        Translate several texts for one language pair in a single API request
+        
+        Args:
+            contents: Texts to translate
+            source_language: Source language code (e.g., 'en', 'es', 'zh')
+            target_language: Target language code (e.g., 'en', 'es', 'zh')
+            
+        Returns:
+            Translated texts, in the same order as ``contents``
+        """
+        if not contents:
+            return []
+        
         # If Google Cloud client is not available, raise an error
         if not self.client:
             raise RuntimeError("Google Cloud Translate client is not initialized.")
@@ -242,115 +273,159 @@ class TranslationService:
             # Create the translation request
             request = translate.TranslateTextRequest(
                 parent=parent,
-                contents=[text],
+                contents=list(contents),
                 mime_type="text/plain",
                 source_language_code=source_language,
                 target_language_code=target_language,
             )
             
-            # Call the API
-            response = self.client.translate_text(request=request)
+            # Call the API; the deadline bounds the gRPC call itself, so a hung upstream frees the worker thread
+            response = self.client.translate_text(request=request, timeout=settings.translation_timeout_seconds)
             
-            # Extract the translation
-            translated_text = response.translations[0].translated_text if response.translations else ""
-            
-            return {
-                "original_text": text,
-                "translated_text": translated_text,
-                "source_language": source_language,
-                "target_language": target_language,
-                "confidence": 1.0
-            }
+            # Extract the translations, padding in case the API returned fewer items
+            translations = [t.translated_text for t in response.translations]
+            translations.extend([""] * (len(contents) - len(translations)))
+            return translations
             
         except Exception as e:
             logger.error(f"Google Cloud translation error: {e}")
             raise
 
-def process_translated_text(text: str, language: str = 'en') -> str:
-    # Optionally add punctuation or other post-processing here
-    return text
-
 # Create singleton instance
 translation_service = TranslationService()
 
+# Language-specific punctuation vocabularies: (question words, exclamation words)
+PUNCTUATION_RULES = {
+    'en': (
+        ('what', 'when', 'where', 'who', 'why', 'how', 'which', 'whose', 'whom', 'is', 'are', 'was', 'were',
+         'do', 'does', 'did', 'can', 'could', 'will', 'would', 'should', 'may', 'might'),
+        ('wow', 'oh', 'ah', 'amazing', 'incredible', 'fantastic', 'great', 'excellent', 'perfect', 'wonderful',
+         'terrible', 'awful', 'horrible', 'stop', 'wait', 'no', 'yes', 'please', 'thank you', 'thanks')
+    ),
+    'es': (
+        ('qué', 'cuándo', 'dónde', 'quién', 'por qué', 'cómo', 'cuál', 'es', 'son', 'está', 'están', 'puede',
+         'podría', 'debería'),
+        ('hola', 'buenos días', 'buenas tardes', 'buenas noches', 'adiós', 'hasta luego', 'por favor', 'gracias',
+         'perdón', 'wow', 'increíble', 'fantástico')
+    ),
+    'fr': (
+        ("qu'est-ce que", 'quand', 'où', 'qui', 'pourquoi', 'comment', 'quel', 'est', 'sont', 'peut', 'pourrait',
+         'devrait'),
+        ('bonjour', 'bonsoir', 'au revoir', "s'il vous plaît", 'merci', 'pardon', 'excusez-moi', 'wow',
+         'incroyable', 'fantastique')
+    ),
+    'de': (
+        ('was', 'wann', 'wo', 'wer', 'warum', 'wie', 'welcher', 'ist', 'sind', 'kann', 'könnte', 'sollte'),
+        ('hallo', 'guten tag', 'guten abend', 'auf wiedersehen', 'bitte', 'danke', 'entschuldigung', 'wow',
+         'unglaublich', 'fantastisch')
+    ),
+    'zh': (
+        ('什么', '什么时候', '哪里', '谁', '为什么', '怎么', '哪个', '是', '可以', '应该'),
+        ('你好', '早上好', '下午好', '晚上好', '再见', '谢谢', '请', '对不起', '哇', '太棒了', '不可思议')
+    ),
+    'ja': (
+        ('何', 'いつ', 'どこ', '誰', 'なぜ', 'どう', 'どちら', 'です', 'できます', 'すべき'),
+        ('こんにちは', 'おはよう', 'こんばんは', 'さようなら', 'ありがとう', 'お願い', 'すみません', 'すごい', '素晴らしい')
+    )
+}
+
+SENTENCE_TERMINATORS = ('.', '!', '?', '。', '！', '？')
+_TRAILING_TERMINATORS = ''.join(SENTENCE_TERMINATORS)
+_WHITESPACE_RE = re.compile(r'\s+')
+_DOUBLE_COMMA_RE = re.compile(r',\s*,')
+
+
+def _compile_punctuation_scanner(questions, exclamations):
+    """Merge a language's question and exclamation vocabularies into one scan.
+
+    The lookahead keeps every match zero-width, so a question word inside an
+    exclamation phrase is still seen; at each position questions are tried
+    first, matching the precedence of the original per-category searches.
+    """
+    question_alt = '|'.join(re.escape(word) for word in questions)
+    exclamation_alt = '|'.join(re.escape(word) for word in exclamations)
+    return re.compile(
+        rf'\b(?=(?P<question>{question_alt})\b|(?P<exclamation>{exclamation_alt})\b)',
+        re.IGNORECASE
+    )
+
+
+# Compiled once at import; unknown languages fall back to English
+_PUNCTUATION_SCANNERS = {
+    language: _compile_punctuation_scanner(questions, exclamations)
+    for language, (questions, exclamations) in PUNCTUATION_RULES.items()
+}
+
+
+def _sentence_mark(text: str, scanner) -> str:
+    """Return '?' or '!' if the text contains a question or exclamation word, else ''"""
+    mark = ''
+    for match in scanner.finditer(text):
+        if match.group('question') is not None:
+            return '?'
+        mark = '!'
+    return mark
+
+
+def _punctuate(text: str, scanner) -> str:
+    """Punctuate text that is already stripped"""
+    mark = _sentence_mark(text, scanner)
+    if mark:
+        if not text.endswith(mark):
+            text += mark
+    elif not text.endswith(SENTENCE_TERMINATORS):
+        text += '.'
+
+    # Ensure proper capitalization
+    if text[0].islower():
+        text = text[0].upper() + text[1:]
+
+    # Collapse a run of trailing terminators to its first character
+    body = text.rstrip(_TRAILING_TERMINATORS)
+    if len(text) - len(body) > 1:
+        text = body + text[len(body)]
+
+    if ',' in text:
+        text = _DOUBLE_COMMA_RE.sub(',', text)
+
+    return text
+
+
 # Punctuation restoration utility
 def add_punctuation_to_text(text: str, language: str = 'en') -> str:
     """Add punctuation to text based on language patterns"""
     if not text or not text.strip():
         return text
-    
-    processed_text = text.strip()
-    
-    # Language-specific punctuation patterns
-    punctuation_patterns = {
-        'en': {
-            'questions': r'\b(what|when|where|who|why|how|which|whose|whom|is|are|was|were|do|does|did|can|could|will|would|should|may|might)\b',
-            'exclamations': r'\b(wow|oh|ah|amazing|incredible|fantastic|great|excellent|perfect|wonderful|terrible|awful|horrible|stop|wait|no|yes|please|thank you|thanks)\b',
-            'greetings': r'\b(hello|hi|hey|good morning|good afternoon|good evening|goodbye|bye|see you)\b'
-        },
-        'es': {
-            'questions': r'\b(qué|cuándo|dónde|quién|por qué|cómo|cuál|es|son|está|están|puede|podría|debería)\b',
-            'exclamations': r'\b(hola|buenos días|buenas tardes|buenas noches|adiós|hasta luego|por favor|gracias|perdón|wow|increíble|fantástico)\b',
-            'greetings': r'\b(hola|buenos días|buenas tardes|buenas noches|adiós|hasta luego)\b'
-        },
-        'fr': {
-            'questions': r'\b(qu\'est-ce que|quand|où|qui|pourquoi|comment|quel|est|sont|peut|pourrait|devrait)\b',
-            'exclamations': r'\b(bonjour|bonsoir|au revoir|s\'il vous plaît|merci|pardon|excusez-moi|wow|incroyable|fantastique)\b',
-            'greetings': r'\b(bonjour|bonsoir|au revoir)\b'
-        },
-        'de': {
-            'questions': r'\b(was|wann|wo|wer|warum|wie|welcher|ist|sind|kann|könnte|sollte)\b',
-            'exclamations': r'\b(hallo|guten tag|guten abend|auf wiedersehen|bitte|danke|entschuldigung|wow|unglaublich|fantastisch)\b',
-            'greetings': r'\b(hallo|guten tag|guten abend|auf wiedersehen)\b'
-        },
-        'zh': {
-            'questions': r'\b(什么|什么时候|哪里|谁|为什么|怎么|哪个|是|可以|应该)\b',
-            'exclamations': r'\b(你好|早上好|下午好|晚上好|再见|谢谢|请|对不起|哇|太棒了|不可思议)\b',
-            'greetings': r'\b(你好|早上好|下午好|晚上好|再见)\b'
-        },
-        'ja': {
-            'questions': r'\b(何|いつ|どこ|誰|なぜ|どう|どちら|です|できます|すべき)\b',
-            'exclamations': r'\b(こんにちは|おはよう|こんばんは|さようなら|ありがとう|お願い|すみません|すごい|素晴らしい)\b',
-            'greetings': r'\b(こんにちは|おはよう|こんばんは|さようなら)\b'
-        }
-    }
-    
-    # Get patterns for the language
-    patterns = punctuation_patterns.get(language, punctuation_patterns['en'])
-    
-    # Check for questions
-    if re.search(patterns['questions'], processed_text, re.IGNORECASE):
-        if not processed_text.endswith('?'):
-            processed_text += '?'
-    # Check for exclamations
-    elif re.search(patterns['exclamations'], processed_text, re.IGNORECASE):
-        if not processed_text.endswith('!'):
-            processed_text += '!'
-    # Add period if no punctuation at the end
-    elif not processed_text.endswith(('.', '!', '?', '。', '！', '？')):
-        processed_text += '.'
-    
-    # Ensure proper capitalization
-    if processed_text and processed_text[0].islower():
-        processed_text = processed_text[0].upper() + processed_text[1:]
-    
-    # Clean up multiple spaces and punctuation
-    processed_text = re.sub(r'\s+', ' ', processed_text)
-    processed_text = re.sub(r'[.!?。！？]+$', lambda m: m.group()[0], processed_text)
-    processed_text = re.sub(r',\s*,', ',', processed_text)
-    
-    return processed_text.strip()
+
+    processed_text = _punctuate(text.strip(), _PUNCTUATION_SCANNERS.get(language, _PUNCTUATION_SCANNERS['en']))
+
+    # Clean up multiple spaces
+    return _WHITESPACE_RE.sub(' ', processed_text).strip()
+
 
 def process_translated_text(text: str, language: str = 'en') -> str:
     """Process translated text with punctuation and cleanup"""
     if not text or not text.strip():
         return text
-    
-    # Step 1: Clean up common translation artifacts
-    cleaned_text = text.strip()
-    cleaned_text = re.sub(r'\s+', ' ', cleaned_text)  # Remove extra spaces
-    
-    # Step 2: Add punctuation
-    punctuated_text = add_punctuation_to_text(cleaned_text, language)
-    
-    return punctuated_text 
\ No newline at end of file
+
+    # Clean up common translation artifacts, then add punctuation
+    cleaned_text = ' '.join(text.split())
+    return _punctuate(cleaned_text, _PUNCTUATION_SCANNERS.get(language, _PUNCTUATION_SCANNERS['en']))
+
+
+def process_translated_texts(texts: List[str], language: str = 'en') -> List[str]:
+    """
+    Process a batch of translated texts for one language
+
+    Args:
+        texts: Translated texts
+        language: Language code of the texts
+
+    Returns:
+        Processed texts, in the same order
+    """
+    scanner = _PUNCTUATION_SCANNERS.get(language, _PUNCTUATION_SCANNERS['en'])
+    return [
+        _punctuate(' '.join(text.split()), scanner) if text and not text.isspace() else text
+        for text in texts
+    ]
@@ -0,0 +1,158 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from app.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+FlushFunc = Callable[[List[str], str, str], Awaitable[List[str]]]
+
+
+class _PendingBatch:
+    """Texts waiting to be sent upstream for one (source, target) pair"""
+
+    def __init__(self):
+        self.texts: List[str] = []
+        self.futures: List[asyncio.Future] = []
+        self.chars = 0
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+class TranslationBatcher:
+    """
+    Coalesces concurrent single-text translations into batched requests.
+
+    Calls for the same (source, target) pair that arrive within ``window_ms``
+    are sent upstream as one multi-content request. A batch is flushed early
+    once it reaches ``max_batch_size`` texts or would exceed
+    ``max_batch_chars`` characters. Each caller receives its own translation
+    through a future.
+    """
+
+    def __init__(
+        self,
+        flush_func: FlushFunc,
+        window_ms: Optional[int] = None,
+        max_batch_size: Optional[int] = None,
+        max_batch_chars: Optional[int] = None
+    ):
+        self.flush_func = flush_func
+        self.window_ms = settings.translation_batch_window_ms if window_ms is None else window_ms
+        self.max_batch_size = max_batch_size or settings.translation_batch_max_size
+        self.max_batch_chars = max_batch_chars or settings.translation_batch_max_chars
+        self._pending: Dict[Tuple[str, str], _PendingBatch] = {}
+        # In-flight sends; the loop only keeps weak references to tasks
+        self._tasks: Set[asyncio.Task] = set()
+        self.stats = {
+            "submitted": 0,
+            "batches": 0,
+            "upstream_contents": 0
+        }
+
+    async def submit(self, text: str, source_language: str, target_language: str) -> str:
+        """
+        Queue a text for translation and wait for its result
+
+        Args:
+            text: Text to translate
+            source_language: Source language code
+            target_language: Target language code
+
+        Returns:
+            The translated text
+        """
+        self.stats["submitted"] += 1
+
+        if self.window_ms <= 0:
+            self.stats["batches"] += 1
+            self.stats["upstream_contents"] += 1
+            return (await self.flush_func([text], source_language, target_language))[0]
+
+        key = (source_language, target_language)
+        loop = asyncio.get_running_loop()
+
+        batch = self._pending.get(key)
+        if batch is not None and batch.chars + len(text) > self.max_batch_chars:
+            self._flush(key)
+            batch = None
+
+        if batch is None:
+            batch = _PendingBatch()
+            self._pending[key] = batch
+            batch.timer = loop.call_later(self.window_ms / 1000, self._flush, key)
+
+        future = loop.create_future()
+        batch.texts.append(text)
+        batch.futures.append(future)
+        batch.chars += len(text)
+
+        if len(batch.texts) >= self.max_batch_size:
+            self._flush(key)
+
+        return await future
+
+    def _flush(self, key: Tuple[str, str]):
+        """Detach the pending batch for ``key`` and send it upstream"""
+        batch = self._pending.pop(key, None)
+        if batch is None:
+            return
+        if batch.timer is not None:
+            batch.timer.cancel()
+        task = asyncio.get_running_loop().create_task(self._send(key, batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, key: Tuple[str, str], batch: _PendingBatch):
+        source_language, target_language = key
+
+        # Callers that were cancelled while queued (e.g. superseded partial
+        # transcripts) are not sent upstream at all
+        pending = [(text, future) for text, future in zip(batch.texts, batch.futures) if not future.done()]
+        if not pending:
+            return
+        batch.texts = [text for text, _ in pending]
+        batch.futures = [future for _, future in pending]
+
+        # Identical texts in one window are only sent once
+        unique_texts = list(dict.fromkeys(batch.texts))
+        self.stats["batches"] += 1
+        self.stats["upstream_contents"] += len(unique_texts)
+
+        try:
+            translations = await self.flush_func(unique_texts, source_language, target_language)
+            by_text = dict(zip(unique_texts, translations))
+        except asyncio.CancelledError:
+            for future in batch.futures:
+                future.cancel()
+            raise
+        except Exception as e:
+            logger.error(f"Batched translation of {len(unique_texts)} texts failed: {e}")
+            for future in batch.futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for text, future in zip(batch.texts, batch.futures):
+            if not future.done():
+                future.set_result(by_text.get(text, ""))
+
+    async def close(self):
+        """Cancel queued and in-flight batches; their callers get ``CancelledError``"""
+        for batch in self._pending.values():
+            if batch.timer is not None:
+                batch.timer.cancel()
+            for future in batch.futures:
+                future.cancel()
+        self._pending.clear()
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def get_stats(self) -> dict:
+        """Get batching statistics"""
+        stats = dict(self.stats)
+        stats["pending_batches"] = len(self._pending)
+        stats["in_flight_batches"] = len(self._tasks)
+        return stats
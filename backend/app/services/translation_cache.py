@@ -0,0 +1,186 @@
+import hashlib
+import json
+import logging
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, List, Optional, Tuple
+
+from app.config.settings import settings
+from app.services.redis import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+# Seconds to stop using Redis after a failed call
+REDIS_RETRY_INTERVAL = 30.0
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text for cache keys: NFC, trimmed, internal whitespace collapsed.
+
+    Case is kept because it can change the translation ("US" vs "us").
+    """
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+class LRUCache:
+    """Bounded in-process LRU cache whose entries expire after ``ttl_seconds``"""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any):
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class TranslationCache:
+    """
+    Two-tier read-through cache for translations and language detection.
+
+    Tier one is a per-process ``LRUCache``; tier two is the shared Redis
+    instance, so every uvicorn worker benefits from the others' lookups.
+    Redis errors are logged and the tier is skipped for a short while
+    instead of failing the translation.
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+        redis_ttl_seconds: Optional[int] = None,
+        use_redis: Optional[bool] = None
+    ):
+        self.local = LRUCache(
+            max_entries or settings.translation_cache_max_entries,
+            ttl_seconds or settings.translation_cache_ttl_seconds
+        )
+        self.redis_ttl_seconds = redis_ttl_seconds or settings.translation_cache_redis_ttl_seconds
+        self.use_redis = settings.translation_cache_redis_enabled if use_redis is None else use_redis
+        self._redis_retry_at = 0.0
+        self.stats = {
+            "local_hits": 0,
+            "redis_hits": 0,
+            "misses": 0,
+            "redis_errors": 0
+        }
+
+    @staticmethod
+    def translation_key(text: str, source_language: str, target_language: str) -> str:
+        digest = hashlib.sha1(normalize_text(text).encode("utf-8")).hexdigest()
+        return f"translation:v1:{source_language}:{target_language}:{digest}"
+
+    @staticmethod
+    def detection_key(text: str) -> str:
+        digest = hashlib.sha1(normalize_text(text).encode("utf-8")).hexdigest()
+        return f"detection:v1:{digest}"
+
+    def _redis_available(self) -> bool:
+        return self.use_redis and time.monotonic() >= self._redis_retry_at
+
+    def _redis_failed(self, e: Exception):
+        self.stats["redis_errors"] += 1
+        self._redis_retry_at = time.monotonic() + REDIS_RETRY_INTERVAL
+        logger.warning(f"Translation cache Redis tier unavailable, retrying in {REDIS_RETRY_INTERVAL}s: {e}")
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Look a key up in the local tier, then in Redis"""
+        value = self.local.get(key)
+        if value is not None:
+            self.stats["local_hits"] += 1
+            return value
+
+        if self._redis_available():
+            try:
+                raw = await get_redis_client().get(key)
+            except Exception as e:
+                self._redis_failed(e)
+                raw = None
+            if raw is not None:
+                value = json.loads(raw)
+                self.local.set(key, value)
+                self.stats["redis_hits"] += 1
+                return value
+
+        self.stats["misses"] += 1
+        return None
+
+    async def get_many(self, keys: List[str]) -> List[Optional[Any]]:
+        """
+        Look many keys up at once, with a single MGET for the local misses
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Values in the same order as ``keys``, ``None`` for misses
+        """
+        values = [self.local.get(key) for key in keys]
+        missing = [i for i, value in enumerate(values) if value is None]
+        self.stats["local_hits"] += len(keys) - len(missing)
+
+        if missing and self._redis_available():
+            try:
+                raws = await get_redis_client().mget([keys[i] for i in missing])
+            except Exception as e:
+                self._redis_failed(e)
+                raws = [None] * len(missing)
+            for i, raw in zip(missing, raws):
+                if raw is not None:
+                    values[i] = json.loads(raw)
+                    self.local.set(keys[i], values[i])
+                    self.stats["redis_hits"] += 1
+
+        self.stats["misses"] += sum(1 for value in values if value is None)
+        return values
+
+    async def set(self, key: str, value: Any):
+        """Store a value in both tiers"""
+        self.local.set(key, value)
+        if self._redis_available():
+            try:
+                await get_redis_client().set(key, json.dumps(value), ex=self.redis_ttl_seconds)
+            except Exception as e:
+                self._redis_failed(e)
+
+    def clear(self):
+        """Drop the local tier (Redis entries expire on their own)"""
+        self.local.clear()
+
+    def get_stats(self) -> dict:
+        """Get hit, miss and eviction counters"""
+        lookups = self.stats["local_hits"] + self.stats["redis_hits"] + self.stats["misses"]
+        hits = self.stats["local_hits"] + self.stats["redis_hits"]
+        return {
+            **self.stats,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "local_entries": len(self.local),
+            "local_evictions": self.local.evictions,
+            "local_expirations": self.local.expirations,
+            "redis_enabled": self.use_redis
+        }
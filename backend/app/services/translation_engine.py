@@ -0,0 +1,553 @@
+import asyncio
+import inspect
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Protocol, Tuple, Union
+
+from app.config.settings import settings
+from app.services.translation import translation_service, process_translated_text, process_translated_texts
+from app.services.translation_batcher import TranslationBatcher
+from app.services.translation_cache import TranslationCache
+from app.services.language_detector import LocalLanguageDetector, local_language_detector
+from app.services.streaming_translation import StreamingTranslationSession
+from app.utils.text_segmentation import chunk_sentences
+
+logger = logging.getLogger(__name__)
+
+
+class TranslationTimeoutError(RuntimeError):
+    """Raised when an upstream translation call does not finish in time"""
+
+
+class TranslationBackend(Protocol):
+    """
+    Interface for the upstream that performs translation and detection.
+
+    Methods may be plain blocking functions, which the engine runs on its
+    dedicated executor, or coroutine functions, which are awaited directly.
+    ``TranslationService`` is the Google Cloud implementation; tests plug in
+    a local fake.
+    """
+
+    def translate_batch(
+        self,
+        contents: List[str],
+        source_language: str,
+        target_language: str
+    ) -> Union[List[str], Awaitable[List[str]]]:
+        ...
+
+    def detect_language(self, text: str) -> Union[Dict[str, Any], Awaitable[Dict[str, Any]]]:
+        ...
+
+
+class AsyncTranslationEngine:
+    """
+    Non-blocking front end for a translation backend.
+
+    Every upstream call goes through a semaphore that bounds concurrency and
+    a per-call timeout, so a slow Google round trip never freezes the event
+    loop that is serving websockets. Results are served from a
+    ``TranslationCache`` when possible, and cache misses are coalesced by a
+    ``TranslationBatcher`` before they reach the backend.
+    """
+
+    def __init__(
+        self,
+        backend: TranslationBackend,
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+        batch_window_ms: Optional[int] = None,
+        cache: Optional[TranslationCache] = None,
+        local_detector: Optional[LocalLanguageDetector] = None
+    ):
+        self.backend = backend
+        self.max_concurrency = max_concurrency or settings.translation_max_concurrency
+        self.timeout = timeout if timeout is not None else settings.translation_timeout_seconds
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency,
+            thread_name_prefix="translation"
+        )
+        self.batcher = TranslationBatcher(self.translate_batch, window_ms=batch_window_ms)
+        self.cache = cache if cache is not None else TranslationCache()
+        self.local_detector = local_detector or local_language_detector
+        self.local_detection_threshold = settings.language_detection_local_threshold
+        self._streams: Dict[str, StreamingTranslationSession] = {}
+
+    async def _call(self, func: Callable, *args) -> Any:
+        """Run a backend method under the concurrency limit and timeout"""
+        async with self._semaphore:
+            if inspect.iscoroutinefunction(func):
+                pending = func(*args)
+            else:
+                loop = asyncio.get_running_loop()
+                pending = loop.run_in_executor(self._executor, func, *args)
+            try:
+                return await asyncio.wait_for(pending, timeout=self.timeout)
+            except asyncio.TimeoutError:
+                logger.error(f"Translation backend call {func.__name__} timed out after {self.timeout}s")
+                raise TranslationTimeoutError(
+                    f"Translation backend did not respond within {self.timeout} seconds"
+                )
+
+    async def translate_batch(
+        self,
+        contents: List[str],
+        source_language: str,
+        target_language: str
+    ) -> List[str]:
+        """Translate several texts for one language pair in one upstream call"""
+        if not contents:
+            return []
+        return await self._call(self.backend.translate_batch, list(contents), source_language, target_language)
+
+    async def detect_language(self, text: str, use_cache: bool = True) -> Dict[str, Any]:
+        """
+        Detect the language of the input text without blocking the event loop
+
+        Obvious cases (non-Latin scripts, longer Latin sentences) are answered
+        by the offline detector; only low-confidence text reaches the backend.
+
+        Args:
+            text: Text to detect language for
+            use_cache: Whether to read and populate the translation cache
+
+        Returns:
+            Dictionary with detection results
+        """
+        if not text.strip():
+            return {
+                "detected_language": "en",
+                "confidence": 0.0,
+                "is_reliable": False
+            }
+
+        local_result = self.local_detector.detect(text)
+        if local_result and local_result["confidence"] >= self.local_detection_threshold:
+            return local_result
+
+        cache_key = self.cache.detection_key(text) if use_cache else None
+        if cache_key:
+            cached = await self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        result = await self._call(self.backend.detect_language, text)
+
+        if cache_key:
+            await self.cache.set(cache_key, result)
+        return result
+
+    async def translate_text(
+        self,
+        text: str,
+        source_language: str = "en",
+        target_language: str = "es",
+        enable_punctuation: bool = True,
+        use_cache: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Translate text without blocking the event loop
+
+        Args:
+            text: Text to translate
+            source_language: Source language code (e.g., 'en', 'es', 'zh')
+            target_language: Target language code (e.g., 'en', 'es', 'zh')
+            enable_punctuation: Whether to enable punctuation processing
+            use_cache: Whether to read and populate the translation cache
+
+        Returns:
+            Dictionary with translation results, shaped like
+            ``TranslationService.translate_text``
+        """
+        if not text.strip():
+            return {
+                "original_text": text,
+                "translated_text": "",
+                "source_language": source_language,
+                "target_language": target_language,
+                "confidence": 0.0
+            }
+
+        # Same-language requests never leave the process
+        if source_language == target_language:
+            processed_text = text
+            if enable_punctuation:
+                processed_text = process_translated_text(text, target_language)
+
+            return {
+                "original_text": text,
+                "translated_text": processed_text,
+                "source_language": source_language,
+                "target_language": target_language,
+                "confidence": 1.0
+            }
+
+        if len(text) > settings.translation_max_chunk_chars:
+            return await self.translate_long_text(text, source_language, target_language)
+
+        cache_key = self.cache.translation_key(text, source_language, target_language) if use_cache else None
+        translated_text = await self.cache.get(cache_key) if cache_key else None
+
+        if translated_text is None:
+            translated_text = await self.batcher.submit(text, source_language, target_language)
+            if cache_key:
+                await self.cache.set(cache_key, translated_text)
+
+        return {
+            "original_text": text,
+            "translated_text": translated_text,
+            "source_language": source_language,
+            "target_language": target_language,
+            "confidence": 1.0
+        }
+
+    async def iter_translate_long_text(
+        self,
+        text: str,
+        source_language: str,
+        target_language: str,
+        max_chunk_chars: Optional[int] = None
+    ) -> AsyncIterator[Tuple[int, str, str]]:
+        """
+        Translate a long text chunk by chunk, yielding chunks as they complete
+
+        The text is split on sentence boundaries into chunks of at most
+        ``max_chunk_chars`` characters, which are translated concurrently
+        (at most ``translation_long_text_parallelism`` at a time).
+
+        Args:
+            text: Text to translate
+            source_language: Source language code
+            target_language: Target language code
+            max_chunk_chars: Chunk size cap, defaults to ``translation_max_chunk_chars``
+
+        Yields:
+            ``(index, original_chunk, translated_chunk)`` in completion order.
+            The translated chunk keeps the original chunk's surrounding
+            whitespace, so joining them in index order rebuilds the layout.
+        """
+        # Same-language text is punctuated as ``translate_text`` would do it
+        if source_language == target_language:
+            yield 0, text, process_translated_texts([text], target_language)[0]
+            return
+
+        chunks = chunk_sentences(text, max_chunk_chars or settings.translation_max_chunk_chars)
+        limit = asyncio.Semaphore(settings.translation_long_text_parallelism)
+
+        async def translate_chunk(index: int, chunk: str) -> Tuple[int, str, str]:
+            body = chunk.strip()
+            if not body:
+                return index, chunk, chunk
+            leading = chunk[:len(chunk) - len(chunk.lstrip())]
+            trailing = chunk[len(chunk.rstrip()):]
+            async with limit:
+                translated = (await self.translate_batch([body], source_language, target_language))[0]
+            return index, chunk, leading + translated.strip() + trailing
+
+        tasks = [asyncio.create_task(translate_chunk(i, chunk)) for i, chunk in enumerate(chunks)]
+        try:
+            for completed in asyncio.as_completed(tasks):
+                yield await completed
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def translate_long_text(
+        self,
+        text: str,
+        source_language: str,
+        target_language: str,
+        max_chunk_chars: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Translate a long text as concurrently translated sentence chunks
+
+        Args:
+            text: Text to translate
+            source_language: Source language code
+            target_language: Target language code
+            max_chunk_chars: Chunk size cap, defaults to ``translation_max_chunk_chars``
+
+        Returns:
+            Dictionary with translation results, shaped like ``translate_text``
+        """
+        translated_chunks: Dict[int, str] = {}
+        async for index, _, translated in self.iter_translate_long_text(
+            text, source_language, target_language, max_chunk_chars
+        ):
+            translated_chunks[index] = translated
+
+        return {
+            "original_text": text,
+            "translated_text": "".join(translated_chunks[i] for i in range(len(translated_chunks))).strip(),
+            "source_language": source_language,
+            "target_language": target_language,
+            "confidence": 1.0
+        }
+
+    async def translate_with_detection(
+        self,
+        text: str,
+        target_language: str = "en",
+        auto_detect: bool = True,
+        enable_punctuation: bool = True,
+        use_cache: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Translate text with automatic language detection without blocking the event loop
+
+        Args:
+            text: Text to translate
+            target_language: Target language code (e.g., 'en', 'es', 'zh')
+            auto_detect: Whether to automatically detect source language
+            enable_punctuation: Whether to enable punctuation processing
+            use_cache: Whether to read and populate the translation cache
+
+        Returns:
+            Dictionary with translation and detection results, shaped like
+            ``TranslationService.translate_with_detection``
+        """
+        if not text.strip():
+            return {
+                "original_text": text,
+                "translated_text": "",
+                "source_language": "en",
+                "target_language": target_language,
+                "detected_language": "en",
+                "confidence": 0.0,
+                "detection_confidence": 0.0
+            }
+
+        source_language = "en"  # default
+        detection_result = None
+
+        if auto_detect:
+            detection_result = await self.detect_language(text, use_cache=use_cache)
+            source_language = detection_result["detected_language"]
+
+        translation_result = await self.translate_text(
+            text, source_language, target_language, enable_punctuation, use_cache=use_cache
+        )
+
+        return {
+            "original_text": text,
+            "translated_text": translation_result["translated_text"],
+            "source_language": source_language,
+            "target_language": target_language,
+            "confidence": translation_result["confidence"],
+            "detected_language": source_language,
+            "detection_confidence": detection_result["confidence"] if detection_result else 1.0,
+            "is_reliable_detection": detection_result["is_reliable"] if detection_result else True
+        }
+
+    async def translate_to_languages(
+        self,
+        text: str,
+        source_language: str,
+        target_languages: List[str],
+        enable_punctuation: bool = True
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Translate one text into several target languages concurrently
+
+        Each distinct target language is translated once; the concurrent
+        calls are coalesced with other traffic by the batcher. A failure for
+        one language does not affect the others.
+
+        Args:
+            text: Text to translate
+            source_language: Source language code
+            target_languages: Target language codes
+            enable_punctuation: Whether to enable punctuation processing
+
+        Returns:
+            Mapping of target language to its translation result, or to
+            ``{"error": ...}`` if that language failed
+        """
+        languages = list(dict.fromkeys(target_languages))
+        results = await asyncio.gather(
+            *[
+                self.translate_text(text, source_language, language, enable_punctuation)
+                for language in languages
+            ],
+            return_exceptions=True
+        )
+
+        translations = {}
+        for language, result in zip(languages, results):
+            if isinstance(result, Exception):
+                logger.error(f"Translation to {language} failed: {result}")
+                translations[language] = {"error": str(result)}
+            else:
+                translations[language] = result
+        return translations
+
+    async def iter_translate_items(
+        self,
+        items: List[Tuple[str, str, str]],
+        enable_punctuation: bool = True,
+        use_cache: bool = True
+    ) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Translate many independent items, yielding results as they complete
+
+        Items are grouped by language pair and each group is sent upstream in
+        as few requests as the batch size and character caps allow. If a
+        grouped request fails, its items are retried one by one so a single
+        bad item only fails itself.
+
+        Args:
+            items: ``(text, source_language, target_language)`` tuples
+            enable_punctuation: Whether to punctuate same-language passthroughs
+            use_cache: Whether to read and populate the translation cache
+
+        Yields:
+            ``(index, result)`` in completion order, where result is shaped
+            like ``translate_text`` or is ``{"error": ...}``
+        """
+        def result_for(index: int, translated_text: str, confidence: float = 1.0) -> Tuple[int, Dict[str, Any]]:
+            text, source_language, target_language = items[index]
+            return index, {
+                "original_text": text,
+                "translated_text": translated_text,
+                "source_language": source_language,
+                "target_language": target_language,
+                "confidence": confidence
+            }
+
+        # Answer empty, same-language and cached items without upstream calls
+        passthrough: Dict[str, List[int]] = {}
+        uncached: List[int] = []
+        for index, (text, source_language, target_language) in enumerate(items):
+            if not text.strip():
+                yield result_for(index, "", 0.0)
+            elif source_language == target_language:
+                passthrough.setdefault(target_language, []).append(index)
+            else:
+                uncached.append(index)
+
+        # One cache round trip for the whole batch, not one per item
+        if use_cache and uncached:
+            cached = await self.cache.get_many([self.cache.translation_key(*items[index]) for index in uncached])
+            for index, translated_text in zip(uncached, cached):
+                if translated_text is not None:
+                    yield result_for(index, translated_text)
+            uncached = [index for index, translated_text in zip(uncached, cached) if translated_text is None]
+
+        groups: Dict[Tuple[str, str], List[int]] = {}
+        for index in uncached:
+            _, source_language, target_language = items[index]
+            groups.setdefault((source_language, target_language), []).append(index)
+
+        for language, indices in passthrough.items():
+            texts = [items[index][0] for index in indices]
+            processed = process_translated_texts(texts, language) if enable_punctuation else texts
+            for index, processed_text in zip(indices, processed):
+                yield result_for(index, processed_text)
+
+        # Split each language pair into requests under the batch caps
+        requests: List[List[int]] = []
+        for indices in groups.values():
+            current: List[int] = []
+            chars = 0
+            for index in indices:
+                length = len(items[index][0])
+                if current and (len(current) >= self.batcher.max_batch_size
+                                or chars + length > self.batcher.max_batch_chars):
+                    requests.append(current)
+                    current, chars = [], 0
+                current.append(index)
+                chars += length
+            if current:
+                requests.append(current)
+
+        completed: asyncio.Queue = asyncio.Queue()
+
+        async def run_request(indices: List[int]):
+            # Every index gets exactly one line, or the consumer waits forever
+            pending = set(indices)
+            error = "No translation returned"
+            try:
+                _, source_language, target_language = items[indices[0]]
+                texts = [items[index][0] for index in indices]
+                try:
+                    translations = await self.translate_batch(texts, source_language, target_language)
+                    if len(translations) != len(texts):
+                        raise ValueError(f"Expected {len(texts)} translations, got {len(translations)}")
+                    outcomes = list(zip(indices, translations))
+                except Exception as e:
+                    logger.warning(f"Batch of {len(indices)} items failed, retrying individually: {e}")
+                    outcomes = []
+                    for index, text in zip(indices, texts):
+                        try:
+                            outcomes.append((index, (await self.translate_batch([text], source_language, target_language))[0]))
+                        except Exception as item_error:
+                            outcomes.append((index, item_error))
+                for index, outcome in outcomes:
+                    pending.discard(index)
+                    if isinstance(outcome, Exception):
+                        completed.put_nowait((index, {"error": str(outcome)}))
+                        continue
+                    completed.put_nowait(result_for(index, outcome))
+                    if use_cache:
+                        text, source_language, target_language = items[index]
+                        await self.cache.set(self.cache.translation_key(text, source_language, target_language), outcome)
+            except Exception as e:
+                logger.error(f"Translation request for {len(indices)} items failed: {e}")
+                error = str(e)
+            for index in sorted(pending):
+                completed.put_nowait((index, {"error": error}))
+
+        tasks = [asyncio.create_task(run_request(indices)) for indices in requests]
+        try:
+            for _ in range(sum(len(indices) for indices in requests)):
+                yield await completed.get()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def translate_incremental(
+        self,
+        session_id: str,
+        text: str,
+        source_language: str = "en",
+        target_language: str = "es"
+    ) -> Dict[str, Any]:
+        """
+        Translate a growing partial transcript, reusing settled segments
+
+        Args:
+            session_id: Identifier of the live session the text belongs to
+            text: Full current text of the utterance
+            source_language: Source language code
+            target_language: Target language code
+
+        Returns:
+            Dictionary with translation results, shaped like ``translate_text``
+        """
+        if not text.strip() or source_language == target_language:
+            # A partial is not a finished sentence, so same-language text is not punctuated
+            return await self.translate_text(text, source_language, target_language, enable_punctuation=False)
+
+        session = self._streams.get(session_id)
+        if session is None:
+            session = StreamingTranslationSession(self.translate_batch)
+            self._streams[session_id] = session
+        return await session.translate(text, source_language, target_language)
+
+    def end_stream(self, session_id: str):
+        """Evict the segment cache of a finished live session"""
+        session = self._streams.pop(session_id, None)
+        if session is not None:
+            session.close()
+
+    async def shutdown(self):
+        """Cancel pending batches and release the executor threads"""
+        await self.batcher.close()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Create singleton instance backed by Google Cloud Translate
+translation_engine = AsyncTranslationEngine(translation_service)
@@ -1,9 +1,10 @@
 import asyncio
 import json
 import logging
-from typing import Dict, Set, Optional
+from typing import Dict, List, Set, Optional
 from fastapi import WebSocket, WebSocketDisconnect
 from datetime import datetime
+from app.services.translation_engine import translation_engine
 
 logger = logging.getLogger(__name__)
 
@@ -133,6 +134,76 @@ class ConnectionManager:
             "timestamp": datetime.now().isoformat()
         }, exclude_user=user_id)
 
+    def get_target_language_groups(self, room_id: str, exclude_user: Optional[str] = None) -> Dict[str, List[str]]:
+        """Group room participants by the target language in their settings"""
+        groups: Dict[str, List[str]] = {}
+        for uid, user_settings in self.user_settings.get(room_id, {}).items():
+            if exclude_user and uid == exclude_user:
+                continue
+            groups.setdefault(user_settings.get("targetLanguage"), []).append(uid)
+        return groups
+
+    async def handle_utterance(self, room_id: str, user_id: str, utterance_data: dict):
+        """Translate a source utterance once per target language and deliver it to the room"""
+        text = utterance_data.get("text", "")
+        if not text.strip() or room_id not in self.rooms:
+            return
+
+        source_language = utterance_data.get("sourceLanguage")
+        if not source_language:
+            detection = await translation_engine.detect_language(text)
+            source_language = detection["detected_language"]
+
+        groups = self.get_target_language_groups(room_id, exclude_user=user_id)
+        # Participants without a target language get the original text
+        if None in groups:
+            groups.setdefault(source_language, []).extend(groups.pop(None))
+
+        translations = await translation_engine.translate_to_languages(
+            text,
+            source_language,
+            list(groups.keys()),
+            enable_punctuation=utterance_data.get("enablePunctuation", True)
+        )
+
+        timestamp = datetime.now().isoformat()
+        for target_language, user_ids in groups.items():
+            result = translations.get(target_language, {})
+            if "error" in result:
+                continue
+            await self.send_to_users(room_id, user_ids, {
+                "type": "translation",
+                "userId": user_id,
+                "original": text,
+                "translated": result.get("translated_text"),
+                "sourceLanguage": source_language,
+                "targetLanguage": target_language,
+                "showOriginal": utterance_data.get("showOriginal", True),
+                "timestamp": timestamp
+            })
+
+    async def send_to_users(self, room_id: str, user_ids: List[str], message: dict):
+        """Send one message to several users in a room, encoding it only once"""
+        if room_id not in self.rooms:
+            return
+
+        payload = json.dumps(message)
+        disconnected_users = []
+
+        for user_id in user_ids:
+            connection = self.rooms[room_id].get(user_id)
+            if connection is None:
+                continue
+            try:
+                await connection.send_text(payload)
+            except Exception as e:
+                logger.error(f"Failed to send message to user {user_id}: {e}")
+                disconnected_users.append(user_id)
+
+        # Clean up disconnected users
+        for user_id in disconnected_users:
+            await self.disconnect(room_id, user_id)
+
     async def handle_settings_update(self, room_id: str, user_id: str, settings: dict):
         """Handle settings update from a user"""
         if room_id in self.user_settings and user_id in self.user_settings[room_id]:
@@ -187,6 +258,8 @@ async def websocket_endpoint(websocket: WebSocket, room_id: str, user_id: str):
                     
                     if message.get("type") == "translation":
                         await manager.handle_translation(room_id, user_id, message)
+                    elif message.get("type") == "utterance":
+                        await manager.handle_utterance(room_id, user_id, message)
                     elif message.get("type") == "update_settings":
                         await manager.handle_settings_update(room_id, user_id, message.get("settings", {}))
                     elif message.get("type") == "ping":
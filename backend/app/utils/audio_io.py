@@ -0,0 +1,60 @@
+import tempfile
+from typing import AsyncGenerator, AsyncIterator, BinaryIO
+
+from app.config.settings import settings
+
+
+class AudioTooLargeError(ValueError):
+    """Raised when an audio body exceeds the configured size limit"""
+
+    def __init__(self, max_size: int):
+        super().__init__(f"Audio exceeds the maximum size of {max_size} bytes")
+        self.max_size = max_size
+
+
+async def limit_stream(chunks: AsyncIterator[bytes], max_size: int) -> AsyncGenerator[bytes, None]:
+    """
+    Pass a byte stream through, stopping it once it grows past ``max_size``
+
+    Args:
+        chunks: Async iterator of byte chunks
+        max_size: Maximum number of bytes to let through
+
+    Raises:
+        AudioTooLargeError: On the first chunk that takes the total past ``max_size``
+    """
+    received = 0
+    async for chunk in chunks:
+        received += len(chunk)
+        if received > max_size:
+            raise AudioTooLargeError(max_size)
+        yield chunk
+
+
+async def spool_audio(chunks: AsyncIterator[bytes], max_size: int) -> BinaryIO:
+    """
+    Copy an audio stream into a spooled temporary file, enforcing a size limit
+
+    Small bodies stay in memory; anything above ``audio_spool_max_memory``
+    rolls over to a temporary file, so at most one copy of the audio is held
+    and large uploads do not grow the worker's memory.
+
+    Args:
+        chunks: Async iterator of audio byte chunks
+        max_size: Maximum number of bytes to accept
+
+    Returns:
+        The spooled file, rewound to the start. The caller must close it.
+
+    Raises:
+        AudioTooLargeError: As soon as the stream passes ``max_size`` bytes
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=settings.audio_spool_max_memory)
+    try:
+        async for chunk in limit_stream(chunks, max_size):
+            spool.write(chunk)
+    except BaseException:
+        spool.close()
+        raise
+    spool.seek(0)
+    return spool
@@ -0,0 +1,191 @@
+import io
+import wave
+from dataclasses import dataclass
+from typing import Any, BinaryIO, Dict, List, Tuple
+
+import numpy as np
+
+# Sample widths (bytes) of the PCM WAV files that can be split
+_SAMPLE_DTYPES = {1: np.uint8, 2: np.dtype("<i2"), 4: np.dtype("<i4")}
+
+# Analysis frames whose samples are decoded at once by frame_energy
+ENERGY_BLOCK_FRAMES = 1024
+
+
+@dataclass
+class PCMAudio:
+    """
+    PCM WAV audio read on demand from a seekable stream.
+
+    Only the format and the position of the sample data are kept; frames
+    are read from ``source`` when needed, so a long recording is never held
+    in memory at once. The stream must stay open while the audio is used.
+    """
+
+    source: BinaryIO
+    data_offset: int
+    frame_count: int
+    sample_rate: int
+    channels: int
+    sample_width: int
+
+    @property
+    def frame_bytes(self) -> int:
+        return self.channels * self.sample_width
+
+    @property
+    def duration(self) -> float:
+        return self.frame_count / self.sample_rate
+
+    def read_frames(self, start: int, end: int) -> bytes:
+        """Interleaved bytes of frames ``start``..``end``"""
+        self.source.seek(self.data_offset + start * self.frame_bytes)
+        return self.source.read((end - start) * self.frame_bytes)
+
+
+@dataclass
+class AudioSegment:
+    """
+    One piece of a split recording.
+
+    ``start``/``end`` (frames) bound the audio sent for transcription, which
+    includes the overlap; ``own_start``/``own_end`` bound the part whose
+    words this segment contributes to the stitched transcript.
+    """
+
+    start: int
+    end: int
+    own_start: int
+    own_end: int
+
+
+def read_wav(audio: BinaryIO) -> PCMAudio:
+    """
+    Read the header of a PCM WAV file
+
+    Args:
+        audio: Seekable stream positioned at the start of the file
+
+    Raises:
+        wave.Error: If the audio is not PCM WAV with 8, 16 or 32-bit samples
+    """
+    start = audio.tell()
+    wav = wave.open(audio, "rb")
+    # Parsing the header leaves the stream at the start of the data chunk
+    data_offset = audio.tell()
+    if wav.getsampwidth() not in _SAMPLE_DTYPES:
+        raise wave.Error(f"Unsupported sample width: {wav.getsampwidth()} bytes")
+    frame_bytes = wav.getnchannels() * wav.getsampwidth()
+    # Streamed recordings can declare a larger data chunk than was written
+    available = (audio.seek(0, io.SEEK_END) - data_offset) // frame_bytes
+    audio.seek(start)
+    return PCMAudio(
+        source=audio,
+        data_offset=data_offset,
+        frame_count=min(wav.getnframes(), available),
+        sample_rate=wav.getframerate(),
+        channels=wav.getnchannels(),
+        sample_width=wav.getsampwidth()
+    )
+
+
+def encode_wav(audio: PCMAudio, start: int, end: int) -> bytes:
+    """Encode frames ``start``..``end`` of the audio as a standalone WAV file"""
+    output = io.BytesIO()
+    with wave.open(output, "wb") as wav:
+        wav.setnchannels(audio.channels)
+        wav.setsampwidth(audio.sample_width)
+        wav.setframerate(audio.sample_rate)
+        wav.writeframes(audio.read_frames(start, end))
+    return output.getvalue()
+
+
+def frame_energy(audio: PCMAudio, frame_ms: int = 20) -> Tuple[np.ndarray, int]:
+    """
+    Mean-square energy of consecutive analysis frames, averaged over channels
+
+    The audio is decoded ``ENERGY_BLOCK_FRAMES`` analysis frames at a time,
+    so memory use does not grow with the length of the recording.
+
+    Returns:
+        Tuple of the energies and the number of audio frames per analysis frame
+    """
+    hop = max(audio.sample_rate * frame_ms // 1000, 1)
+    total = audio.frame_count // hop
+    energies = []
+    for first in range(0, total, ENERGY_BLOCK_FRAMES):
+        count = min(ENERGY_BLOCK_FRAMES, total - first)
+        raw = audio.read_frames(first * hop, (first + count) * hop)
+        samples = np.frombuffer(raw, dtype=_SAMPLE_DTYPES[audio.sample_width]).astype(np.float32)
+        if audio.sample_width == 1:
+            samples -= 128.0
+        frames = samples.reshape(-1, hop * audio.channels)
+        energies.append(np.mean(frames * frames, axis=1))
+    return (np.concatenate(energies) if energies else np.zeros(0, dtype=np.float32)), hop
+
+
+def plan_segments(
+    audio: PCMAudio,
+    segment_seconds: float,
+    overlap_seconds: float,
+    search_seconds: float
+) -> List[AudioSegment]:
+    """
+    Split audio into overlapping segments cut at its quietest points
+
+    Each cut is placed at the lowest-energy 20 ms frame within
+    ``search_seconds`` of the nominal ``segment_seconds`` boundary, so cuts
+    land in pauses rather than mid-word. Segments then extend
+    ``overlap_seconds`` past their cuts on both sides.
+    """
+    total = audio.frame_count
+    target = int(segment_seconds * audio.sample_rate)
+    if total <= target:
+        return [AudioSegment(0, total, 0, total)]
+
+    energy, hop = frame_energy(audio)
+    search = int(search_seconds * audio.sample_rate)
+    cuts = [0]
+    while total - cuts[-1] > target + search:
+        nominal = cuts[-1] + target
+        low = max((nominal - search) // hop, cuts[-1] // hop + 1)
+        high = min((nominal + search) // hop + 1, len(energy))
+        quietest = low + int(np.argmin(energy[low:high])) if high > low else nominal // hop
+        # Cut in the middle of the quietest analysis frame
+        cuts.append(quietest * hop + hop // 2)
+    cuts.append(total)
+
+    overlap = int(overlap_seconds * audio.sample_rate)
+    return [
+        AudioSegment(max(own_start - overlap, 0), min(own_end + overlap, total), own_start, own_end)
+        for own_start, own_end in zip(cuts, cuts[1:])
+    ]
+
+
+def stitch_words(segments: List[Tuple[float, float, float, List[Dict[str, Any]]]]) -> List[Dict[str, Any]]:
+    """
+    Merge the words of overlapping segment transcripts onto one timeline
+
+    Args:
+        segments: ``(offset, own_start, own_end, words)`` per segment in
+            order, in seconds; word times are relative to the segment start
+
+    Returns:
+        Words with global times. A word belongs to the segment whose owned
+        span holds its midpoint; a word repeated across a cut (same text,
+        overlapping times) is kept once.
+    """
+    stitched: List[Dict[str, Any]] = []
+    for offset, own_start, own_end, words in segments:
+        for word in words:
+            start = (word.get("start") or 0.0) + offset
+            end = (word.get("end") or 0.0) + offset
+            midpoint = (start + end) / 2
+            if not own_start <= midpoint < own_end:
+                continue
+            if stitched:
+                previous = stitched[-1]
+                if previous["word"] == word.get("word") and start < previous["end"]:
+                    continue
+            stitched.append({**word, "start": round(start, 3), "end": round(end, 3)})
+    return stitched
@@ -0,0 +1,183 @@
+import math
+from typing import Dict, Optional
+
+import numpy as np
+
+# Raw PCM encodings the server can convert, with their sample layout and full-scale value
+PCM_ENCODINGS: Dict[str, tuple] = {
+    "linear16": ("<i2", 32768.0),
+    "linear32": ("<i4", 2147483648.0),
+    "float32": ("<f4", 1.0),
+}
+
+# Encodings Deepgram accepts as-is; compressed audio is forwarded untouched
+PASSTHROUGH_ENCODINGS = ("flac", "mulaw", "alaw", "amr-nb", "amr-wb", "opus", "speex", "g729")
+
+TARGET_ENCODING = "linear16"
+TARGET_SAMPLE_RATE = 16000
+TARGET_CHANNELS = 1
+
+# Client formats outside these bounds are refused: tiny rates inflate every
+# frame when upsampled and huge rates build enormous filter kernels
+MIN_SAMPLE_RATE = 8000
+MAX_SAMPLE_RATE = 192000
+MAX_CHANNELS = 8
+
+# Anti-alias low-pass applied before downsampling: the -6 dB point and the
+# width of the transition band, which ends at the 8 kHz output Nyquist
+ANTI_ALIAS_CUTOFF_HZ = 7400
+ANTI_ALIAS_TRANSITION_HZ = 1200
+
+
+class AudioFormatError(ValueError):
+    """Raised for an audio format the server cannot accept"""
+
+
+class PCMConverter:
+    """
+    Streaming downmix and resample of raw PCM to 16 kHz mono linear16.
+
+    Chunks may split frames anywhere; partial frames and the resampler
+    state are carried across calls, so the output is continuous. Channels
+    are averaged, downsampling is preceded by a windowed-sinc low-pass
+    anti-alias filter, and resampling uses linear interpolation, all
+    vectorized with NumPy. When the input already is 16 kHz mono linear16 the chunks are
+    returned unchanged.
+    """
+
+    def __init__(self, encoding: str, sample_rate: int, channels: int = 1):
+        if encoding not in PCM_ENCODINGS:
+            raise AudioFormatError(f"Unsupported PCM encoding: {encoding}")
+        _check_bounds(sample_rate, channels)
+        self.encoding = encoding
+        self.sample_rate = sample_rate
+        self.channels = channels
+        dtype, self._full_scale = PCM_ENCODINGS[encoding]
+        self._dtype = np.dtype(dtype)
+        self._frame_bytes = self._dtype.itemsize * channels
+        self._pending = b""
+
+        self._step = sample_rate / TARGET_SAMPLE_RATE
+        self._kernel = _lowpass_kernel(sample_rate) if sample_rate > TARGET_SAMPLE_RATE else None
+        self._filter_history = np.zeros(len(self._kernel) - 1 if self._kernel is not None else 0, dtype=np.float32)
+        self._tail = np.zeros(0, dtype=np.float32)
+        self._position = 0.0
+
+    @property
+    def passthrough(self) -> bool:
+        """Whether the input already is in the target format"""
+        return (
+            self.encoding == TARGET_ENCODING
+            and self.sample_rate == TARGET_SAMPLE_RATE
+            and self.channels == TARGET_CHANNELS
+        )
+
+    def convert(self, chunk: bytes) -> bytes:
+        """
+        Convert one chunk of input audio
+
+        Args:
+            chunk: Raw interleaved PCM bytes in the input format
+
+        Returns:
+            16 kHz mono linear16 bytes (possibly empty while a frame is incomplete)
+        """
+        if self.passthrough:
+            return chunk
+
+        data = self._pending + chunk if self._pending else chunk
+        usable = len(data) - len(data) % self._frame_bytes
+        self._pending = bytes(data[usable:])
+        if not usable:
+            return b""
+
+        samples = np.frombuffer(data, dtype=self._dtype, count=usable // self._dtype.itemsize)
+        samples = samples.astype(np.float32) / self._full_scale
+        if self.channels > 1:
+            samples = samples.reshape(-1, self.channels).mean(axis=1)
+
+        resampled = self._resample(samples)
+        return (np.clip(resampled, -1.0, 32767 / 32768) * 32768).astype("<i2").tobytes()
+
+    def _resample(self, samples: np.ndarray) -> np.ndarray:
+        if self.sample_rate == TARGET_SAMPLE_RATE:
+            return samples
+
+        if self._kernel is not None:
+            padded = np.concatenate((self._filter_history, samples))
+            self._filter_history = padded[len(padded) - len(self._filter_history):]
+            samples = np.convolve(padded, self._kernel, mode="valid")
+
+        # The last input sample of the previous chunk is kept so outputs that
+        # fall between two chunks can still be interpolated
+        buffer = np.concatenate((self._tail, samples))
+        positions = np.arange(self._position, len(buffer) - 1, self._step)
+        index = positions.astype(np.int64)
+        fraction = (positions - index).astype(np.float32)
+        output = buffer[index] * (1 - fraction) + buffer[index + 1] * fraction
+
+        next_position = positions[-1] + self._step if len(positions) else self._position
+        self._position = next_position - (len(buffer) - 1)
+        self._tail = buffer[-1:]
+        return output
+
+
+def _lowpass_kernel(sample_rate: int) -> np.ndarray:
+    """Hamming-windowed sinc FIR passing speech below 8 kHz, with unity gain at DC"""
+    # Hamming window main lobe: transition width is about 3.3 / taps of the sample rate
+    taps = int(math.ceil(3.3 * sample_rate / ANTI_ALIAS_TRANSITION_HZ)) | 1
+    offsets = np.arange(taps) - (taps - 1) / 2
+    kernel = np.sinc(2 * ANTI_ALIAS_CUTOFF_HZ / sample_rate * offsets) * np.hamming(taps)
+    return (kernel / kernel.sum()).astype(np.float32)
+
+
+def _check_bounds(sample_rate: int, channels: int):
+    if not MIN_SAMPLE_RATE <= sample_rate <= MAX_SAMPLE_RATE:
+        raise AudioFormatError(f"Sample rate must be between {MIN_SAMPLE_RATE} and {MAX_SAMPLE_RATE} Hz")
+    if not 1 <= channels <= MAX_CHANNELS:
+        raise AudioFormatError(f"Channel count must be between 1 and {MAX_CHANNELS}")
+
+
+def negotiate_format(encoding: Optional[str], sample_rate: Optional[int], channels: Optional[int]) -> Dict[str, object]:
+    """
+    Decide how a client's live audio reaches the upstream recognizer
+
+    Args:
+        encoding: Client encoding (defaults to linear16)
+        sample_rate: Client sample rate in Hz (defaults to 44100)
+        channels: Client channel count (defaults to 1)
+
+    Returns:
+        Dictionary with the ``converter`` to apply (None when the audio is
+        forwarded untouched) and the ``upstream`` encoding, sample_rate and
+        channels to announce
+
+    Raises:
+        AudioFormatError: For encodings that are neither PCM nor accepted upstream,
+            and for sample rates or channel counts out of bounds
+    """
+    encoding = (encoding or "linear16").lower()
+    sample_rate = 44100 if sample_rate is None else sample_rate
+    channels = 1 if channels is None else channels
+    _check_bounds(sample_rate, channels)
+
+    if encoding in PCM_ENCODINGS:
+        converter = PCMConverter(encoding, sample_rate, channels)
+        if converter.passthrough:
+            converter = None
+        return {
+            "converter": converter,
+            "upstream": {
+                "encoding": TARGET_ENCODING,
+                "sample_rate": TARGET_SAMPLE_RATE,
+                "channels": TARGET_CHANNELS
+            }
+        }
+
+    if encoding in PASSTHROUGH_ENCODINGS:
+        return {
+            "converter": None,
+            "upstream": {"encoding": encoding, "sample_rate": sample_rate, "channels": channels}
+        }
+
+    raise AudioFormatError(f"Unsupported audio encoding: {encoding}")
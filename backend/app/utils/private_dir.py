@@ -0,0 +1,34 @@
+import os
+import stat
+import tempfile
+
+
+def default_private_dir(name: str) -> str:
+    """Per-user directory under the system temp dir, e.g. ``/tmp/<name>-1000``"""
+    user = os.getuid() if hasattr(os, "getuid") else os.environ.get("USERNAME", "user")
+    return os.path.join(tempfile.gettempdir(), f"{name}-{user}")
+
+
+def ensure_private_dir(path: str) -> str:
+    """
+    Create a directory only the current user can access, or check an existing one
+
+    An existing directory must be a real directory owned by the current
+    user; group and other permissions are removed from it.
+
+    Returns:
+        The path
+
+    Raises:
+        PermissionError: If the path is a symlink or not a directory, or is owned by another user
+    """
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode):
+        raise PermissionError(f"{path} is not a directory")
+    if hasattr(os, "getuid"):
+        if info.st_uid != os.getuid():
+            raise PermissionError(f"{path} is owned by another user")
+        if info.st_mode & 0o077:
+            os.chmod(path, 0o700)
+    return path
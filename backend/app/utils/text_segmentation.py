@@ -0,0 +1,80 @@
+import re
+from typing import List
+
+# Sentence terminators, optionally followed by closing quotes/brackets
+_SENTENCE_END = r'[.!?…]+["\'”’)\]]*\s+|[。！？]+["\'”’」』)\]]*\s*'
+# Clause separators
+_CLAUSE_END = r'[,;:]\s+|[，；：、]\s*'
+
+_SENTENCE_RE = re.compile(f'(?:{_SENTENCE_END})')
+_SEGMENT_RE = re.compile(f'(?:{_SENTENCE_END}|{_CLAUSE_END})')
+
+# Scripts written without spaces between words or sentences
+UNSPACED_LANGUAGES = ('zh', 'ja', 'th')
+
+
+def _split(text: str, pattern: re.Pattern) -> List[str]:
+    segments = []
+    start = 0
+    for match in pattern.finditer(text):
+        segments.append(text[start:match.end()])
+        start = match.end()
+    if start < len(text):
+        segments.append(text[start:])
+    return segments
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split text after sentence terminators. ``''.join`` of the result is the input."""
+    return _split(text, _SENTENCE_RE)
+
+
+def split_segments(text: str) -> List[str]:
+    """Split text after sentence terminators and clause separators. ``''.join`` of the result is the input."""
+    return _split(text, _SEGMENT_RE)
+
+
+def chunk_sentences(text: str, max_chars: int) -> List[str]:
+    """
+    Group consecutive sentences into chunks of at most ``max_chars`` characters
+
+    A single sentence longer than the cap is split further on clause
+    boundaries and, failing that, on whitespace or hard character cuts.
+    ``''.join`` of the result is the input.
+
+    Raises:
+        ValueError: If ``max_chars`` is less than 1
+    """
+    if max_chars < 1:
+        raise ValueError(f"max_chars must be at least 1, got {max_chars}")
+    chunks: List[str] = []
+    current = ''
+    for sentence in split_sentences(text):
+        pieces = [sentence] if len(sentence) <= max_chars else _split_oversized(sentence, max_chars)
+        for piece in pieces:
+            if current and len(current) + len(piece) > max_chars:
+                chunks.append(current)
+                current = ''
+            current += piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _split_oversized(sentence: str, max_chars: int) -> List[str]:
+    pieces = []
+    for clause in split_segments(sentence):
+        while len(clause) > max_chars:
+            cut = clause.rfind(' ', 0, max_chars)
+            cut = cut + 1 if cut > 0 else max_chars
+            pieces.append(clause[:cut])
+            clause = clause[cut:]
+        if clause:
+            pieces.append(clause)
+    return pieces
+
+
+def join_translations(parts: List[str], language: str) -> str:
+    """Join separately translated segments for the target language"""
+    separator = '' if language in UNSPACED_LANGUAGES else ' '
+    return separator.join(part.strip() for part in parts if part and part.strip())
@@ -0,0 +1,109 @@
+from collections import deque
+from typing import Deque, Optional
+
+import numpy as np
+
+from app.config.settings import settings
+
+
+class VoiceActivityGate:
+    """
+    Energy / zero-crossing voice activity gate for 16-bit mono PCM.
+
+    Audio is cut into fixed frames. A frame counts as speech when its RMS
+    level is above ``energy_threshold_db`` (dBFS), or within 10 dB of it
+    with a zero-crossing rate typical of unvoiced consonants. Speech frames
+    are forwarded, followed by a ``hangover_ms`` tail; silent frames are
+    dropped, except for the last ``pre_roll_ms`` of them, which are sent
+    ahead of the next speech frame so onsets are not clipped.
+    """
+
+    # Zero-crossing rate (crossings per sample) above which quieter frames
+    # are still treated as fricatives rather than silence
+    FRICATIVE_ZCR = 0.25
+    FRICATIVE_MARGIN_DB = 10.0
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        frame_ms: int = 20,
+        energy_threshold_db: Optional[float] = None,
+        pre_roll_ms: Optional[int] = None,
+        hangover_ms: Optional[int] = None
+    ):
+        self.sample_rate = sample_rate
+        self.frame_samples = sample_rate * frame_ms // 1000
+        self.frame_bytes = self.frame_samples * 2
+        self.energy_threshold_db = (
+            settings.live_vad_energy_threshold_db if energy_threshold_db is None else energy_threshold_db
+        )
+        pre_roll_ms = settings.live_vad_pre_roll_ms if pre_roll_ms is None else pre_roll_ms
+        hangover_ms = settings.live_vad_hangover_ms if hangover_ms is None else hangover_ms
+        self._pre_roll: Deque[bytes] = deque(maxlen=max(pre_roll_ms // frame_ms, 1))
+        self._pre_roll_enabled = pre_roll_ms >= frame_ms
+        self._hangover_frames = hangover_ms // frame_ms
+        self._hangover_left = 0
+        self._pending = b""
+        self.stats = {
+            "frames_in": 0,
+            "frames_sent": 0,
+            "bytes_in": 0,
+            "bytes_sent": 0
+        }
+
+    def _speech_frames(self, frames: np.ndarray) -> np.ndarray:
+        samples = frames.astype(np.float32) / 32768.0
+        rms = np.sqrt(np.mean(samples * samples, axis=1))
+        level_db = 20 * np.log10(np.maximum(rms, 1e-9))
+        signs = np.signbit(frames)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / frames.shape[1]
+        loud = level_db >= self.energy_threshold_db
+        fricative = (level_db >= self.energy_threshold_db - self.FRICATIVE_MARGIN_DB) & (zcr >= self.FRICATIVE_ZCR)
+        return loud | fricative
+
+    def process(self, chunk: bytes) -> bytes:
+        """
+        Gate one chunk of audio
+
+        Args:
+            chunk: 16-bit little-endian mono PCM
+
+        Returns:
+            The audio to forward upstream (empty while silent)
+        """
+        data = self._pending + chunk if self._pending else chunk
+        usable = len(data) - len(data) % self.frame_bytes
+        self._pending = bytes(data[usable:])
+        if not usable:
+            return b""
+
+        frames = np.frombuffer(data, dtype="<i2", count=usable // 2).reshape(-1, self.frame_samples)
+        speech = self._speech_frames(frames)
+
+        out = []
+        for index, is_speech in enumerate(speech):
+            frame = data[index * self.frame_bytes:(index + 1) * self.frame_bytes]
+            if is_speech:
+                out.extend(self._pre_roll)
+                self._pre_roll.clear()
+                out.append(frame)
+                self._hangover_left = self._hangover_frames
+            elif self._hangover_left > 0:
+                out.append(frame)
+                self._hangover_left -= 1
+            elif self._pre_roll_enabled:
+                self._pre_roll.append(frame)
+
+        forwarded = b"".join(out)
+        self.stats["frames_in"] += len(speech)
+        self.stats["frames_sent"] += len(forwarded) // self.frame_bytes
+        self.stats["bytes_in"] += usable
+        self.stats["bytes_sent"] += len(forwarded)
+        return forwarded
+
+    def get_stats(self) -> dict:
+        """Get gating statistics, including bytes and seconds kept off the upstream"""
+        stats = dict(self.stats)
+        stats["bytes_saved"] = stats["bytes_in"] - stats["bytes_sent"]
+        stats["seconds_saved"] = round(stats["bytes_saved"] / (self.sample_rate * 2), 3)
+        return stats
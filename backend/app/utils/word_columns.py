@@ -0,0 +1,74 @@
+from array import array
+from typing import Any, Dict, Iterable, List, Literal, Mapping, get_args
+
+# Response formats for word-level results
+WordFormat = Literal["objects", "columns"]
+WORD_FORMATS = get_args(WordFormat)
+
+
+class WordColumns:
+    """
+    Word-level timings stored column-wise.
+
+    Holds one list of words and three ``array('d')`` columns instead of a
+    dict (and three float objects) per word, so long transcripts cost a
+    few compact buffers. ``to_json`` emits the columns as-is for the
+    ``columns`` response format; ``to_dicts`` rebuilds the per-word
+    ``{"word", "start", "end", "confidence"}`` objects.
+    """
+
+    __slots__ = ("word", "start", "end", "confidence")
+
+    def __init__(self):
+        self.word: List[str] = []
+        self.start = array("d")
+        self.end = array("d")
+        self.confidence = array("d")
+
+    @classmethod
+    def from_words(cls, words: Iterable[Mapping[str, Any]]) -> "WordColumns":
+        """Build columns from Deepgram word objects or per-word dicts"""
+        columns = cls()
+        for word in words:
+            columns.word.append(word.get("word"))
+            columns.start.append(word.get("start") or 0.0)
+            columns.end.append(word.get("end") or 0.0)
+            columns.confidence.append(word.get("confidence") or 0.0)
+        return columns
+
+    @classmethod
+    def from_json(cls, data: Mapping[str, List[Any]]) -> "WordColumns":
+        """Rebuild columns from the output of ``to_json``"""
+        columns = cls()
+        columns.word = list(data["word"])
+        columns.start = array("d", data["start"])
+        columns.end = array("d", data["end"])
+        columns.confidence = array("d", data["confidence"])
+        return columns
+
+    def to_json(self) -> Dict[str, List[Any]]:
+        return {
+            "word": self.word,
+            "start": self.start.tolist(),
+            "end": self.end.tolist(),
+            "confidence": self.confidence.tolist()
+        }
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        return [
+            {"word": word, "start": start, "end": end, "confidence": confidence}
+            for word, start, end, confidence in zip(self.word, self.start, self.end, self.confidence)
+        ]
+
+    def __len__(self) -> int:
+        return len(self.word)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, WordColumns):
+            return NotImplemented
+        return (
+            self.word == other.word
+            and self.start == other.start
+            and self.end == other.end
+            and self.confidence == other.confidence
+        )
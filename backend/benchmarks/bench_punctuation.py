@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for translated-text punctuation post-processing.
+
+Compares the per-call cost of the original implementation (rebuilt pattern
+table and up to three uncompiled searches per call, reproduced below as the
+baseline) with the precompiled single-scan pipeline in
+app.services.translation, and with the batch entry point.
+
+Usage (from the backend directory):
+    python benchmarks/bench_punctuation.py [--number N]
+"""
+
+import argparse
+import re
+import sys
+import timeit
+from pathlib import Path
+
+# Add the backend directory to Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.translation import process_translated_text, process_translated_texts  # noqa: E402
+
+SAMPLES = {
+    'en': ["can you hear me", "next slide please", "I think we should ship it on Friday",
+           "thanks everyone", "the numbers look good this quarter"],
+    'es': ["puedes oírme", "siguiente diapositiva por favor", "creo que deberíamos lanzarlo el viernes"],
+    'zh': ["你能听到我吗", "下一张幻灯片", "我们应该在周五发布"],
+}
+
+
+# Baseline: the implementation before rule tables were precompiled
+def baseline_add_punctuation_to_text(text: str, language: str = 'en') -> str:
+    """Add punctuation to text based on language patterns"""
+    if not text or not text.strip():
+        return text
+    
+    processed_text = text.strip()
+    
+    # Language-specific punctuation patterns
+    punctuation_patterns = {
+        'en': {
+            'questions': r'\b(what|when|where|who|why|how|which|whose|whom|is|are|was|were|do|does|did|can|could|will|would|should|may|might)\b',
+            'exclamations': r'\b(wow|oh|ah|amazing|incredible|fantastic|great|excellent|perfect|wonderful|terrible|awful|horrible|stop|wait|no|yes|please|thank you|thanks)\b',
+            'greetings': r'\b(hello|hi|hey|good morning|good afternoon|good evening|goodbye|bye|see you)\b'
+        },
+        'es': {
+            'questions': r'\b(qué|cuándo|dónde|quién|por qué|cómo|cuál|es|son|está|están|puede|podría|debería)\b',
+            'exclamations': r'\b(hola|buenos días|buenas tardes|buenas noches|adiós|hasta luego|por favor|gracias|perdón|wow|increíble|fantástico)\b',
+            'greetings': r'\b(hola|buenos días|buenas tardes|buenas noches|adiós|hasta luego)\b'
+        },
+        'fr': {
+            'questions': r'\b(qu\'est-ce que|quand|où|qui|pourquoi|comment|quel|est|sont|peut|pourrait|devrait)\b',
+            'exclamations': r'\b(bonjour|bonsoir|au revoir|s\'il vous plaît|merci|pardon|excusez-moi|wow|incroyable|fantastique)\b',
+            'greetings': r'\b(bonjour|bonsoir|au revoir)\b'
+        },
+        'de': {
+            'questions': r'\b(was|wann|wo|wer|warum|wie|welcher|ist|sind|kann|könnte|sollte)\b',
+            'exclamations': r'\b(hallo|guten tag|guten abend|auf wiedersehen|bitte|danke|entschuldigung|wow|unglaublich|fantastisch)\b',
+            'greetings': r'\b(hallo|guten tag|guten abend|auf wiedersehen)\b'
+        },
+        'zh': {
+            'questions': r'\b(什么|什么时候|哪里|谁|为什么|怎么|哪个|是|可以|应该)\b',
+            'exclamations': r'\b(你好|早上好|下午好|晚上好|再见|谢谢|请|对不起|哇|太棒了|不可思议)\b',
+            'greetings': r'\b(你好|早上好|下午好|晚上好|再见)\b'
+        },
+        'ja': {
+            'questions': r'\b(何|いつ|どこ|誰|なぜ|どう|どちら|です|できます|すべき)\b',
+            'exclamations': r'\b(こんにちは|おはよう|こんばんは|さようなら|ありがとう|お願い|すみません|すごい|素晴らしい)\b',
+            'greetings': r'\b(こんにちは|おはよう|こんばんは|さようなら)\b'
+        }
+    }
+    
+    # Get patterns for the language
+    patterns = punctuation_patterns.get(language, punctuation_patterns['en'])
+    
+    # Check for questions
+    if re.search(patterns['questions'], processed_text, re.IGNORECASE):
+        if not processed_text.endswith('?'):
+            processed_text += '?'
+    # Check for exclamations
+    elif re.search(patterns['exclamations'], processed_text, re.IGNORECASE):
+        if not processed_text.endswith('!'):
+            processed_text += '!'
+    # Add period if no punctuation at the end
+    elif not processed_text.endswith(('.', '!', '?', '。', '！', '？')):
+        processed_text += '.'
+    
+    # Ensure proper capitalization
+    if processed_text and processed_text[0].islower():
+        processed_text = processed_text[0].upper() + processed_text[1:]
+    
+    # Clean up multiple spaces and punctuation
+    processed_text = re.sub(r'\s+', ' ', processed_text)
+    processed_text = re.sub(r'[.!?。！？]+$', lambda m: m.group()[0], processed_text)
+    processed_text = re.sub(r',\s*,', ',', processed_text)
+    
+    return processed_text.strip()
+
+def baseline_process_translated_text(text: str, language: str = 'en') -> str:
+    """Process translated text with punctuation and cleanup"""
+    if not text or not text.strip():
+        return text
+    
+    # Step 1: Clean up common translation artifacts
+    cleaned_text = text.strip()
+    cleaned_text = re.sub(r'\s+', ' ', cleaned_text)  # Remove extra spaces
+    
+    # Step 2: Add punctuation
+    punctuated_text = baseline_add_punctuation_to_text(cleaned_text, language)
+    
+    return punctuated_text 
+
+def bench(label: str, func, number: int, calls_per_run: int):
+    seconds = min(timeit.repeat(func, number=number, repeat=5))
+    per_call_us = seconds / (number * calls_per_run) * 1e6
+    print(f"  {label:<28} {per_call_us:8.2f} us/text")
+    return per_call_us
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=2000, help="runs per timing repeat")
+    args = parser.parse_args()
+
+    for language, texts in SAMPLES.items():
+        for text in texts:
+            assert baseline_process_translated_text(text, language) == process_translated_text(text, language)
+
+        print(f"[{language}] {len(texts)} texts")
+        before = bench("baseline (per call)", lambda: [baseline_process_translated_text(t, language) for t in texts],
+                       args.number, len(texts))
+        after = bench("precompiled (per call)", lambda: [process_translated_text(t, language) for t in texts],
+                      args.number, len(texts))
+        batch = bench("precompiled (batch)", lambda: process_translated_texts(texts, language),
+                      args.number, len(texts))
+        print(f"  speedup: {before / after:.1f}x per call, {before / batch:.1f}x batched")
+
+
+if __name__ == "__main__":
+    main()
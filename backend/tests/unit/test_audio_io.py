@@ -0,0 +1,220 @@
+import base64
+import json
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from app.api.v1 import deepgram as deepgram_api
+from app.config.settings import settings
+from app.utils.audio_io import AudioTooLargeError, spool_audio
+
+
+async def iterate(chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+def make_request(body_chunks, content_type="application/octet-stream", query_string=b"", headers=()):
+    """Starlette request whose body arrives in the given chunks"""
+    messages = [
+        {"type": "http.request", "body": chunk, "more_body": i < len(body_chunks) - 1}
+        for i, chunk in enumerate(body_chunks)
+    ] or [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive():
+        return messages.pop(0)
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/",
+        "query_string": query_string,
+        "headers": [(b"content-type", content_type.encode()), *headers]
+    }
+    request = Request(scope, receive)
+    request.state.pending_messages = messages
+    return request
+
+
+class RecordingDeepgram:
+    """Stands in for the Deepgram service and records what it was sent"""
+
+    def __init__(self):
+        self.calls = []
+
+    async def transcribe_audio_data(self, audio_data, language="en", detect_language=False, columnar_words=False):
+        self.calls.append((audio_data.read(), language, detect_language))
+        return {
+            "success": True,
+            "transcript": "hello",
+            "confidence": 0.9,
+            "detected_language": language,
+            "detection_confidence": 0.95,
+            "words": []
+        }
+
+    async def transcribe_long_audio(self, audio_data, language="en", detect_language=False, columnar_words=False):
+        return await self.transcribe_audio_data(audio_data, language, detect_language, columnar_words)
+
+
+class TestSpoolAudio:
+    """Test cases for spooling request audio"""
+
+    @pytest.mark.asyncio
+    async def test_chunks_are_spooled_in_order(self):
+        """Test that the spooled file holds the whole body, rewound"""
+        spool = await spool_audio(iterate([b"ab", b"cd", b"ef"]), max_size=10)
+
+        assert spool.read() == b"abcdef"
+        spool.close()
+
+    @pytest.mark.asyncio
+    async def test_large_bodies_roll_over_to_disk(self, monkeypatch):
+        """Test that bodies above the memory threshold are written to a temp file"""
+        monkeypatch.setattr(settings, "audio_spool_max_memory", 4)
+
+        spool = await spool_audio(iterate([b"abc", b"def"]), max_size=10)
+
+        assert spool._rolled
+        assert spool.read() == b"abcdef"
+        spool.close()
+
+    @pytest.mark.asyncio
+    async def test_size_limit_stops_reading_early(self):
+        """Test that the limit is enforced before the rest of the body is read"""
+        consumed = []
+
+        async def chunks():
+            for chunk in [b"aaaa", b"bbbb", b"cccc"]:
+                consumed.append(chunk)
+                yield chunk
+
+        with pytest.raises(AudioTooLargeError):
+            await spool_audio(chunks(), max_size=6)
+        assert consumed == [b"aaaa", b"bbbb"]
+
+
+class TestRawAudioEndpoints:
+    """Test cases for raw binary audio bodies"""
+
+    @pytest.mark.asyncio
+    async def test_raw_body_uses_query_options(self, monkeypatch):
+        """Test that raw audio is forwarded as-is with options from the query string"""
+        service = RecordingDeepgram()
+        monkeypatch.setattr(deepgram_api, "deepgram_service", service)
+        request = make_request([b"RIFF", b"data"], query_string=b"language=fr&auto_detect=false")
+
+        response = await deepgram_api.transcribe_audio(request, language="fr", auto_detect=False)
+
+        assert response.success
+        assert service.calls == [(b"RIFFdata", "fr", False)]
+
+    @pytest.mark.asyncio
+    async def test_json_body_still_accepted(self, monkeypatch):
+        """Test that base64 JSON bodies keep working and take their options from the body"""
+        service = RecordingDeepgram()
+        monkeypatch.setattr(deepgram_api, "deepgram_service", service)
+        body = json.dumps({
+            "audio_data": base64.b64encode(b"RIFFdata").decode(),
+            "language": "de",
+            "auto_detect": False
+        }).encode()
+
+        response = await deepgram_api.transcribe_audio(
+            make_request([body], content_type="application/json"), language="en", auto_detect=True
+        )
+
+        assert response.success
+        assert service.calls == [(b"RIFFdata", "de", False)]
+
+    @pytest.mark.asyncio
+    async def test_oversized_raw_body_is_rejected(self, monkeypatch):
+        """Test that raw bodies above max_file_size get a 413"""
+        monkeypatch.setattr(settings, "max_file_size", 4)
+        monkeypatch.setattr(deepgram_api, "deepgram_service", RecordingDeepgram())
+
+        with pytest.raises(HTTPException) as error:
+            await deepgram_api.transcribe_audio(make_request([b"abc", b"def"]), language="en", auto_detect=True)
+        assert error.value.status_code == 413
+
+        declared = make_request([b"abc"], headers=[(b"content-length", b"100")])
+        with pytest.raises(HTTPException) as error:
+            await deepgram_api.transcribe_audio(declared, language="en", auto_detect=True)
+        assert error.value.status_code == 413
+
+    @pytest.mark.asyncio
+    async def test_long_audio_has_its_own_limit(self, monkeypatch):
+        """Test that /transcribe-long accepts bodies up to long_audio_max_file_size instead"""
+        monkeypatch.setattr(settings, "max_file_size", 4)
+        monkeypatch.setattr(settings, "long_audio_max_file_size", 8)
+        service = RecordingDeepgram()
+        monkeypatch.setattr(deepgram_api, "deepgram_service", service)
+
+        await deepgram_api.transcribe_long_audio(
+            make_request([b"abc", b"def"]), language="en", auto_detect=False, word_format="objects"
+        )
+        assert service.calls == [(b"abcdef", "en", False)]
+
+        with pytest.raises(HTTPException) as error:
+            await deepgram_api.transcribe_long_audio(
+                make_request([b"abcdef", b"ghi"]), language="en", auto_detect=False, word_format="objects"
+            )
+        assert error.value.status_code == 413
+
+
+def multipart_body(filename, content, fields=None, boundary="testboundary"):
+    """Encode a multipart/form-data body holding one file and some fields"""
+    parts = []
+    for name, value in (fields or {}).items():
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode()
+        )
+    parts.append(
+        f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+        f'Content-Type: application/octet-stream\r\n\r\n'.encode() + content + b"\r\n"
+    )
+    parts.append(f"--{boundary}--\r\n".encode())
+    return b"".join(parts), f"multipart/form-data; boundary={boundary}"
+
+
+class TestTranscribeFileUpload:
+    """Test cases for the streamed /transcribe-file upload"""
+
+    @pytest.mark.asyncio
+    async def test_upload_is_forwarded_as_a_stream(self, monkeypatch):
+        """Test that the spooled upload reaches Deepgram with its form options"""
+        service = RecordingDeepgram()
+        monkeypatch.setattr(deepgram_api, "deepgram_service", service)
+        body, content_type = multipart_body("talk.WAV", b"RIFFdata", {"language": "es", "auto_detect": "false"})
+        chunks = [body[i:i + 16] for i in range(0, len(body), 16)]
+
+        result = await deepgram_api.transcribe_file(make_request(chunks, content_type=content_type))
+
+        assert result["success"]
+        assert service.calls == [(b"RIFFdata", "es", False)]
+
+    @pytest.mark.asyncio
+    async def test_unlisted_format_is_rejected(self, monkeypatch):
+        """Test that extensions outside allowed_audio_formats get a 400"""
+        monkeypatch.setattr(deepgram_api, "deepgram_service", RecordingDeepgram())
+        body, content_type = multipart_body("notes.txt", b"hello")
+
+        with pytest.raises(HTTPException) as error:
+            await deepgram_api.transcribe_file(make_request([body], content_type=content_type))
+        assert error.value.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_oversized_upload_stops_early(self, monkeypatch):
+        """Test that an upload past max_file_size is rejected before the body is fully read"""
+        monkeypatch.setattr(settings, "max_file_size", 1024)
+        monkeypatch.setattr(deepgram_api, "MULTIPART_OVERHEAD", 256)
+        monkeypatch.setattr(deepgram_api, "deepgram_service", RecordingDeepgram())
+        body, content_type = multipart_body("big.wav", b"x" * 100_000)
+        chunks = [body[i:i + 512] for i in range(0, len(body), 512)]
+        request = make_request(chunks, content_type=content_type)
+
+        with pytest.raises(HTTPException) as error:
+            await deepgram_api.transcribe_file(request)
+        assert error.value.status_code == 413
+        assert len(request.state.pending_messages) > len(chunks) // 2
@@ -0,0 +1,108 @@
+import asyncio
+
+import pytest
+import websockets
+
+from app.config.settings import settings
+from app.services.audio_relay import AudioRelay, RelayOverflowError
+from app.services.deepgram import DeepgramService
+from app.services.deepgram_pool import LiveConnectionPool
+
+
+async def drain(relay):
+    return [chunk async for chunk in relay]
+
+
+class TestAudioRelay:
+    """Test cases for AudioRelay"""
+
+    @pytest.mark.asyncio
+    async def test_chunks_are_delivered_in_order(self):
+        """Test that queued chunks reach the consumer before the end of stream"""
+        relay = AudioRelay(max_chunks=4, overflow_policy="block")
+        for chunk in (b"a", b"b", b"c"):
+            await relay.put(chunk)
+        relay.close()
+
+        assert await drain(relay) == [b"a", b"b", b"c"]
+        stats = relay.get_stats()
+        assert stats["forwarded"] == 3
+        assert stats["max_depth"] == 3
+        assert stats["depth"] == 0
+
+    @pytest.mark.asyncio
+    async def test_block_policy_applies_backpressure(self):
+        """Test that a full relay makes the producer wait for the consumer"""
+        relay = AudioRelay(max_chunks=2, overflow_policy="block")
+        await relay.put(b"a")
+        await relay.put(b"b")
+
+        blocked = asyncio.create_task(relay.put(b"c"))
+        await asyncio.sleep(0.01)
+        assert not blocked.done()
+
+        assert await relay.__anext__() == b"a"
+        await asyncio.wait_for(blocked, timeout=0.5)
+        assert relay.get_stats()["dropped"] == 0
+
+    @pytest.mark.asyncio
+    async def test_drop_oldest_policy(self):
+        """Test that overflow discards the oldest queued chunks"""
+        relay = AudioRelay(max_chunks=2, overflow_policy="drop_oldest")
+        for chunk in (b"a", b"bb", b"c", b"d"):
+            await relay.put(chunk)
+        relay.close()
+
+        assert await drain(relay) == [b"c", b"d"]
+        stats = relay.get_stats()
+        assert stats["dropped"] == 2
+        assert stats["dropped_bytes"] == 3
+
+    @pytest.mark.asyncio
+    async def test_disconnect_policy(self):
+        """Test that overflow raises under the disconnect policy"""
+        relay = AudioRelay(max_chunks=1, overflow_policy="disconnect")
+        await relay.put(b"a")
+
+        with pytest.raises(RelayOverflowError):
+            await relay.put(b"b")
+
+    def test_unknown_policy_is_rejected(self):
+        """Test that a misconfigured policy fails fast"""
+        with pytest.raises(ValueError):
+            AudioRelay(max_chunks=1, overflow_policy="spill")
+
+
+class TestLiveSessionTeardown:
+    """Test cases for prompt teardown when the upstream fails"""
+
+    @pytest.mark.asyncio
+    async def test_upstream_failure_ends_session(self, monkeypatch):
+        """Test that an upstream that drops mid-stream ends the session while the client still streams"""
+        async def handler(ws, path=None):
+            await ws.recv()
+            await ws.close(code=1011, reason="upstream error")
+
+        server = await websockets.serve(handler, "127.0.0.1", 0)
+        host, port = server.sockets[0].getsockname()[:2]
+        monkeypatch.setattr(settings, "deepgram_live_url", f"ws://{host}:{port}/v1/listen")
+        service = DeepgramService()
+        service.api_key = "test-key"
+        service.client = object()
+        service.live_pool = LiveConnectionPool(service._open_live_connection, size=0)
+        relay = AudioRelay(max_chunks=8, overflow_policy="block")
+
+        async def endless_audio():
+            while True:
+                yield b"\x00" * 320
+                await asyncio.sleep(0.005)
+
+        async def consume():
+            return [result async for result in service.transcribe_live_audio_stream(endless_audio(), relay=relay)]
+
+        with pytest.raises(Exception):
+            await asyncio.wait_for(consume(), timeout=2)
+        assert relay.get_stats()["forwarded"] >= 1
+
+        server.close()
+        await server.wait_closed()
@@ -0,0 +1,115 @@
+import io
+import wave
+
+import numpy as np
+import pytest
+
+from app.utils import audio_segmentation
+from app.utils.audio_segmentation import encode_wav, frame_energy, plan_segments, read_wav, stitch_words
+
+
+def speech_with_pauses(seconds, pauses, sample_rate=16000):
+    """16-bit mono WAV of noise with silent gaps at the given (start, end) seconds"""
+    rng = np.random.default_rng(0)
+    samples = rng.normal(0, 3000, int(seconds * sample_rate))
+    for start, end in pauses:
+        samples[int(start * sample_rate):int(end * sample_rate)] = 0
+    output = io.BytesIO()
+    with wave.open(output, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(samples.astype("<i2").tobytes())
+    output.seek(0)
+    return output
+
+
+def word(text, start, end):
+    return {"word": text, "start": start, "end": end, "confidence": 0.9}
+
+
+class TestPlanSegments:
+    """Test cases for plan_segments"""
+
+    def test_cuts_land_in_pauses(self):
+        """Test that each cut moves to the nearest silence and segments overlap around it"""
+        audio = read_wav(speech_with_pauses(30, [(11.0, 11.4), (19.2, 19.6)]))
+
+        segments = plan_segments(audio, segment_seconds=10, overlap_seconds=0.5, search_seconds=2)
+
+        cuts = [segment.own_start / 16000 for segment in segments[1:]]
+        assert len(cuts) == 2
+        assert 11.0 <= cuts[0] <= 11.4
+        assert 19.2 <= cuts[1] <= 19.6
+        assert segments[0].own_start == 0 and segments[-1].own_end == audio.frame_count
+        for previous, following in zip(segments, segments[1:]):
+            assert previous.own_end == following.own_start
+            assert previous.end - previous.own_end == 8000
+            assert following.own_start - following.start == 8000
+
+    def test_short_audio_is_one_segment(self):
+        """Test that audio shorter than a segment is not split"""
+        audio = read_wav(speech_with_pauses(5, []))
+
+        segments = plan_segments(audio, segment_seconds=10, overlap_seconds=0.5, search_seconds=2)
+
+        assert len(segments) == 1
+
+    def test_encoded_segment_round_trips(self):
+        """Test that an encoded segment holds exactly the requested frames"""
+        audio = read_wav(speech_with_pauses(2, []))
+
+        segment = read_wav(io.BytesIO(encode_wav(audio, 1000, 5000)))
+
+        assert segment.frame_count == 4000
+        assert segment.read_frames(0, 4000) == audio.read_frames(1000, 5000)
+
+    def test_energy_is_computed_block_by_block(self, monkeypatch):
+        """Test that decoding in blocks gives the same energies as decoding everything at once"""
+        audio = read_wav(speech_with_pauses(3, [(1.0, 1.5)]))
+        samples = np.frombuffer(audio.read_frames(0, audio.frame_count), dtype="<i2").astype(np.float32)
+        expected = np.mean(samples[:-(samples.size % 320) or None].reshape(-1, 320) ** 2, axis=1)
+
+        monkeypatch.setattr(audio_segmentation, "ENERGY_BLOCK_FRAMES", 7)
+        energy, hop = frame_energy(audio)
+
+        assert hop == 320
+        assert np.allclose(energy, expected)
+
+    def test_header_read_leaves_samples_on_the_stream(self):
+        """Test that read_wav only parses the header and rewinds the stream"""
+        stream = speech_with_pauses(2, [])
+
+        audio = read_wav(stream)
+
+        assert stream.tell() == 0
+        assert audio.data_offset == 44 and audio.frame_count == 32000
+
+    def test_compressed_audio_is_rejected(self):
+        """Test that non-WAV input raises wave.Error"""
+        with pytest.raises(wave.Error):
+            read_wav(io.BytesIO(b"ID3\x04" + b"\x00" * 64))
+
+
+class TestStitchWords:
+    """Test cases for stitch_words"""
+
+    def test_offsets_are_shifted_and_overlap_deduplicated(self):
+        """Test that words move onto the global timeline and each overlap word is kept once"""
+        first = (0.0, 0.0, 10.0, [word("hello", 8.0, 8.5), word("there", 9.7, 10.1), word("again", 10.4, 10.8)])
+        second = (9.5, 10.0, 20.0, [word("there", 0.2, 0.6), word("again", 0.9, 1.3), word("friend", 2.0, 2.5)])
+
+        words = stitch_words([first, second])
+
+        assert [w["word"] for w in words] == ["hello", "there", "again", "friend"]
+        assert [w["start"] for w in words] == [8.0, 9.7, 10.4, 11.5]
+        assert words[-1]["end"] == 12.0
+
+    def test_repeated_word_straddling_the_cut_is_kept_once(self):
+        """Test that timestamp jitter across a cut does not duplicate a word"""
+        first = (0.0, 0.0, 10.0, [word("meeting", 9.5, 9.98)])
+        second = (9.5, 10.0, 20.0, [word("meeting", 0.45, 0.6)])
+
+        words = stitch_words([first, second])
+
+        assert [w["word"] for w in words] == ["meeting"]
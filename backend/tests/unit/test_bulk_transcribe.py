@@ -0,0 +1,158 @@
+import asyncio
+import io
+import json
+
+import pytest
+
+from app.cli import bulk_transcribe
+from app.utils.word_columns import WordColumns
+from tests.unit.test_audio_segmentation import speech_with_pauses
+
+
+class BulkDeepgram:
+    """Deepgram stand-in that fails listed files and tracks concurrency"""
+
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+
+    def is_available(self):
+        return True
+
+    async def transcribe_audio_data(self, audio, language="en", detect_language=False, columnar_words=False):
+        name = audio.name.rsplit("/", 1)[-1]
+        self.calls.append((name, language, detect_language))
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        if name in self.failing:
+            return {"success": False, "error": "upstream unavailable", "transcript": "", "confidence": 0.0}
+        words = [{"word": "hello", "start": 0.0, "end": 1.5, "confidence": 0.9}]
+        return {
+            "success": True,
+            "transcript": "hello",
+            "confidence": 0.9,
+            "words": WordColumns.from_words(words) if columnar_words else words,
+            "language": language,
+            "detected_language": language,
+            "detection_confidence": 0.0
+        }
+
+
+def write_audio(directory, names):
+    for name in names:
+        path = directory / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if name.endswith(".wav"):
+            path.write_bytes(speech_with_pauses(2, []).getvalue())
+        else:
+            path.write_bytes(b"ID3\x04audio")
+
+
+def read_lines(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+class TestDiscover:
+    """Test cases for input discovery"""
+
+    def test_directory_is_walked_for_audio(self, tmp_path):
+        """Test that audio files are found recursively and other files ignored"""
+        write_audio(tmp_path, ["a.wav", "day2/b.mp3"])
+        (tmp_path / "notes.txt").write_text("agenda")
+
+        items = bulk_transcribe.discover(str(tmp_path))
+
+        assert items == [(str(tmp_path / "a.wav"), None), (str(tmp_path / "day2" / "b.mp3"), None)]
+
+    def test_manifest_paths_are_relative_to_the_manifest(self, tmp_path):
+        """Test that text and JSONL manifest lines resolve against the manifest directory"""
+        manifest = tmp_path / "manifest.jsonl"
+        manifest.write_text('a.wav\n# skipped\n{"path": "sub/b.mp3", "language": "fr"}\n')
+
+        items = bulk_transcribe.discover(str(manifest))
+
+        assert items == [(str(tmp_path / "a.wav"), None), (str(tmp_path / "sub" / "b.mp3"), "fr")]
+
+
+class TestTranscribeAll:
+    """Test cases for bulk transcription runs"""
+
+    @pytest.mark.asyncio
+    async def test_results_are_written_with_bounded_concurrency(self, tmp_path, monkeypatch):
+        """Test that every file gets a JSONL line and at most N run at once"""
+        service = BulkDeepgram(failing={"c.mp3"})
+        monkeypatch.setattr(bulk_transcribe, "deepgram_service", service)
+        write_audio(tmp_path, ["a.wav", "b.wav", "c.mp3", "d.mp3", "e.mp3"])
+        output = io.StringIO()
+
+        summary = await bulk_transcribe.transcribe_all(
+            bulk_transcribe.discover(str(tmp_path)), output, concurrency=2
+        )
+
+        records = [json.loads(line) for line in output.getvalue().splitlines()]
+        assert len(records) == 5
+        assert service.max_active == 2
+        assert summary["succeeded"] == 4 and summary["failed"] == 1
+        # Two 2 s WAV files plus two compressed files estimated from their last word
+        assert summary["audio_seconds"] == pytest.approx(7.0)
+        assert summary["files_per_minute"] > 0
+
+    @pytest.mark.asyncio
+    async def test_rerun_resumes_from_the_output(self, tmp_path, monkeypatch):
+        """Test that a second run skips successful files and retries failed ones"""
+        audio_dir = tmp_path / "audio"
+        write_audio(audio_dir, ["a.wav", "b.mp3", "c.mp3"])
+        output_path = tmp_path / "results.jsonl"
+        items = bulk_transcribe.discover(str(audio_dir))
+
+        first = BulkDeepgram(failing={"b.mp3"})
+        monkeypatch.setattr(bulk_transcribe, "deepgram_service", first)
+        with open(output_path, "a") as output:
+            await bulk_transcribe.transcribe_all(items, output, concurrency=2)
+        # An interrupted run can leave a truncated last line
+        with open(output_path, "a") as output:
+            output.write('{"path": "')
+
+        second = BulkDeepgram()
+        monkeypatch.setattr(bulk_transcribe, "deepgram_service", second)
+        with bulk_transcribe.open_output(str(output_path)) as output:
+            summary = await bulk_transcribe.transcribe_all(
+                items, output, concurrency=2, completed=bulk_transcribe.load_checkpoint(str(output_path))
+            )
+
+        assert [call[0] for call in second.calls] == ["b.mp3"]
+        assert summary["skipped"] == 2 and summary["succeeded"] == 1
+        assert bulk_transcribe.load_checkpoint(str(output_path)) == {path for path, _ in items}
+
+    @pytest.mark.asyncio
+    async def test_manifest_language_overrides_detection(self, tmp_path, monkeypatch):
+        """Test that a per-file language is used as-is and columns are written as arrays"""
+        service = BulkDeepgram()
+        monkeypatch.setattr(bulk_transcribe, "deepgram_service", service)
+        write_audio(tmp_path, ["a.mp3"])
+        output = io.StringIO()
+
+        await bulk_transcribe.transcribe_all(
+            [(str(tmp_path / "a.mp3"), "de")], output, concurrency=1,
+            detect_language=True, word_format="columns"
+        )
+
+        assert service.calls == [("a.mp3", "de", False)]
+        record = json.loads(output.getvalue())
+        assert record["words"]["word"] == ["hello"]
+
+    def test_main_prints_a_summary(self, tmp_path, monkeypatch, capsys):
+        """Test the command-line entry point end to end"""
+        monkeypatch.setattr(bulk_transcribe, "deepgram_service", BulkDeepgram())
+        write_audio(tmp_path / "audio", ["a.wav"])
+        output_path = tmp_path / "results.jsonl"
+
+        exit_code = bulk_transcribe.main([str(tmp_path / "audio"), "-o", str(output_path), "-c", "2"])
+
+        assert exit_code == 0
+        assert len(read_lines(output_path)) == 1
+        assert "audio-hours/hour" in capsys.readouterr().out
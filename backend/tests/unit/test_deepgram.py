@@ -0,0 +1,181 @@
+import asyncio
+import io
+import wave
+
+import pytest
+
+from app.config.settings import settings
+from app.services.deepgram import DeepgramService
+from app.utils.audio_segmentation import plan_segments, read_wav
+from tests.unit.test_audio_segmentation import speech_with_pauses
+
+
+def make_response(transcript="hola a todos", detected_language="es", language_confidence=0.97):
+    """Dictionary shaped like a Deepgram prerecorded response"""
+    channel = {
+        "alternatives": [{
+            "transcript": transcript,
+            "confidence": 0.93,
+            "words": [
+                {"word": "hola", "start": 0.1, "end": 0.4, "confidence": 0.99},
+                {"word": "a", "start": 0.4, "end": 0.5, "confidence": 0.9},
+                {"word": "todos", "start": 0.5, "end": 0.9, "confidence": 0.95},
+            ]
+        }]
+    }
+    if detected_language:
+        channel["detected_language"] = detected_language
+        channel["language_confidence"] = language_confidence
+    return {"metadata": {}, "results": {"channels": [channel]}}
+
+
+class FakePrerecorded:
+    """Records each prerecorded request instead of calling Deepgram"""
+
+    def __init__(self, response):
+        self.response = response
+        self.calls = []
+
+    async def __call__(self, audio, options):
+        self.calls.append((audio.read(), options))
+        return self.response
+
+
+def make_service(response):
+    service = DeepgramService()
+    service.api_key = "test-key"
+    service.client = object()
+    service.result_cache.enabled = False
+    service._prerecorded = FakePrerecorded(response)
+    return service
+
+
+class TestSinglePassDetection:
+    """Test cases for detect-and-transcribe in one Deepgram request"""
+
+    @pytest.mark.asyncio
+    async def test_one_request_fills_transcript_and_language(self):
+        """Test that auto-detection costs a single upload"""
+        service = make_service(make_response())
+
+        result = await service.transcribe_audio_data(b"audio", "en", detect_language=True)
+
+        assert len(service._prerecorded.calls) == 1
+        audio, options = service._prerecorded.calls[0]
+        assert audio == b"audio"
+        assert options.detect_language is True
+        assert options.language is None
+        assert result["transcript"] == "hola a todos"
+        assert result["detected_language"] == "es"
+        assert result["detection_confidence"] == 0.97
+        assert [w["word"] for w in result["words"]] == ["hola", "a", "todos"]
+
+    @pytest.mark.asyncio
+    async def test_fixed_language_and_fallback(self):
+        """Test that a fixed language is sent as-is and reported when nothing is detected"""
+        service = make_service(make_response(detected_language=None))
+
+        result = await service.transcribe_audio_data(b"audio", "fr")
+
+        _, options = service._prerecorded.calls[0]
+        assert options.language == "fr"
+        assert not options.detect_language
+        assert result["detected_language"] == "fr"
+
+
+class SegmentTranscriber:
+    """Answers each segment request with the next scripted result, recording the audio length"""
+
+    def __init__(self, results):
+        self.results = list(results)
+        self.durations = []
+        self.frames = []
+        self.active = 0
+        self.max_active = 0
+
+    async def __call__(self, audio_data, language="en", detect_language=False):
+        with wave.open(io.BytesIO(audio_data), "rb") as wav:
+            self.durations.append(wav.getnframes() / wav.getframerate())
+            self.frames.append(wav.readframes(wav.getnframes()))
+        result = self.results.pop(0)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        return result
+
+
+def segment_result(words, transcript=None, language="en", confidence=0.9):
+    return {
+        "success": True,
+        "transcript": transcript or " ".join(w[0] for w in words),
+        "confidence": confidence,
+        "words": [{"word": w[0].lower().strip(".,"), "start": w[1], "end": w[2], "confidence": 0.9} for w in words],
+        "language": "en",
+        "detected_language": language,
+        "detection_confidence": 0.95
+    }
+
+
+class TestLongAudio:
+    """Test cases for parallel segmented transcription"""
+
+    @pytest.mark.asyncio
+    async def test_segments_are_stitched_onto_one_timeline(self, monkeypatch):
+        """Test that a long WAV is split at its pauses and the words merged without duplicates"""
+        monkeypatch.setattr(settings, "long_audio_search_seconds", 2.0)
+        service = make_service(make_response())
+        audio = speech_with_pauses(30, [(11.0, 11.4), (19.2, 19.6)])
+        transcriber = SegmentTranscriber([
+            segment_result([("Hello", 1.0, 1.4), ("everyone.", 10.5, 10.9), ("Welcome", 11.5, 11.9)]),
+            segment_result([("everyone.", 0.5, 0.9), ("Welcome", 1.5, 1.9), ("back", 5.0, 5.3)]),
+            segment_result([("Thanks.", 2.0, 2.4)], language="en")
+        ])
+        service.transcribe_audio_data = transcriber
+
+        result = await service.transcribe_long_audio(
+            audio, "en", segment_seconds=10, overlap_seconds=1.0, parallelism=2
+        )
+
+        assert result["success"]
+        assert len(transcriber.durations) == 3
+        assert transcriber.max_active == 2
+        # Segments encoded in worker threads still hold exactly their slice of the recording
+        audio.seek(0)
+        pcm = read_wav(audio)
+        segments = plan_segments(pcm, 10, 1.0, 2.0)
+        assert transcriber.frames == [pcm.read_frames(segment.start, segment.end) for segment in segments]
+        assert result["transcript"] == "Hello everyone. Welcome back Thanks."
+        assert [w["word"] for w in result["words"]] == ["hello", "everyone", "welcome", "back", "thanks"]
+        starts = [w["start"] for w in result["words"]]
+        assert starts == sorted(starts)
+        assert starts[0] == 1.0 and starts[-1] > 20
+        assert set(result) == {
+            "success", "transcript", "confidence", "words", "language", "detected_language", "detection_confidence"
+        }
+
+    @pytest.mark.asyncio
+    async def test_failed_segment_fails_the_recording(self, monkeypatch):
+        """Test that one failed segment fails the whole transcription rather than leaving a gap"""
+        monkeypatch.setattr(settings, "long_audio_search_seconds", 2.0)
+        service = make_service(make_response())
+        failed = {"success": False, "error": "timeout", "transcript": "", "confidence": 0.0}
+        service.transcribe_audio_data = SegmentTranscriber([segment_result([]), failed, segment_result([])])
+
+        result = await service.transcribe_long_audio(
+            speech_with_pauses(30, [(11.0, 11.4), (19.2, 19.6)]), "en", segment_seconds=10, overlap_seconds=1.0
+        )
+
+        assert not result["success"]
+        assert "Segment 1" in result["error"]
+
+    @pytest.mark.asyncio
+    async def test_compressed_audio_is_sent_whole(self):
+        """Test that audio which cannot be split goes out as one request"""
+        service = make_service(make_response())
+
+        result = await service.transcribe_long_audio(b"ID3\x04mp3 audio", "es", segment_seconds=10)
+
+        assert len(service._prerecorded.calls) == 1
+        assert service._prerecorded.calls[0][0] == b"ID3\x04mp3 audio"
+        assert result["transcript"] == "hola a todos"
@@ -0,0 +1,183 @@
+import asyncio
+import json
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import websockets
+
+from app.config.settings import settings
+from app.services.deepgram import DeepgramService
+from app.services.deepgram_pool import KEEPALIVE_MESSAGE, LiveConnectionPool
+
+
+class LocalListenServer:
+    """Local websocket stand-in for the Deepgram live endpoint"""
+
+    def __init__(self):
+        self.handshakes = []
+        self.received = []
+        self.server = None
+
+    async def __aenter__(self):
+        self.server = await websockets.serve(self.handle, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.server.close()
+        await self.server.wait_closed()
+
+    @property
+    def url(self):
+        host, port = self.server.sockets[0].getsockname()[:2]
+        return f"ws://{host}:{port}/v1/listen"
+
+    async def handle(self, ws, path=None):
+        path = path or ws.path
+        self.handshakes.append(parse_qs(urlparse(path).query))
+        async for message in ws:
+            self.received.append(message)
+            if message == b"":
+                await ws.send(json.dumps({"channel": {"alternatives": [{"transcript": "hello world"}]}}))
+                await ws.close()
+
+    def connect(self, options):
+        query = "&".join(f"{name}={value}" for name, value in options.items())
+        return websockets.connect(f"{self.url}?{query}")
+
+
+async def wait_for(condition, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline
+        await asyncio.sleep(0.01)
+
+
+class TestLiveConnectionPool:
+    """Test cases for LiveConnectionPool"""
+
+    @pytest.mark.asyncio
+    async def test_warm_pool_serves_sessions_and_refills(self):
+        """Test that sessions take pre-opened connections and the pool tops itself up"""
+        async with LocalListenServer() as server:
+            pool = LiveConnectionPool(server.connect, size=2, keepalive_interval=10)
+            options = {"language": "en", "encoding": "linear16"}
+
+            pool.warm(options)
+            await wait_for(lambda: pool.get_stats()["idle"] == 2)
+
+            ws = await pool.acquire(options)
+            assert not ws.closed
+            assert pool.stats["hits"] == 1
+            await wait_for(lambda: pool.get_stats()["idle"] == 2)
+            assert pool.stats["opened"] == 3
+
+            await ws.close()
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_option_sets_are_pooled_separately(self):
+        """Test that a connection is only reused for the options it was opened with"""
+        async with LocalListenServer() as server:
+            pool = LiveConnectionPool(server.connect, size=1, keepalive_interval=10)
+            pool.warm({"language": "en"})
+            await wait_for(lambda: pool.get_stats()["idle"] == 1)
+
+            ws = await pool.acquire({"language": "fr"})
+
+            assert pool.stats["misses"] == 1
+            assert server.handshakes[-1]["language"] == ["fr"]
+            await ws.close()
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_idle_connections_get_keepalives(self):
+        """Test that idle connections are kept open with KeepAlive messages"""
+        async with LocalListenServer() as server:
+            pool = LiveConnectionPool(server.connect, size=1, keepalive_interval=0.05)
+            pool.warm({"language": "en"})
+
+            await wait_for(lambda: KEEPALIVE_MESSAGE in server.received)
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_warmed_keys_are_refilled_after_idle_retirement(self):
+        """Test that connections retired for age are replaced for warmed keys, but not for others"""
+        async with LocalListenServer() as server:
+            pool = LiveConnectionPool(server.connect, size=1, keepalive_interval=0.05, max_idle_seconds=0.2)
+            pool.warm({"language": "en"})
+            await wait_for(lambda: pool.get_stats()["idle"] == 1)
+            ws = await pool.acquire({"language": "fr"})
+            await ws.close()
+            first = pool._idle[pool.key_for({"language": "en"})][0].ws
+
+            await wait_for(lambda: pool.stats["discarded"] >= 2)
+            await wait_for(lambda: pool.get_stats()["idle"] == 1)
+
+            assert pool._idle[pool.key_for({"language": "en"})][0].ws is not first
+            assert not pool._idle.get(pool.key_for({"language": "fr"}))
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_closed_connections_are_not_handed_out(self):
+        """Test that a connection closed while idle is discarded on acquire"""
+        async with LocalListenServer() as server:
+            pool = LiveConnectionPool(server.connect, size=1, keepalive_interval=10)
+            pool.warm({"language": "en"})
+            await wait_for(lambda: pool.get_stats()["idle"] == 1)
+            stale = pool._idle[pool.key_for({"language": "en"})][0].ws
+            await stale.close()
+
+            ws = await pool.acquire({"language": "en"})
+
+            assert ws is not stale and not ws.closed
+            assert pool.stats["discarded"] == 1
+            await ws.close()
+            await pool.close()
+
+
+class TestPooledLiveTranscription:
+    """Test cases for live transcription over a pooled connection"""
+
+    @pytest.mark.asyncio
+    async def test_live_stream_uses_local_server(self, monkeypatch):
+        """Test a full live session against the local stand-in server"""
+        async with LocalListenServer() as server:
+            monkeypatch.setattr(settings, "deepgram_live_url", server.url)
+            service = DeepgramService()
+            service.api_key = "test-key"
+            service.client = object()
+            service.live_pool = LiveConnectionPool(service._open_live_connection, size=1, keepalive_interval=10)
+            service.warm_live_connections(["en"])
+            await wait_for(lambda: service.live_pool.get_stats()["idle"] == 1)
+
+            async def audio():
+                yield b"\x00\x01" * 160
+
+            results = [result async for result in service.transcribe_live_audio_stream(audio(), "en")]
+
+            assert results[0]["channel"]["alternatives"][0]["transcript"] == "hello world"
+            assert service.live_pool.stats["hits"] == 1
+            assert server.handshakes[0]["sample_rate"] == ["16000"]
+            await service.live_pool.close()
+
+    @pytest.mark.asyncio
+    async def test_keepalive_sent_while_client_is_silent(self, monkeypatch):
+        """Test that a live session sends KeepAlive when no audio arrives for a while"""
+        async with LocalListenServer() as server:
+            monkeypatch.setattr(settings, "deepgram_live_url", server.url)
+            monkeypatch.setattr(settings, "deepgram_keepalive_seconds", 0.05)
+            service = DeepgramService()
+            service.api_key = "test-key"
+            service.client = object()
+            service.live_pool = LiveConnectionPool(service._open_live_connection, size=0)
+
+            async def audio():
+                yield b"\x00\x01" * 160
+                await asyncio.sleep(0.2)
+                yield b"\x00\x01" * 160
+
+            results = [result async for result in service.transcribe_live_audio_stream(audio(), "en")]
+
+            assert results
+            assert KEEPALIVE_MESSAGE in server.received
+            assert server.received[-1] == b""
@@ -0,0 +1,102 @@
+import pytest
+
+from app.services.language_detector import LocalLanguageDetector
+from app.services.translation_cache import TranslationCache
+from app.services.translation_engine import AsyncTranslationEngine, TranslationBackend
+
+
+class TestLocalLanguageDetector:
+    """Test cases for the offline language detector"""
+
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.detector = LocalLanguageDetector()
+
+    @pytest.mark.parametrize("text,language", [
+        ("我会在会议后把笔记发给大家", "zh"),
+        ("会議の後でみんなにメモを送ります", "ja"),
+        ("회의 후에 모두에게 메모를 보내겠습니다", "ko"),
+        ("Я отправлю заметки всем после звонка", "ru"),
+        ("سأرسل الملاحظات للجميع بعد المكالمة", "ar"),
+        ("אני אשלח את הסיכום לכולם", "he"),
+        ("ฉันจะส่งบันทึกให้ทุกคน", "th"),
+        ("मैं सभी को नोट्स भेज दूंगा", "hi"),
+    ])
+    def test_scripts(self, text, language):
+        """Test that non-Latin scripts are identified with high confidence"""
+        result = self.detector.detect(text)
+
+        assert result["detected_language"] == language
+        assert result["confidence"] > 0.9
+        assert result["is_reliable"] is True
+
+    @pytest.mark.parametrize("text,language", [
+        ("We need to finish the migration before the release next month", "en"),
+        ("Tenemos que terminar la migración antes del lanzamiento", "es"),
+        ("Nous devons terminer la migration avant la sortie", "fr"),
+        ("Wir müssen die Migration vor dem nächsten Release abschließen", "de"),
+        ("Dobbiamo finire la migrazione prima del rilascio", "it"),
+        ("Vou enviar as notas para todos depois da chamada", "pt"),
+    ])
+    def test_latin_sentences(self, text, language):
+        """Test that Latin-script sentences are classified by the trigram model"""
+        assert self.detector.detect(text)["detected_language"] == language
+
+    @pytest.mark.parametrize("text,language", [
+        ("We need to finish the migration before the release next month", "en"),
+        ("Wir müssen die Migration vor dem nächsten Release abschließen", "de"),
+        ("Nous devons terminer la migration avant la sortie", "fr"),
+    ])
+    def test_supported_latin_sentences_are_reliable(self, text, language):
+        """Test that text in a profiled language fits it well enough to skip the cloud API"""
+        result = self.detector.detect(text)
+
+        assert result["detected_language"] == language
+        assert result["is_reliable"] is True
+
+    @pytest.mark.parametrize("text", [
+        "Tôi nghĩ chúng ta cần thêm thời gian",
+        "Musimy skończyć migrację przed następnym wydaniem",
+        "Het is een goed idee om de vergadering naar donderdag te verplaatsen",
+        "We moeten de migratie afronden voor de volgende release",
+        "Temos que rematar a migración antes do lanzamento",
+        "Creo que o cliente quere ver unha demostración esta semana",
+        "Vou revisar o informe e despois chámote",
+    ])
+    def test_unprofiled_latin_languages_are_not_trusted(self, text):
+        """Test that Latin text in a language without a profile falls through to the cloud API"""
+        result = self.detector.detect(text)
+
+        assert result["is_reliable"] is False
+        assert result["confidence"] < 0.5
+
+    def test_short_text_is_not_trusted(self):
+        """Test that short Latin text gets low confidence and no letters gives no answer"""
+        assert self.detector.detect("yes")["confidence"] < 0.5
+        assert self.detector.detect("12:30 !!") is None
+
+
+class TestEngineDetection:
+    """Test cases for detection routing in the async engine"""
+
+    @pytest.mark.asyncio
+    async def test_only_uncertain_text_reaches_backend(self):
+        """Test that confident local results skip the cloud API"""
+
+        class CloudBackend(TranslationBackend):
+            def __init__(self):
+                self.detected = []
+
+            async def detect_language(self, text):
+                self.detected.append(text)
+                return {"detected_language": "en", "confidence": 0.7, "is_reliable": False}
+
+        backend = CloudBackend()
+        engine = AsyncTranslationEngine(backend, cache=TranslationCache(use_redis=False))
+
+        local = await engine.detect_language("회의 후에 모두에게 메모를 보내겠습니다")
+        cloud = await engine.detect_language("ok")
+
+        assert local["detected_language"] == "ko"
+        assert cloud["detected_language"] == "en"
+        assert backend.detected == ["ok"]
@@ -0,0 +1,73 @@
+import pytest
+
+import app.api.v1.deepgram as deepgram_api
+import app.services.websocket_manager as websocket_manager_module
+from app.services.translation_cache import TranslationCache
+from app.services.translation_engine import AsyncTranslationEngine
+from app.services.websocket_manager import ConnectionManager
+from tests.unit.test_pcm import AudioWebSocket
+from tests.unit.test_session_language import ResultsLiveService, ScriptedDetector, result
+from tests.unit.test_websocket_manager import CountingBackend, FakeWebSocket
+
+
+class TestLiveCaptions:
+    """Test cases for the /ws/live-captions pipeline"""
+
+    @pytest.mark.asyncio
+    async def test_finals_are_translated_to_the_room(self, monkeypatch):
+        """Test that final segments reach each participant in their language, partials do not"""
+        backend = CountingBackend()
+        engine = AsyncTranslationEngine(backend, cache=TranslationCache(use_redis=False))
+        monkeypatch.setattr(websocket_manager_module, "translation_engine", engine)
+
+        class Detection:
+            detect_language = staticmethod(ScriptedDetector(["en"]))
+
+        monkeypatch.setattr(deepgram_api, "translation_engine", Detection())
+        room = ConnectionManager()
+        monkeypatch.setattr(deepgram_api, "manager", room)
+        listeners = {"speaker": FakeWebSocket(), "ana": FakeWebSocket(), "luc": FakeWebSocket()}
+        for user_id, language in (("speaker", "en"), ("ana", "es"), ("luc", "fr")):
+            await room.connect(listeners[user_id], "room-1", user_id, {"targetLanguage": language})
+        for socket in listeners.values():
+            socket.sent.clear()
+
+        monkeypatch.setattr(deepgram_api, "deepgram_service", ResultsLiveService([
+            result("next", False),
+            result("next slide please", True),
+        ]))
+        audio_socket = AudioWebSocket([], {"room_id": "room-1", "user_id": "speaker", "sample_rate": "16000"})
+
+        await deepgram_api.websocket_live_captions(audio_socket)
+
+        assert len(audio_socket.sent) == 2
+        assert [message["translated"] for message in listeners["ana"].sent] == ["[es] next slide please"]
+        assert [message["translated"] for message in listeners["luc"].sent] == ["[fr] next slide please"]
+        assert listeners["speaker"].sent == []
+        assert listeners["ana"].sent[0]["sourceLanguage"] == "en"
+
+    @pytest.mark.asyncio
+    async def test_room_and_user_are_required(self):
+        """Test that the socket is refused without a room and speaker"""
+        audio_socket = AudioWebSocket([], {"sample_rate": "16000"})
+
+        await deepgram_api.websocket_live_captions(audio_socket)
+
+        assert audio_socket.closed[0] == 1008
+
+    @pytest.mark.asyncio
+    async def test_speaker_must_be_in_the_room(self, monkeypatch):
+        """Test that a speaker who has not joined the room is refused"""
+        room = ConnectionManager()
+        monkeypatch.setattr(deepgram_api, "manager", room)
+        await room.connect(FakeWebSocket(), "room-1", "ana", {"targetLanguage": "es"})
+        service = ResultsLiveService([result("hello", True)])
+        monkeypatch.setattr(deepgram_api, "deepgram_service", service)
+
+        for query in ({"room_id": "room-1", "user_id": "mallory"}, {"room_id": "room-2", "user_id": "ana"}):
+            audio_socket = AudioWebSocket([], {**query, "sample_rate": "16000"})
+
+            await deepgram_api.websocket_live_captions(audio_socket)
+
+            assert audio_socket.closed[0] == 1008
+            assert audio_socket.sent == []
@@ -0,0 +1,81 @@
+import pytest
+
+import app.api.v1.deepgram as deepgram_api
+from app.services.live_telemetry import Histogram, LiveSessionTelemetry, LiveTelemetryRegistry
+from tests.unit.test_pcm import AudioWebSocket
+from tests.unit.test_session_language import ResultsLiveService, result
+
+
+class TestHistogram:
+    """Test cases for Histogram"""
+
+    def test_quantiles_use_bucket_bounds(self):
+        """Test that quantiles report the bucket upper bound"""
+        histogram = Histogram(buckets=(10, 100, 1000))
+        for value in (5, 7, 50, 60, 70, 500, 5000):
+            histogram.observe(value)
+
+        snapshot = histogram.snapshot()
+        assert snapshot["count"] == 7
+        assert snapshot["p50"] == 100.0
+        assert snapshot["p95"] == 5000
+        assert snapshot["max"] == 5000
+
+    def test_merge(self):
+        """Test that merged histograms add up"""
+        first, second = Histogram(buckets=(10,)), Histogram(buckets=(10,))
+        first.observe(1)
+        second.observe(20)
+        first.merge(second)
+
+        assert first.counts == [1, 1]
+        assert first.max == 20
+
+
+class TestLiveSessionTelemetry:
+    """Test cases for LiveSessionTelemetry"""
+
+    def test_counters_and_first_partial(self):
+        """Test frame, upstream and result counters"""
+        telemetry = LiveSessionTelemetry("s1", log_sample_rate=10)
+        telemetry.set_upstream_format("linear16", 16000, 1)
+        for _ in range(3):
+            telemetry.record_frame(640)
+            telemetry.record_upstream(32000)
+
+        telemetry.record_result({"is_final": False})
+        telemetry.record_result({"is_final": True, "start": 0.0, "duration": 2.0})
+
+        snapshot = telemetry.snapshot()
+        assert snapshot["frames_in"] == 3
+        assert snapshot["bytes_in"] == 1920
+        assert snapshot["bytes_upstream"] == 96000
+        assert snapshot["partials"] == 1 and snapshot["finals"] == 1
+        assert snapshot["time_to_first_partial_ms"] is not None
+        assert snapshot["final_latency_ms"]["count"] == 1
+
+    def test_logging_is_sampled(self):
+        """Test that only one in N events is logged"""
+        telemetry = LiveSessionTelemetry("s1", log_sample_rate=10)
+
+        assert sum(telemetry.should_log() for _ in range(100)) == 10
+
+
+class TestTelemetryRegistry:
+    """Test cases for the live telemetry registry"""
+
+    @pytest.mark.asyncio
+    async def test_session_is_visible_then_folded_into_totals(self, monkeypatch):
+        """Test that a live-transcribe session is registered and totals are kept when it ends"""
+        registry = LiveTelemetryRegistry()
+        monkeypatch.setattr(deepgram_api, "live_telemetry", registry)
+        monkeypatch.setattr(deepgram_api, "deepgram_service", ResultsLiveService([result("hello", False)]))
+        websocket = AudioWebSocket([], {"sample_rate": "16000"})
+
+        await deepgram_api.websocket_live_transcribe(websocket)
+
+        snapshot = registry.snapshot()
+        assert snapshot["active_sessions"] == []
+        assert snapshot["completed_sessions"] == 1
+        assert snapshot["totals"]["results"] == 0
+        assert (await deepgram_api.get_live_telemetry())["completed_sessions"] == 1
@@ -0,0 +1,86 @@
+import asyncio
+import json
+
+import pytest
+from fastapi import WebSocketDisconnect
+
+import app.api.v1.deepgram as deepgram_api
+
+
+class SlowEngine:
+    """Translation engine stand-in that records which texts finished translating"""
+
+    def __init__(self, delay: float = 0.1):
+        self.delay = delay
+        self.finished = []
+
+    async def translate_text(self, text, source_language="en", target_language="es", enable_punctuation=True):
+        await asyncio.sleep(self.delay)
+        self.finished.append(text)
+        return {"translated_text": text.upper(), "confidence": 1.0}
+
+    def end_stream(self, session_id):
+        pass
+
+
+class ScriptedWebSocket:
+    """Feeds queued client messages to the endpoint and records its replies"""
+
+    def __init__(self, messages, linger: float = 0.3):
+        self.messages = [json.dumps(message) for message in messages]
+        self.linger = linger
+        self.sent = []
+
+    async def accept(self):
+        pass
+
+    async def receive_text(self):
+        if self.messages:
+            return self.messages.pop(0)
+        # Stay connected long enough for in-flight translations to finish
+        await asyncio.sleep(self.linger)
+        raise WebSocketDisconnect()
+
+    async def send_json(self, data):
+        self.sent.append(data)
+
+    async def close(self, code=1000, reason=None):
+        pass
+
+
+class TestLiveTranslateSupersede:
+    """Test cases for utterance supersede-and-cancel on /ws/live-translate"""
+
+    @pytest.mark.asyncio
+    async def test_newer_text_cancels_older_version(self, monkeypatch):
+        """Test that only the latest version of an utterance is translated and sent"""
+        engine = SlowEngine()
+        monkeypatch.setattr(deepgram_api, "translation_engine", engine)
+        websocket = ScriptedWebSocket([
+            {"text": text, "target_language": "es", "utterance_id": "u1"}
+            for text in ("next", "next slide", "next slide please")
+        ])
+
+        await deepgram_api.websocket_live_translate(websocket)
+
+        assert websocket.sent == [{
+            "translated_text": "NEXT SLIDE PLEASE",
+            "target_language": "es",
+            "utterance_id": "u1"
+        }]
+        assert engine.finished == ["next slide please"]
+
+    @pytest.mark.asyncio
+    async def test_messages_without_id_are_all_answered(self, monkeypatch):
+        """Test that messages without an utterance id keep the sequential behavior"""
+        engine = SlowEngine(delay=0.01)
+        monkeypatch.setattr(deepgram_api, "translation_engine", engine)
+        websocket = ScriptedWebSocket([
+            {"text": "one", "target_language": "es"},
+            {"text": "two", "target_language": "es"}
+        ], linger=0)
+
+        await deepgram_api.websocket_live_translate(websocket)
+
+        assert [r["translated_text"] for r in websocket.sent] == ["ONE", "TWO"]
+        assert all("utterance_id" not in r for r in websocket.sent)
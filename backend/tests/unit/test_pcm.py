@@ -0,0 +1,202 @@
+import numpy as np
+import pytest
+from fastapi import WebSocketDisconnect
+from starlette.websockets import WebSocketState
+
+import app.api.v1.deepgram as deepgram_api
+from app.utils.pcm import AudioFormatError, PCMConverter, negotiate_format
+
+
+def sine(frequency, sample_rate, seconds=1.0, channels=1, amplitude=0.5):
+    """Interleaved int16 PCM of a sine tone"""
+    t = np.arange(int(sample_rate * seconds)) / sample_rate
+    tone = amplitude * np.sin(2 * np.pi * frequency * t)
+    frames = np.repeat(tone[:, None], channels, axis=1)
+    return (frames * 32767).astype("<i2").tobytes()
+
+
+def dominant_frequency(pcm, sample_rate):
+    samples = np.frombuffer(pcm, dtype="<i2").astype(np.float64)
+    spectrum = np.abs(np.fft.rfft(samples))
+    return np.fft.rfftfreq(len(samples), 1 / sample_rate)[np.argmax(spectrum)]
+
+
+class TestPCMConverter:
+    """Test cases for PCMConverter"""
+
+    def test_matching_format_is_passed_through(self):
+        """Test that 16 kHz mono linear16 input is returned unchanged"""
+        converter = PCMConverter("linear16", 16000, 1)
+        chunk = sine(440, 16000, seconds=0.1)
+
+        assert converter.passthrough
+        assert converter.convert(chunk) is chunk
+
+    def test_stereo_48k_becomes_16k_mono(self):
+        """Test downmix and resample: a third of the frames, half the channels"""
+        converter = PCMConverter("linear16", 48000, 2)
+        audio = sine(440, 48000, channels=2)
+
+        output = converter.convert(audio)
+
+        assert abs(len(output) - len(audio) // 6) <= 4
+        assert abs(dominant_frequency(output, 16000) - 440) <= 2
+
+    def test_split_chunks_match_one_shot_conversion(self):
+        """Test that arbitrary chunk boundaries (even mid-frame) do not change the output"""
+        audio = sine(300, 44100, channels=2)
+        whole = PCMConverter("linear16", 44100, 2).convert(audio)
+
+        converter = PCMConverter("linear16", 44100, 2)
+        cuts = [0, 7, 1000, 1003, 50001, 120000, len(audio)]
+        pieces = b"".join(converter.convert(audio[start:end]) for start, end in zip(cuts, cuts[1:]))
+
+        assert len(pieces) == len(whole)
+        difference = np.abs(
+            np.frombuffer(pieces, dtype="<i2").astype(np.int32) - np.frombuffer(whole, dtype="<i2")
+        )
+        assert difference.max() <= 2
+
+    @pytest.mark.parametrize("sample_rate,frequency", [(48000, 9000), (48000, 12000), (24000, 10000), (22050, 9000)])
+    def test_tones_above_8k_are_filtered_out(self, sample_rate, frequency):
+        """Test that content the 16 kHz output cannot represent is removed instead of folding back"""
+        output = PCMConverter("linear16", sample_rate, 1).convert(sine(frequency, sample_rate))
+
+        # Skip the filter's start-up transient
+        samples = np.frombuffer(output, dtype="<i2").astype(np.float64)[2000:] / 32767
+        assert np.sqrt(np.mean(samples ** 2)) < 0.01 * 0.5 / np.sqrt(2)
+
+    def test_speech_band_is_kept(self):
+        """Test that a tone well inside the speech band passes the anti-alias filter"""
+        output = PCMConverter("linear16", 48000, 1).convert(sine(1000, 48000))
+
+        samples = np.frombuffer(output, dtype="<i2").astype(np.float64)[2000:] / 32767
+        assert np.sqrt(np.mean(samples ** 2)) == pytest.approx(0.5 / np.sqrt(2), rel=0.02)
+
+    def test_float32_input(self):
+        """Test that float32 PCM is scaled to linear16"""
+        converter = PCMConverter("float32", 16000, 1)
+        output = converter.convert(np.array([0.0, 0.5, -1.0, 1.0], dtype="<f4").tobytes())
+
+        assert np.frombuffer(output, dtype="<i2").tolist() == [0, 16384, -32768, 32767]
+
+
+class TestNegotiateFormat:
+    """Test cases for negotiate_format"""
+
+    def test_pcm_is_normalized_upstream(self):
+        """Test that raw PCM is announced upstream as 16 kHz mono linear16"""
+        plan = negotiate_format("linear16", 48000, 2)
+
+        assert isinstance(plan["converter"], PCMConverter)
+        assert plan["upstream"] == {"encoding": "linear16", "sample_rate": 16000, "channels": 1}
+
+    def test_compressed_audio_is_forwarded(self):
+        """Test that compressed encodings skip conversion and keep their format"""
+        plan = negotiate_format("opus", 48000, 1)
+
+        assert plan["converter"] is None
+        assert plan["upstream"] == {"encoding": "opus", "sample_rate": 48000, "channels": 1}
+
+    def test_unknown_encoding_is_rejected(self):
+        """Test that unsupported encodings raise AudioFormatError"""
+        with pytest.raises(AudioFormatError):
+            negotiate_format("mp3-ish", 44100, 1)
+
+    @pytest.mark.parametrize("encoding, sample_rate, channels", [
+        ("linear16", 1, 1),
+        ("linear16", 10 ** 9, 1),
+        ("linear16", 0, 1),
+        ("linear16", 16000, 0),
+        ("linear16", 16000, 64),
+        ("opus", 1, 1)
+    ])
+    def test_out_of_range_formats_are_rejected(self, encoding, sample_rate, channels):
+        """Test that sample rates outside 8-192 kHz and channel counts outside 1-8 are refused"""
+        with pytest.raises(AudioFormatError):
+            negotiate_format(encoding, sample_rate, channels)
+
+
+class AudioWebSocket:
+    """Sends queued binary audio to the endpoint and records its replies"""
+
+    application_state = WebSocketState.CONNECTED
+
+    def __init__(self, chunks, query_params):
+        self.chunks = list(chunks)
+        self.query_params = query_params
+        self.sent = []
+        self.closed = None
+
+    async def accept(self):
+        pass
+
+    async def receive_bytes(self):
+        if self.chunks:
+            return self.chunks.pop(0)
+        raise WebSocketDisconnect()
+
+    async def send_json(self, data):
+        self.sent.append(data)
+
+    async def close(self, code=1000, reason=None):
+        self.closed = (code, reason)
+
+
+class RecordingLiveService:
+    """Live transcription stand-in that records what would go upstream"""
+
+    def __init__(self):
+        self.audio = b""
+        self.options = None
+        self.relay = None
+
+    async def transcribe_live_audio_stream(self, audio_stream_generator, relay=None, telemetry=None, **options):
+        self.options = options
+        self.relay = relay
+        async for chunk in audio_stream_generator:
+            self.audio += chunk
+        if False:
+            yield {}
+
+
+class TestLiveTranscribeFormat:
+    """Test cases for format negotiation on /ws/live-transcribe"""
+
+    @pytest.mark.asyncio
+    async def test_browser_audio_is_reduced_before_upstream(self, monkeypatch):
+        """Test that 48 kHz stereo is forwarded as 16 kHz mono"""
+        service = RecordingLiveService()
+        monkeypatch.setattr(deepgram_api, "deepgram_service", service)
+        audio = sine(440, 48000, channels=2)
+        chunks = [audio[i:i + 4096] for i in range(0, len(audio), 4096)]
+        websocket = AudioWebSocket(chunks, {"language": "en", "sample_rate": "48000", "channels": "2"})
+
+        await deepgram_api.websocket_live_transcribe(websocket)
+
+        assert service.options == {"language": "en", "encoding": "linear16", "sample_rate": 16000, "channels": 1}
+        assert len(service.audio) * 5 < len(audio)
+
+    @pytest.mark.asyncio
+    async def test_bad_format_closes_the_socket(self, monkeypatch):
+        """Test that an unsupported format is refused before streaming starts"""
+        service = RecordingLiveService()
+        monkeypatch.setattr(deepgram_api, "deepgram_service", service)
+        websocket = AudioWebSocket([b"\x00\x00"], {"encoding": "wma"})
+
+        await deepgram_api.websocket_live_transcribe(websocket)
+
+        assert websocket.closed[0] == 1003
+        assert service.options is None
+
+    @pytest.mark.asyncio
+    async def test_absurd_sample_rate_closes_the_socket(self, monkeypatch):
+        """Test that a client-declared 1 Hz stream is refused before any resampling"""
+        service = RecordingLiveService()
+        monkeypatch.setattr(deepgram_api, "deepgram_service", service)
+        websocket = AudioWebSocket([b"\x00" * 4096], {"sample_rate": "1"})
+
+        await deepgram_api.websocket_live_transcribe(websocket)
+
+        assert websocket.closed[0] == 1003
+        assert service.options is None
@@ -0,0 +1,111 @@
+import pytest
+
+import app.api.v1.deepgram as deepgram_api
+from app.services.session_language import SessionLanguage
+from tests.unit.test_pcm import AudioWebSocket
+
+
+class ScriptedDetector:
+    """Returns queued detections and counts calls"""
+
+    def __init__(self, languages):
+        self.languages = list(languages)
+        self.calls = []
+
+    async def __call__(self, text):
+        self.calls.append(text)
+        return {"detected_language": self.languages.pop(0), "confidence": 0.9}
+
+
+SENTENCE = "this is a long enough final segment"
+
+
+class TestSessionLanguage:
+    """Test cases for SessionLanguage"""
+
+    @pytest.mark.asyncio
+    async def test_interims_reuse_session_language(self):
+        """Test that only finals are detected and interims get the current language"""
+        detector = ScriptedDetector(["es"])
+        session = SessionLanguage(detector, switch_after=2, min_chars=5)
+
+        assert await session.observe("hola a todos", is_final=False) == (None, None)
+        assert await session.observe(SENTENCE, is_final=True) == ("es", 0.9)
+        assert await session.observe("y otra cosa", is_final=False) == ("es", 0.9)
+        assert len(detector.calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_single_disagreement_does_not_switch(self):
+        """Test hysteresis: one outlier final keeps the sticky language"""
+        detector = ScriptedDetector(["en", "fr", "en"])
+        session = SessionLanguage(detector, switch_after=2, min_chars=5)
+
+        languages = [(await session.observe(SENTENCE, is_final=True))[0] for _ in range(3)]
+
+        assert languages == ["en", "en", "en"]
+        assert session.stats["switches"] == 0
+
+    @pytest.mark.asyncio
+    async def test_consecutive_disagreements_switch(self):
+        """Test that N consecutive finals in another language switch the session"""
+        detector = ScriptedDetector(["en", "de", "de"])
+        session = SessionLanguage(detector, switch_after=2, min_chars=5)
+
+        languages = [(await session.observe(SENTENCE, is_final=True))[0] for _ in range(3)]
+
+        assert languages == ["en", "en", "de"]
+        assert session.stats["switches"] == 1
+
+    @pytest.mark.asyncio
+    async def test_short_finals_and_failures_are_skipped(self):
+        """Test that short finals are not detected and detection errors keep the language"""
+        async def failing(text):
+            raise RuntimeError("detector down")
+
+        session = SessionLanguage(failing, switch_after=2, min_chars=20)
+
+        assert await session.observe("ok", is_final=True) == (None, None)
+        assert await session.observe(SENTENCE, is_final=True) == (None, None)
+        assert session.stats["detections"] == 0
+
+
+class ResultsLiveService:
+    """Live transcription stand-in that yields scripted Deepgram results"""
+
+    def __init__(self, results):
+        self.results = results
+
+    async def transcribe_live_audio_stream(self, audio_stream_generator, **options):
+        for result in self.results:
+            yield result
+
+
+def result(transcript, is_final):
+    return {"is_final": is_final, "channel": {"alternatives": [{"transcript": transcript}]}}
+
+
+class TestLiveTranscribeLanguage:
+    """Test cases for session language on /ws/live-transcribe"""
+
+    @pytest.mark.asyncio
+    async def test_detection_runs_on_finals_only(self, monkeypatch):
+        """Test that partials are not detected and the payload shape is unchanged"""
+        detector = ScriptedDetector(["es"])
+
+        class Engine:
+            detect_language = staticmethod(detector)
+
+        monkeypatch.setattr(deepgram_api, "translation_engine", Engine())
+        monkeypatch.setattr(deepgram_api, "deepgram_service", ResultsLiveService([
+            result("hola", False),
+            result("hola a todos", False),
+            result("hola a todos y bienvenidos", True),
+            result("gracias", False),
+        ]))
+        websocket = AudioWebSocket([], {"sample_rate": "16000"})
+
+        await deepgram_api.websocket_live_transcribe(websocket)
+
+        assert len(detector.calls) == 1
+        assert [message["detected_language"] for message in websocket.sent] == [None, None, "es", "es"]
+        assert set(websocket.sent[-1]) == {"result", "detected_language", "detection_confidence"}
@@ -0,0 +1,142 @@
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from app.api.v1 import translation as translation_api
+from app.api.v1.translation import LongTranslationRequest
+from app.config.settings import settings
+from app.services.streaming_translation import StreamingTranslationSession
+from app.services.translation_cache import TranslationCache
+from app.services.translation_engine import AsyncTranslationEngine, TranslationBackend
+from app.utils.text_segmentation import chunk_sentences, split_segments
+
+
+class RecordingBackend(TranslationBackend):
+    def __init__(self):
+        self.contents = []
+
+    async def translate_batch(self, contents, source_language, target_language):
+        self.contents.extend(contents)
+        return [text.upper() for text in contents]
+
+
+class TestStreamingTranslation:
+    """Test cases for incremental prefix-stable translation"""
+
+    def test_segments_round_trip(self):
+        """Test that segmentation keeps every character of the input"""
+        for text in ["Hello there. How are you? I am fine, thanks", "你好。我很好，谢谢", "no punctuation"]:
+            assert "".join(split_segments(text)) == text
+
+    @pytest.mark.asyncio
+    async def test_only_the_tail_is_retranslated(self):
+        """Test that settled segments are translated once and reused"""
+        backend = RecordingBackend()
+        engine = AsyncTranslationEngine(backend, cache=TranslationCache(use_redis=False))
+        partials = [
+            "Thanks for joining.",
+            "Thanks for joining. Today we",
+            "Thanks for joining. Today we cover the roadmap,",
+            "Thanks for joining. Today we cover the roadmap, then questions",
+        ]
+
+        results = [await engine.translate_incremental("s1", text, "en", "de") for text in partials]
+
+        assert results[-1]["translated_text"] == "THANKS FOR JOINING. TODAY WE COVER THE ROADMAP, THEN QUESTIONS"
+        assert backend.contents.count("Thanks for joining.") == 2
+        assert backend.contents.count("Today we cover the roadmap,") == 2
+        assert backend.contents[-1] == "then questions"
+        assert len(backend.contents) == 6
+
+    @pytest.mark.asyncio
+    async def test_same_language_partials_are_passed_through_unpunctuated(self):
+        """Test that a partial in the target language is returned as-is, without an added full stop"""
+        backend = RecordingBackend()
+        engine = AsyncTranslationEngine(backend, cache=TranslationCache(use_redis=False))
+
+        result = await engine.translate_incremental("s1", "thanks for joining today we", "en", "en")
+
+        assert result["translated_text"] == "thanks for joining today we"
+        assert backend.contents == []
+
+    @pytest.mark.asyncio
+    async def test_cache_is_bounded_and_evicted_on_end(self):
+        """Test the per-session segment cache limit and eviction when the session ends"""
+        backend = RecordingBackend()
+        session = StreamingTranslationSession(backend.translate_batch, max_segments=2)
+
+        await session.translate("a, b, c, d", "en", "fr")
+
+        assert len(session._segments) == 2
+
+        engine = AsyncTranslationEngine(backend, cache=TranslationCache(use_redis=False))
+        await engine.translate_incremental("s1", "one. two", "en", "fr")
+        engine.end_stream("s1")
+
+        assert "s1" not in engine._streams
+
+
+class TestLongTextTranslation:
+    """Test cases for sentence-chunked parallel translation"""
+
+    @pytest.mark.asyncio
+    async def test_chunks_are_capped_and_reassembled_in_order(self):
+        """Test that long text is split under the cap and rebuilt in the original order"""
+        backend = RecordingBackend()
+        engine = AsyncTranslationEngine(backend, cache=TranslationCache(use_redis=False))
+        text = " ".join(f"Sentence number {i} is here." for i in range(20)) + "\n\nLast paragraph."
+
+        result = await engine.translate_long_text(text, "en", "de", max_chunk_chars=60)
+
+        assert all(len(chunk) <= 60 for chunk in backend.contents)
+        assert len(backend.contents) > 1
+        assert result["translated_text"] == text.upper()
+
+    @pytest.mark.asyncio
+    async def test_streamed_chunks_carry_their_index(self):
+        """Test that streaming yields every chunk once with its index"""
+        backend = RecordingBackend()
+        engine = AsyncTranslationEngine(backend, cache=TranslationCache(use_redis=False))
+        text = "One. Two. Three. Four."
+
+        chunks = [chunk async for chunk in engine.iter_translate_long_text(text, "en", "fr", max_chunk_chars=6)]
+
+        assert sorted(index for index, _, _ in chunks) == [0, 1, 2, 3]
+        assert "".join(translated for _, _, translated in sorted(chunks)) == text.upper()
+
+    @pytest.mark.asyncio
+    async def test_same_language_stream_matches_non_stream(self, monkeypatch):
+        """Test that /translate-long punctuates same-language text the same way with and without streaming"""
+        engine = AsyncTranslationEngine(RecordingBackend(), cache=TranslationCache(use_redis=False))
+        monkeypatch.setattr(translation_api, "translation_engine", engine)
+        text = "we shipped the release   yesterday\nthe dashboard is ready"
+
+        plain = await translation_api.translate_long_text(
+            LongTranslationRequest(text=text, source_language="en", target_language="en")
+        )
+        response = await translation_api.translate_long_text(
+            LongTranslationRequest(text=text, source_language="en", target_language="en", stream=True)
+        )
+        lines = [json.loads(line) async for line in response.body_iterator]
+
+        assert lines[-1] == {"done": True, "chunks": 1}
+        assert lines[0]["translated_text"] == plain.translated_text
+        assert plain.translated_text != text
+
+    def test_non_positive_chunk_size_is_rejected(self):
+        """Test that a chunk cap below one character raises instead of looping"""
+        with pytest.raises(ValueError):
+            chunk_sentences("Hello world. Bye.", -1)
+        with pytest.raises(ValueError):
+            chunk_sentences("Hello world. Bye.", 0)
+
+    def test_request_chunk_size_is_bounded(self):
+        """Test that /translate-long only accepts chunk caps within the configured range"""
+        with pytest.raises(ValidationError):
+            LongTranslationRequest(text="Hi.", max_chunk_chars=-1)
+        with pytest.raises(ValidationError):
+            LongTranslationRequest(text="Hi.", max_chunk_chars=1)
+        with pytest.raises(ValidationError):
+            LongTranslationRequest(text="Hi.", max_chunk_chars=settings.translation_max_chunk_chars + 1)
+        assert LongTranslationRequest(text="Hi.", max_chunk_chars=500).max_chunk_chars == 500
@@ -0,0 +1,159 @@
+import io
+import os
+import time
+
+import pytest
+
+import app.services.transcription_cache as cache_module
+from app.services.transcription_cache import DiskResultStore, TranscriptionCache, hash_audio
+from tests.unit.test_deepgram import make_response, make_service
+from tests.unit.test_translation_cache import FakeRedis
+
+
+def cached_service(tmp_path, monkeypatch, redis=None, **options):
+    monkeypatch.setattr(cache_module, "get_redis_client", lambda: redis or FakeRedis(fail=True))
+    service = make_service(make_response())
+    service.result_cache = TranscriptionCache(
+        enabled=True, use_redis=redis is not None, cache_dir=str(tmp_path), **options
+    )
+    return service
+
+
+class TestDiskResultStore:
+    """Test cases for DiskResultStore"""
+
+    def test_least_recently_used_results_are_evicted(self, tmp_path):
+        """Test that the store stays under its byte budget by dropping the least recently read file"""
+        store = DiskResultStore(str(tmp_path), max_bytes=250, ttl_seconds=60)
+        store.set("a", "x" * 100)
+        store.set("b", "y" * 100)
+        # Make "a" the most recently used entry
+        past = time.time() - 10
+        for name in os.listdir(tmp_path):
+            os.utime(tmp_path / name, (past, past))
+        assert store.get("a") == "x" * 100
+
+        store.set("c", "z" * 100)
+
+        assert store.get("a") is not None
+        assert store.get("b") is None
+        assert store.get("c") is not None
+        assert store.evictions == 1
+
+    def test_expired_results_are_dropped(self, tmp_path):
+        """Test that entries older than the TTL are treated as missing"""
+        store = DiskResultStore(str(tmp_path), max_bytes=1000, ttl_seconds=60)
+        store.set("a", "{}")
+        old = time.time() - 120
+        for name in os.listdir(tmp_path):
+            os.utime(tmp_path / name, (old, old))
+
+        assert store.get("a") is None
+        assert os.listdir(tmp_path) == []
+
+    def test_directory_is_private_to_the_user(self, tmp_path):
+        """Test that a new cache directory is created 0o700 and a loose one tightened"""
+        created = DiskResultStore(str(tmp_path / "new"), max_bytes=1000, ttl_seconds=60)
+        created.set("a", "{}")
+        loose = tmp_path / "loose"
+        loose.mkdir(mode=0o777)
+        os.chmod(loose, 0o777)
+        DiskResultStore(str(loose), max_bytes=1000, ttl_seconds=60).set("a", "{}")
+
+        assert os.stat(tmp_path / "new").st_mode & 0o777 == 0o700
+        assert os.stat(loose).st_mode & 0o777 == 0o700
+
+    def test_foreign_directory_is_refused(self, tmp_path, monkeypatch):
+        """Test that a directory owned by another user, or a symlink, is never read from"""
+        link = tmp_path / "link"
+        link.symlink_to(tmp_path)
+        with pytest.raises(PermissionError):
+            DiskResultStore(str(link), max_bytes=1000, ttl_seconds=60).get("a")
+
+        monkeypatch.setattr(os, "getuid", lambda: os.stat(tmp_path).st_uid + 1)
+        with pytest.raises(PermissionError):
+            DiskResultStore(str(tmp_path), max_bytes=1000, ttl_seconds=60).get("a")
+
+    def test_default_directory_is_per_user(self):
+        """Test that the default cache directory name includes the user id"""
+        cache = TranscriptionCache(enabled=True, use_redis=False)
+
+        assert cache.disk.directory.endswith(f"verbaflow-transcription-cache-{os.getuid()}")
+
+
+class TestTranscriptionCache:
+    """Test cases for the prerecorded transcription result cache"""
+
+    def test_hash_rewinds_the_stream(self):
+        """Test that hashing leaves the audio ready to upload"""
+        audio = io.BytesIO(b"audio bytes")
+
+        digest = hash_audio(audio)
+
+        assert len(digest) == 64
+        assert audio.read() == b"audio bytes"
+
+    @pytest.mark.asyncio
+    async def test_resubmission_skips_upstream(self, tmp_path, monkeypatch):
+        """Test that identical audio and options are answered from the cache"""
+        service = cached_service(tmp_path, monkeypatch)
+
+        first = await service.transcribe_audio_data(b"audio", "es", detect_language=True)
+        second = await service.transcribe_audio_data(io.BytesIO(b"audio"), "es", detect_language=True)
+
+        assert len(service._prerecorded.calls) == 1
+        assert second == first
+        assert service.result_cache.get_stats()["disk_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_options_are_part_of_the_key(self, tmp_path, monkeypatch):
+        """Test that the same audio with other options goes upstream again"""
+        service = cached_service(tmp_path, monkeypatch)
+
+        await service.transcribe_audio_data(b"audio", "es")
+        await service.transcribe_audio_data(b"audio", "fr")
+        await service.transcribe_audio_data(b"other audio", "es")
+
+        assert len(service._prerecorded.calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_failures_are_not_cached(self, tmp_path, monkeypatch):
+        """Test that an error result is retried on resubmission"""
+        service = cached_service(tmp_path, monkeypatch)
+        service._prerecorded.response = {"metadata": {}, "results": None}
+
+        await service.transcribe_audio_data(b"audio", "en")
+        await service.transcribe_audio_data(b"audio", "en")
+
+        assert len(service._prerecorded.calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_small_results_go_to_redis_and_large_to_disk(self, tmp_path, monkeypatch):
+        """Test that results are tiered by serialized size"""
+        redis = FakeRedis()
+        service = cached_service(tmp_path, monkeypatch, redis=redis, redis_max_bytes=1000)
+
+        await service.transcribe_audio_data(b"short", "en")
+        service._prerecorded.response = make_response(transcript="long " * 500)
+        await service.transcribe_audio_data(b"long", "en")
+
+        assert len(redis.data) == 1
+        assert len([name for name in os.listdir(tmp_path) if name.endswith(".json")]) == 1
+
+        await service.transcribe_audio_data(b"short", "en")
+        await service.transcribe_audio_data(b"long", "en")
+        stats = service.result_cache.get_stats()
+        assert stats["redis_hits"] == 1 and stats["disk_hits"] == 1
+        assert len(service._prerecorded.calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_redis_outage_falls_back_to_disk(self, tmp_path, monkeypatch):
+        """Test that Redis errors do not fail transcription and results still get cached"""
+        service = cached_service(tmp_path, monkeypatch, redis=FakeRedis(fail=True))
+
+        await service.transcribe_audio_data(b"audio", "en")
+        result = await service.transcribe_audio_data(b"audio", "en")
+
+        assert result["success"]
+        assert len(service._prerecorded.calls) == 1
+        assert service.result_cache.get_stats()["redis_errors"] == 1
@@ -0,0 +1,374 @@
+import asyncio
+import io
+import json
+import os
+
+import pytest
+from fastapi import HTTPException
+
+import app.services.transcription_jobs as jobs_module
+from app.api.v1 import deepgram as deepgram_api
+from app.services.transcription_jobs import (
+    DELAYED_KEY,
+    JOB_KEY_PREFIX,
+    PROCESSING_KEY,
+    QUEUE_KEY,
+    TranscriptionJobQueue
+)
+from tests.unit.test_audio_io import RecordingDeepgram, make_request
+
+
+class FakeQueueRedis:
+    """Async stand-in for the Redis commands the job store uses"""
+
+    def __init__(self, fail: bool = False):
+        self.data = {}
+        self.lists = {}
+        self.sorted_sets = {}
+        self.fail = fail
+
+    async def ping(self):
+        if self.fail:
+            raise ConnectionError("redis down")
+        return True
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    async def delete(self, *keys):
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    async def exists(self, *keys):
+        return sum(key in self.data for key in keys)
+
+    async def lpush(self, key, value):
+        self.lists.setdefault(key, []).insert(0, value.encode())
+
+    async def rpush(self, key, value):
+        self.lists.setdefault(key, []).append(value.encode())
+
+    async def lrange(self, key, start, end):
+        return list(self.lists.get(key, []))
+
+    async def lrem(self, key, count, value):
+        items = self.lists.get(key, [])
+        matches = [item for item in items if item == value.encode()]
+        matches = matches[:count] if count else matches
+        for item in matches:
+            items.remove(item)
+        return len(matches)
+
+    async def blmove(self, source, destination, timeout, src="LEFT", dest="RIGHT"):
+        items = self.lists.get(source)
+        if not items:
+            await asyncio.sleep(0.01)
+            return None
+        item = items.pop() if src == "RIGHT" else items.pop(0)
+        target = self.lists.setdefault(destination, [])
+        target.insert(0, item) if dest == "LEFT" else target.append(item)
+        return item
+
+    async def zadd(self, key, mapping):
+        self.sorted_sets.setdefault(key, {}).update(mapping)
+
+    async def zrangebyscore(self, key, low, high):
+        members = self.sorted_sets.get(key, {})
+        return sorted((member.encode() for member, score in members.items() if score <= high))
+
+    async def zrem(self, key, member):
+        return int(self.sorted_sets.get(key, {}).pop(_text(member), None) is not None)
+
+
+def _text(value):
+    return value.decode() if isinstance(value, bytes) else value
+
+
+class FlakyProvider:
+    """Transcription provider that fails a set number of times before succeeding"""
+
+    def __init__(self, failures=0, delay=0.0):
+        self.failures = failures
+        self.delay = delay
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+
+    async def __call__(self, audio, language="en", detect_language=False):
+        self.calls.append((audio.read(), language, detect_language))
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        if len(self.calls) <= self.failures:
+            return {"success": False, "error": "upstream unavailable"}
+        return {"success": True, "transcript": "hello", "words": []}
+
+
+def make_queue(tmp_path, monkeypatch, provider, redis=None, **options):
+    redis = redis or FakeQueueRedis(fail=True)
+    monkeypatch.setattr(jobs_module, "get_redis_client", lambda: redis)
+    options.setdefault("backoff_seconds", 0.0)
+    return TranscriptionJobQueue({"deepgram": provider}, spool_dir=str(tmp_path), **options)
+
+
+async def wait_for_finish(queue, job_id):
+    updates = [job async for job in queue.watch(job_id, poll_interval=0.05)]
+    return updates[-1]
+
+
+class TestTranscriptionJobQueue:
+    """Test cases for TranscriptionJobQueue"""
+
+    @pytest.mark.asyncio
+    async def test_job_completes_on_in_memory_fallback(self, tmp_path, monkeypatch):
+        """Test that an unreachable Redis falls back to memory and the job still runs"""
+        provider = FlakyProvider()
+        queue = make_queue(tmp_path, monkeypatch, provider, workers=2)
+        await queue.start()
+        try:
+            job = await queue.submit(io.BytesIO(b"RIFFdata"), "fr", detect_language=True)
+            assert job["status"] == "queued"
+
+            finished = await wait_for_finish(queue, job["id"])
+        finally:
+            await queue.shutdown()
+
+        assert queue.store.name == "memory"
+        assert finished["status"] == "completed"
+        assert finished["progress"] == 1.0
+        assert finished["result"]["transcript"] == "hello"
+        assert provider.calls == [(b"RIFFdata", "fr", True)]
+        assert os.listdir(tmp_path) == []
+
+    @pytest.mark.asyncio
+    async def test_failed_attempts_are_retried(self, tmp_path, monkeypatch):
+        """Test that a failure is retried and the job completes on a later attempt"""
+        provider = FlakyProvider(failures=1)
+        queue = make_queue(tmp_path, monkeypatch, provider, workers=1, max_attempts=3, backoff_seconds=0.2)
+        await queue.start()
+        try:
+            job = await queue.submit(io.BytesIO(b"audio"))
+            updates = [update["status"] async for update in queue.watch(job["id"], poll_interval=0.05)]
+            finished = await queue.get(job["id"])
+        finally:
+            await queue.shutdown()
+
+        assert "retrying" in updates
+        assert finished["status"] == "completed"
+        assert finished["attempts"] == 2
+        assert queue.get_stats()["retries"] == 1
+
+    @pytest.mark.asyncio
+    async def test_job_fails_after_max_attempts(self, tmp_path, monkeypatch):
+        """Test that the job is marked failed once its attempts run out"""
+        provider = FlakyProvider(failures=10)
+        queue = make_queue(tmp_path, monkeypatch, provider, workers=1, max_attempts=2)
+        await queue.start()
+        try:
+            job = await queue.submit(io.BytesIO(b"audio"))
+            finished = await wait_for_finish(queue, job["id"])
+        finally:
+            await queue.shutdown()
+
+        assert finished["status"] == "failed"
+        assert finished["error"] == "upstream unavailable"
+        assert len(provider.calls) == 2
+        assert os.listdir(tmp_path) == []
+
+    @pytest.mark.asyncio
+    async def test_provider_limit_caps_concurrency(self, tmp_path, monkeypatch):
+        """Test that the per-provider limit applies even with more workers"""
+        provider = FlakyProvider(delay=0.02)
+        queue = make_queue(tmp_path, monkeypatch, provider, workers=4, provider_limits={"deepgram": 2})
+        await queue.start()
+        try:
+            submitted = [await queue.submit(io.BytesIO(b"audio")) for _ in range(6)]
+            for job in submitted:
+                await wait_for_finish(queue, job["id"])
+        finally:
+            await queue.shutdown()
+
+        assert len(provider.calls) == 6
+        assert provider.max_active == 2
+
+    @pytest.mark.asyncio
+    async def test_finished_results_expire(self, tmp_path, monkeypatch):
+        """Test that finished jobs are dropped after the result TTL"""
+        queue = make_queue(tmp_path, monkeypatch, FlakyProvider(), result_ttl_seconds=0.05)
+        await queue.start()
+        try:
+            job = await queue.submit(io.BytesIO(b"audio"))
+            await wait_for_finish(queue, job["id"])
+            await asyncio.sleep(0.1)
+
+            assert await queue.get(job["id"]) is None
+        finally:
+            await queue.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_unpolled_results_are_purged(self, tmp_path, monkeypatch):
+        """Test that the in-memory store drops expired results nobody fetched"""
+        queue = make_queue(tmp_path, monkeypatch, FlakyProvider(), result_ttl_seconds=0.05)
+        await queue.start()
+        try:
+            job = await queue.submit(io.BytesIO(b"audio"))
+            await wait_for_finish(queue, job["id"])
+            assert job["id"] in queue.store._jobs
+
+            await asyncio.sleep(jobs_module.SCHEDULE_INTERVAL * 2)
+
+            assert job["id"] not in queue.store._jobs
+        finally:
+            await queue.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_redis_store_is_used_when_reachable(self, tmp_path, monkeypatch):
+        """Test that job records and the queue live in Redis when it answers"""
+        redis = FakeQueueRedis()
+        queue = make_queue(tmp_path, monkeypatch, FlakyProvider(), redis=redis, workers=1)
+        await queue.start()
+        try:
+            job = await queue.submit(io.BytesIO(b"audio"))
+            finished = await wait_for_finish(queue, job["id"])
+        finally:
+            await queue.shutdown()
+
+        assert queue.store.name == "redis"
+        assert finished["status"] == "completed"
+        assert json.loads(redis.data[JOB_KEY_PREFIX + job["id"]])["status"] == "completed"
+
+    @pytest.mark.asyncio
+    async def test_pending_retry_survives_a_restart(self, tmp_path, monkeypatch):
+        """Test that a retry waiting out its backoff is kept in Redis and run after a restart"""
+        redis = FakeQueueRedis()
+        queue = make_queue(tmp_path, monkeypatch, FlakyProvider(failures=1), redis=redis, workers=1, backoff_seconds=0.3)
+        await queue.start()
+        job = await queue.submit(io.BytesIO(b"audio"))
+        async for update in queue.watch(job["id"], poll_interval=0.05):
+            if update["status"] == "retrying":
+                break
+        await queue.shutdown()
+
+        assert job["id"] in redis.sorted_sets[DELAYED_KEY]
+        assert redis.lists[PROCESSING_KEY] == []
+
+        restarted = make_queue(tmp_path, monkeypatch, FlakyProvider(), redis=redis, workers=1)
+        await restarted.start()
+        try:
+            finished = await wait_for_finish(restarted, job["id"])
+        finally:
+            await restarted.shutdown()
+
+        assert finished["status"] == "completed"
+        assert finished["attempts"] == 2
+
+    @pytest.mark.asyncio
+    async def test_job_in_progress_is_requeued_on_shutdown(self, tmp_path, monkeypatch):
+        """Test that stopping mid-transcription puts the job back without spending an attempt"""
+        redis = FakeQueueRedis()
+        slow = FlakyProvider(delay=10)
+        queue = make_queue(tmp_path, monkeypatch, slow, redis=redis, workers=1)
+        await queue.start()
+        job = await queue.submit(io.BytesIO(b"audio"))
+        while not slow.calls:
+            await asyncio.sleep(0.01)
+        await queue.shutdown()
+
+        assert redis.lists[QUEUE_KEY] == [job["id"].encode()]
+        assert (await queue.get(job["id"]))["status"] == "queued"
+
+        restarted = make_queue(tmp_path, monkeypatch, FlakyProvider(), redis=redis, workers=1)
+        await restarted.start()
+        try:
+            finished = await wait_for_finish(restarted, job["id"])
+        finally:
+            await restarted.shutdown()
+
+        assert finished["status"] == "completed"
+        assert finished["attempts"] == 1
+
+    @pytest.mark.asyncio
+    async def test_job_abandoned_by_a_dead_process_is_recovered(self, tmp_path, monkeypatch):
+        """Test that start() requeues processing jobs whose lease has lapsed"""
+        redis = FakeQueueRedis()
+        crashed = make_queue(tmp_path, monkeypatch, FlakyProvider(), redis=redis)
+        crashed.store = jobs_module.RedisJobStore()
+        job = await crashed.submit(io.BytesIO(b"audio"))
+        # The process died right after taking the job: it sits in the processing list with no lease
+        assert await crashed.store.dequeue(timeout=1) == job["id"]
+
+        queue = make_queue(tmp_path, monkeypatch, FlakyProvider(), redis=redis, workers=1)
+        await queue.start()
+        try:
+            finished = await wait_for_finish(queue, job["id"])
+        finally:
+            await queue.shutdown()
+
+        assert finished["status"] == "completed"
+        assert queue.get_stats()["recovered"] == 1
+        assert redis.lists[PROCESSING_KEY] == []
+
+    @pytest.mark.asyncio
+    async def test_spool_directory_must_belong_to_the_user(self, tmp_path, monkeypatch):
+        """Test that start() creates a private spool and refuses one owned by someone else"""
+        queue = make_queue(tmp_path / "spool", monkeypatch, FlakyProvider())
+        await queue.start()
+        await queue.shutdown()
+        assert os.stat(tmp_path / "spool").st_mode & 0o777 == 0o700
+
+        monkeypatch.setattr(os, "getuid", lambda: os.stat(tmp_path).st_uid + 1)
+        with pytest.raises(PermissionError):
+            await make_queue(tmp_path / "spool", monkeypatch, FlakyProvider()).start()
+
+    @pytest.mark.asyncio
+    async def test_unknown_provider_is_rejected(self, tmp_path, monkeypatch):
+        """Test that submitting to an unconfigured provider raises ValueError"""
+        queue = make_queue(tmp_path, monkeypatch, FlakyProvider())
+
+        with pytest.raises(ValueError):
+            await queue.submit(io.BytesIO(b"audio"), provider="whisper")
+
+
+class TestTranscriptionJobEndpoints:
+    """Test cases for the /transcribe-jobs endpoints"""
+
+    @pytest.mark.asyncio
+    async def test_submit_returns_job_and_result_is_fetchable(self, tmp_path, monkeypatch):
+        """Test that a raw body is queued and its result served by job id"""
+        service = RecordingDeepgram()
+        queue = make_queue(tmp_path, monkeypatch, service.transcribe_audio_data, workers=1)
+        monkeypatch.setattr(deepgram_api, "transcription_jobs", queue)
+        await queue.start()
+        try:
+            request = make_request([b"RIFF", b"data"], query_string=b"language=de&auto_detect=false")
+            submitted = await deepgram_api.submit_transcription_job(
+                request, language="de", auto_detect=False, long_audio=False
+            )
+            await wait_for_finish(queue, submitted["job_id"])
+
+            job = await deepgram_api.get_transcription_job(submitted["job_id"])
+        finally:
+            await queue.shutdown()
+
+        assert submitted["status"] == "queued"
+        assert job["status"] == "completed"
+        assert service.calls == [(b"RIFFdata", "de", False)]
+
+    @pytest.mark.asyncio
+    async def test_unknown_job_is_404(self, tmp_path, monkeypatch):
+        """Test that unknown or expired job ids return 404"""
+        queue = make_queue(tmp_path, monkeypatch, FlakyProvider())
+        monkeypatch.setattr(deepgram_api, "transcription_jobs", queue)
+        await queue.start()
+        try:
+            with pytest.raises(HTTPException) as error:
+                await deepgram_api.get_transcription_job("missing")
+        finally:
+            await queue.shutdown()
+
+        assert error.value.status_code == 404
@@ -66,4 +66,57 @@ class TestTranslationService:
         
         assert result["original_text"] == "   "
         assert result["translated_text"] == ""
-        assert result["confidence"] == 0.0 
\ No newline at end of file
+        assert result["confidence"] == 0.0 
+    def test_upstream_calls_carry_the_deadline(self):
+        """Test that the gRPC calls get the translation timeout, so hung calls release their thread"""
+        from types import SimpleNamespace
+
+        from app.config.settings import settings
+
+        class RecordingClient:
+            def __init__(self):
+                self.timeouts = []
+
+            def translate_text(self, request, timeout=None):
+                self.timeouts.append(timeout)
+                return SimpleNamespace(translations=[SimpleNamespace(translated_text="hola")])
+
+            def detect_language(self, request, timeout=None):
+                self.timeouts.append(timeout)
+                return SimpleNamespace(languages=[SimpleNamespace(language_code="en", confidence=0.99)])
+
+        self.service.client = RecordingClient()
+        self.service.project_id = "test-project"
+
+        assert self.service.translate_batch(["hello"], "en", "es") == ["hola"]
+        self.service.detect_language("hello")
+
+        assert self.service.client.timeouts == [settings.translation_timeout_seconds] * 2
+
+
+class TestPunctuationProcessing:
+    """Test cases for translated-text punctuation post-processing"""
+
+    def test_question_takes_precedence_over_exclamation(self):
+        """Test that a question word wins even when an exclamation phrase comes first"""
+        from app.services.translation import process_translated_text
+
+        assert process_translated_text("thank you, can we start") == "Thank you, can we start?"
+        assert process_translated_text("thanks everyone") == "Thanks everyone!"
+        assert process_translated_text("the slides look good") == "The slides look good."
+
+    def test_cleanup_rules(self):
+        """Test whitespace, trailing punctuation and double comma cleanup"""
+        from app.services.translation import add_punctuation_to_text
+
+        assert add_punctuation_to_text("  ok   then, , fine!!!  ") == "Ok then, fine!"
+        assert add_punctuation_to_text("你好 世界", "zh") == "你好 世界!"
+        assert add_punctuation_to_text("   ") == "   "
+
+    def test_batch_matches_single_calls(self):
+        """Test that the batch entry point matches per-text processing"""
+        from app.services.translation import process_translated_text, process_translated_texts
+
+        texts = ["wie geht es", "danke schön", "", "   ", "alles gut"]
+
+        assert process_translated_texts(texts, "de") == [process_translated_text(t, "de") for t in texts]
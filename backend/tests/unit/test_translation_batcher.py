@@ -0,0 +1,130 @@
+import asyncio
+
+import pytest
+
+from app.services.translation_batcher import TranslationBatcher
+
+
+class RecordingFlush:
+    """Async flush function that records every upstream batch"""
+
+    def __init__(self, fail: bool = False):
+        self.batches = []
+        self.fail = fail
+
+    async def __call__(self, contents, source_language, target_language):
+        self.batches.append((list(contents), source_language, target_language))
+        if self.fail:
+            raise RuntimeError("upstream unavailable")
+        return [f"{target_language}:{text}" for text in contents]
+
+
+class TestTranslationBatcher:
+    """Test cases for TranslationBatcher"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_request(self):
+        """Test that calls for the same pair within the window are coalesced"""
+        flush = RecordingFlush()
+        batcher = TranslationBatcher(flush, window_ms=20, max_batch_size=10, max_batch_chars=1000)
+
+        results = await asyncio.gather(*[batcher.submit(f"t{i}", "en", "es") for i in range(5)])
+
+        assert results == [f"es:t{i}" for i in range(5)]
+        assert flush.batches == [([f"t{i}" for i in range(5)], "en", "es")]
+
+    @pytest.mark.asyncio
+    async def test_pairs_are_batched_separately(self):
+        """Test that different language pairs never share a request"""
+        flush = RecordingFlush()
+        batcher = TranslationBatcher(flush, window_ms=20, max_batch_size=10, max_batch_chars=1000)
+
+        results = await asyncio.gather(
+            batcher.submit("a", "en", "es"),
+            batcher.submit("b", "en", "fr"),
+            batcher.submit("c", "en", "es"),
+        )
+
+        assert results == ["es:a", "fr:b", "es:c"]
+        assert sorted(flush.batches) == [(["a", "c"], "en", "es"), (["b"], "en", "fr")]
+
+    @pytest.mark.asyncio
+    async def test_size_and_char_caps_flush_early(self):
+        """Test that batches are split at the size and character caps"""
+        flush = RecordingFlush()
+        batcher = TranslationBatcher(flush, window_ms=1000, max_batch_size=2, max_batch_chars=1000)
+
+        await asyncio.wait_for(
+            asyncio.gather(*[batcher.submit(f"t{i}", "en", "es") for i in range(4)]),
+            timeout=0.5
+        )
+        assert [len(batch[0]) for batch in flush.batches] == [2, 2]
+
+        flush.batches.clear()
+        batcher = TranslationBatcher(flush, window_ms=20, max_batch_size=10, max_batch_chars=6)
+        await asyncio.gather(batcher.submit("aaaa", "en", "es"), batcher.submit("bbbb", "en", "es"))
+        assert [batch[0] for batch in flush.batches] == [["aaaa"], ["bbbb"]]
+
+    @pytest.mark.asyncio
+    async def test_duplicates_are_sent_once(self):
+        """Test that identical texts in one window produce one upstream content"""
+        flush = RecordingFlush()
+        batcher = TranslationBatcher(flush, window_ms=20, max_batch_size=10, max_batch_chars=1000)
+
+        results = await asyncio.gather(*[batcher.submit("yes", "en", "de") for _ in range(3)])
+
+        assert results == ["de:yes"] * 3
+        assert flush.batches == [(["yes"], "en", "de")]
+
+    @pytest.mark.asyncio
+    async def test_errors_reach_every_caller(self):
+        """Test that an upstream failure is raised to each waiting caller"""
+        flush = RecordingFlush(fail=True)
+        batcher = TranslationBatcher(flush, window_ms=10, max_batch_size=10, max_batch_chars=1000)
+
+        results = await asyncio.gather(
+            batcher.submit("a", "en", "es"),
+            batcher.submit("b", "en", "es"),
+            return_exceptions=True
+        )
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_callers_are_not_sent(self):
+        """Test that texts whose callers were cancelled while queued never go upstream"""
+        flush = RecordingFlush()
+        batcher = TranslationBatcher(flush, window_ms=20, max_batch_size=10, max_batch_chars=1000)
+
+        stale = asyncio.create_task(batcher.submit("next", "en", "es"))
+        latest = asyncio.create_task(batcher.submit("next slide", "en", "es"))
+        await asyncio.sleep(0)
+        stale.cancel()
+
+        assert await latest == "es:next slide"
+        assert flush.batches == [(["next slide"], "en", "es")]
+
+    @pytest.mark.asyncio
+    async def test_close_cancels_queued_and_in_flight_batches(self):
+        """Test that closing the batcher cancels its send tasks and releases every caller"""
+        started = asyncio.Event()
+
+        async def hanging_flush(texts, source_language, target_language):
+            started.set()
+            await asyncio.sleep(60)
+
+        batcher = TranslationBatcher(hanging_flush, window_ms=1000, max_batch_size=1, max_batch_chars=1000)
+        sent = asyncio.create_task(batcher.submit("sent", "en", "es"))
+        await started.wait()
+        batcher.max_batch_size = 10
+        queued = asyncio.create_task(batcher.submit("queued", "en", "fr"))
+        await asyncio.sleep(0)
+        assert batcher.get_stats()["in_flight_batches"] == 1
+        assert batcher.get_stats()["pending_batches"] == 1
+
+        await batcher.close()
+
+        results = await asyncio.wait_for(asyncio.gather(sent, queued, return_exceptions=True), timeout=1)
+        assert all(isinstance(result, asyncio.CancelledError) for result in results)
+        assert batcher.get_stats()["in_flight_batches"] == 0
+        assert batcher.get_stats()["pending_batches"] == 0
@@ -0,0 +1,108 @@
+import pytest
+
+import app.services.translation_cache as translation_cache_module
+from app.services.translation_cache import LRUCache, TranslationCache
+
+
+class FakeRedis:
+    """Minimal async stand-in for the shared Redis client"""
+
+    def __init__(self, fail: bool = False):
+        self.data = {}
+        self.fail = fail
+        self.mget_calls = []
+
+    async def get(self, key):
+        if self.fail:
+            raise ConnectionError("redis down")
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        if self.fail:
+            raise ConnectionError("redis down")
+        self.data[key] = value
+
+    async def mget(self, keys):
+        if self.fail:
+            raise ConnectionError("redis down")
+        self.mget_calls.append(list(keys))
+        return [self.data.get(key) for key in keys]
+
+
+class TestLRUCache:
+    """Test cases for LRUCache"""
+
+    def test_evicts_least_recently_used(self):
+        """Test that the oldest untouched entry is evicted at capacity"""
+        cache = LRUCache(max_entries=2, ttl_seconds=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.evictions == 1
+
+    def test_entries_expire(self):
+        """Test that entries past their TTL are dropped"""
+        cache = LRUCache(max_entries=2, ttl_seconds=-1)
+        cache.set("a", 1)
+
+        assert cache.get("a") is None
+        assert cache.expirations == 1
+
+
+class TestTranslationCache:
+    """Test cases for TranslationCache"""
+
+    def test_keys_normalize_whitespace(self):
+        """Test that keys ignore surrounding and repeated whitespace but keep case"""
+        key = TranslationCache.translation_key("can you hear me", "en", "es")
+
+        assert TranslationCache.translation_key("  can  you\thear me ", "en", "es") == key
+        assert TranslationCache.translation_key("Can you hear me", "en", "es") != key
+        assert TranslationCache.translation_key("can you hear me", "en", "fr") != key
+
+    @pytest.mark.asyncio
+    async def test_redis_tier_is_shared(self, monkeypatch):
+        """Test that a value stored by one worker's cache is found by another's"""
+        redis = FakeRedis()
+        monkeypatch.setattr(translation_cache_module, "get_redis_client", lambda: redis)
+        worker_a = TranslationCache(use_redis=True)
+        worker_b = TranslationCache(use_redis=True)
+
+        await worker_a.set("k", "hola")
+
+        assert await worker_b.get("k") == "hola"
+        assert await worker_b.get("k") == "hola"
+        assert worker_b.get_stats()["redis_hits"] == 1
+        assert worker_b.get_stats()["local_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_redis_failure_degrades_to_local(self, monkeypatch):
+        """Test that Redis errors count as misses and pause the Redis tier"""
+        redis = FakeRedis(fail=True)
+        monkeypatch.setattr(translation_cache_module, "get_redis_client", lambda: redis)
+        cache = TranslationCache(use_redis=True)
+
+        assert await cache.get("k") is None
+        await cache.set("k", "hola")
+
+        assert await cache.get("k") == "hola"
+        assert cache.get_stats()["redis_errors"] == 1
+
+    @pytest.mark.asyncio
+    async def test_get_many_reads_local_misses_in_one_round_trip(self, monkeypatch):
+        """Test that a multi-key lookup sends only the local misses to Redis, in one MGET"""
+        redis = FakeRedis()
+        monkeypatch.setattr(translation_cache_module, "get_redis_client", lambda: redis)
+        cache = TranslationCache(use_redis=True)
+        await TranslationCache(use_redis=True).set("b", "dos")
+        await cache.set("a", "uno")
+
+        assert await cache.get_many(["a", "b", "c"]) == ["uno", "dos", None]
+        assert redis.mget_calls == [["b", "c"]]
+        assert cache.get_stats()["local_hits"] == 1
+        assert cache.get_stats()["redis_hits"] == 1
+        assert cache.get_stats()["misses"] == 1
@@ -0,0 +1,240 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.services.translation_engine import (
+    AsyncTranslationEngine,
+    TranslationBackend,
+    TranslationTimeoutError,
+)
+from app.services.translation_cache import TranslationCache
+
+
+def make_engine(backend, **kwargs):
+    """Build an engine whose cache stays in-process"""
+    return AsyncTranslationEngine(backend, cache=TranslationCache(use_redis=False), **kwargs)
+
+
+class FakeBackend(TranslationBackend):
+    """Blocking in-process stand-in for Google Cloud Translate"""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def translate_batch(self, contents, source_language, target_language):
+        with self._lock:
+            self.calls.append((list(contents), source_language, target_language))
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        return [f"[{target_language}] {text}" for text in contents]
+
+    def detect_language(self, text):
+        return {"detected_language": "fr", "confidence": 0.95, "is_reliable": True}
+
+
+class TestAsyncTranslationEngine:
+    """Test cases for AsyncTranslationEngine"""
+
+    def test_backend_is_an_interface_only(self):
+        """Test that TranslationBackend cannot be used as a backend itself"""
+        with pytest.raises(TypeError):
+            TranslationBackend()
+
+    @pytest.mark.asyncio
+    async def test_translate_text_uses_backend(self):
+        """Test that translation is delegated to the backend and keeps the service result shape"""
+        backend = FakeBackend()
+        engine = make_engine(backend, max_concurrency=2, timeout=1.0)
+
+        result = await engine.translate_text("Hello", "en", "es")
+
+        assert result == {
+            "original_text": "Hello",
+            "translated_text": "[es] Hello",
+            "source_language": "en",
+            "target_language": "es",
+            "confidence": 1.0
+        }
+        assert backend.calls == [(["Hello"], "en", "es")]
+
+    @pytest.mark.asyncio
+    async def test_same_language_skips_backend(self):
+        """Test that same-language requests are answered locally"""
+        backend = FakeBackend()
+        engine = make_engine(backend)
+
+        result = await engine.translate_text("Hello world", "en", "en")
+
+        assert result["translated_text"] == "Hello world."
+        assert backend.calls == []
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self):
+        """Test that no more than max_concurrency backend calls run at once"""
+        backend = FakeBackend(delay=0.05)
+        engine = make_engine(backend, max_concurrency=2, timeout=1.0, batch_window_ms=0)
+
+        await asyncio.gather(*[engine.translate_text(f"text {i}", "en", "de") for i in range(6)])
+
+        assert len(backend.calls) == 6
+        assert backend.max_active == 2
+
+    @pytest.mark.asyncio
+    async def test_event_loop_stays_responsive(self):
+        """Test that a slow backend call does not block other coroutines"""
+        backend = FakeBackend(delay=0.2)
+        engine = make_engine(backend, timeout=1.0)
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker_task = asyncio.create_task(ticker())
+        await engine.translate_text("Hello", "en", "es")
+        ticker_task.cancel()
+
+        assert ticks >= 5
+
+    @pytest.mark.asyncio
+    async def test_timeout_raises(self):
+        """Test that a backend call exceeding the timeout raises TranslationTimeoutError"""
+        backend = FakeBackend(delay=0.3)
+        engine = make_engine(backend, timeout=0.05)
+
+        with pytest.raises(TranslationTimeoutError):
+            await engine.translate_text("Hello", "en", "es")
+
+    @pytest.mark.asyncio
+    async def test_async_backend_and_detection(self):
+        """Test that coroutine backends are awaited directly"""
+
+        class AsyncBackend(TranslationBackend):
+            async def translate_batch(self, contents, source_language, target_language):
+                return [text.upper() for text in contents]
+
+            async def detect_language(self, text):
+                return {"detected_language": "fr", "confidence": 0.9, "is_reliable": True}
+
+        engine = make_engine(AsyncBackend())
+
+        result = await engine.translate_with_detection("bonjour", target_language="en")
+
+        assert result["translated_text"] == "BONJOUR"
+        assert result["detected_language"] == "fr"
+        assert result["is_reliable_detection"] is True
+
+    @pytest.mark.asyncio
+    async def test_cache_serves_repeats_unless_bypassed(self):
+        """Test that repeated phrases are answered from the cache and bypass forces an upstream call"""
+        backend = FakeBackend()
+        engine = make_engine(backend, batch_window_ms=0)
+
+        first = await engine.translate_text("next slide", "en", "es")
+        second = await engine.translate_text("  next   slide ", "en", "es")
+        await engine.translate_text("next slide", "en", "es", use_cache=False)
+
+        assert first["translated_text"] == "[es] next slide"
+        assert second["translated_text"] == "[es] next slide"
+        assert len(backend.calls) == 2
+        assert engine.cache.get_stats()["local_hits"] == 1
+
+
+class TestBatchItems:
+    """Test cases for multi-item translation with per-item error isolation"""
+
+    @pytest.mark.asyncio
+    async def test_items_grouped_by_pair_with_isolated_errors(self):
+        """Test that items share upstream calls per pair and one bad item fails alone"""
+
+        class PickyBackend(TranslationBackend):
+            def __init__(self):
+                self.calls = []
+
+            async def translate_batch(self, contents, source_language, target_language):
+                self.calls.append((list(contents), source_language, target_language))
+                if "bad" in contents:
+                    raise ValueError("unsupported content")
+                return [f"[{target_language}] {text}" for text in contents]
+
+        backend = PickyBackend()
+        engine = make_engine(backend)
+        items = [
+            ("hello", "en", "es"),
+            ("bad", "en", "es"),
+            ("bye", "en", "es"),
+            ("hello", "en", "fr"),
+            ("same here", "en", "en"),
+            ("", "en", "de"),
+        ]
+
+        results = dict([pair async for pair in engine.iter_translate_items(items)])
+
+        assert results[0]["translated_text"] == "[es] hello"
+        assert results[1] == {"error": "unsupported content"}
+        assert results[2]["translated_text"] == "[es] bye"
+        assert results[3]["translated_text"] == "[fr] hello"
+        assert results[4]["translated_text"] == "Same here."
+        assert results[5]["translated_text"] == ""
+        assert (["hello", "bad", "bye"], "en", "es") in backend.calls
+        assert (["hello"], "en", "fr") in backend.calls
+
+    @pytest.mark.asyncio
+    async def test_cached_items_are_looked_up_together(self):
+        """Test that batch items are checked against the cache in one lookup and only misses go upstream"""
+        backend = FakeBackend()
+        engine = make_engine(backend)
+        await engine.cache.set(engine.cache.translation_key("hello", "en", "es"), "hola")
+        lookups = []
+        get_many = engine.cache.get_many
+
+        async def recording_get_many(keys):
+            lookups.append(keys)
+            return await get_many(keys)
+
+        engine.cache.get_many = recording_get_many
+        items = [("hello", "en", "es"), ("bye", "en", "es"), ("hello", "en", "fr")]
+
+        results = dict([pair async for pair in engine.iter_translate_items(items)])
+
+        assert len(lookups) == 1 and len(lookups[0]) == 3
+        assert results[0]["translated_text"] == "hola"
+        assert sorted(call[0] for call in backend.calls) == [["bye"], ["hello"]]
+
+    @pytest.mark.asyncio
+    async def test_every_item_is_answered_when_a_request_breaks(self):
+        """Test that short upstream replies and unexpected errors still yield one line per item"""
+
+        class ShortBackend(TranslationBackend):
+            async def translate_batch(self, contents, source_language, target_language):
+                return [] if target_language == "es" else [f"[{target_language}] {text}" for text in contents]
+
+        engine = make_engine(ShortBackend())
+
+        async def broken_set(key, value):
+            raise RuntimeError("cache exploded")
+
+        engine.cache.set = broken_set
+        items = [("hello", "en", "es"), ("bye", "en", "es"), ("hello", "en", "fr"), ("bye", "en", "fr")]
+
+        async def collect():
+            return dict([pair async for pair in engine.iter_translate_items(items)])
+
+        results = await asyncio.wait_for(collect(), timeout=2)
+
+        assert sorted(results) == [0, 1, 2, 3]
+        assert "error" in results[0] and "error" in results[1]
+        # The first fr result got out before the cache failed; the other is reported as an error
+        assert results[2]["translated_text"] == "[fr] hello"
+        assert results[3] == {"error": "cache exploded"}
@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+
+import app.api.v1.deepgram as deepgram_api
+from app.utils.vad import VoiceActivityGate
+from tests.unit.test_pcm import AudioWebSocket, RecordingLiveService
+
+FRAME = 320  # 20 ms at 16 kHz
+
+
+def tone(frames, amplitude=0.3, frequency=220):
+    t = np.arange(frames * FRAME) / 16000
+    return (amplitude * np.sin(2 * np.pi * frequency * t) * 32767).astype("<i2").tobytes()
+
+
+def silence(frames, noise=0.0005):
+    rng = np.random.default_rng(0)
+    return (rng.normal(0, noise, frames * FRAME) * 32767).astype("<i2").tobytes()
+
+
+def make_gate(**overrides):
+    options = dict(energy_threshold_db=-45.0, pre_roll_ms=100, hangover_ms=60)
+    options.update(overrides)
+    return VoiceActivityGate(**options)
+
+
+class TestVoiceActivityGate:
+    """Test cases for VoiceActivityGate"""
+
+    def test_silence_is_dropped(self):
+        """Test that frames below the energy threshold are not forwarded"""
+        gate = make_gate()
+
+        assert gate.process(silence(50)) == b""
+        assert gate.get_stats()["seconds_saved"] == 1.0
+
+    def test_speech_onset_keeps_pre_roll(self):
+        """Test that the frames just before speech are sent ahead of it"""
+        gate = make_gate()
+        quiet, speech = silence(20), tone(10)
+
+        forwarded = gate.process(quiet) + gate.process(speech)
+
+        pre_roll = quiet[-5 * FRAME * 2:]
+        assert forwarded == pre_roll + speech
+
+    def test_hangover_follows_speech(self):
+        """Test that a short tail of silence is forwarded after speech ends"""
+        gate = make_gate()
+        speech, quiet = tone(10), silence(20)
+
+        forwarded = gate.process(speech + quiet)
+
+        assert forwarded == speech + quiet[:3 * FRAME * 2]
+        stats = gate.get_stats()
+        assert stats["frames_in"] == 30
+        assert stats["frames_sent"] == 13
+        assert stats["bytes_saved"] == 17 * FRAME * 2
+
+    def test_frames_split_across_chunks(self):
+        """Test that chunk boundaries inside a frame do not lose audio"""
+        gate = make_gate(pre_roll_ms=0, hangover_ms=0)
+        speech = tone(10)
+
+        forwarded = b"".join(gate.process(speech[i:i + 333]) for i in range(0, len(speech), 333))
+
+        assert forwarded == speech
+
+
+class TestLiveTranscribeVAD:
+    """Test cases for the VAD stage on /ws/live-transcribe"""
+
+    @pytest.mark.asyncio
+    async def test_silence_is_kept_off_the_upstream(self, monkeypatch):
+        """Test that only speech (plus pre-roll and hangover) is forwarded when vad=true"""
+        service = RecordingLiveService()
+        monkeypatch.setattr(deepgram_api, "deepgram_service", service)
+        audio = silence(200) + tone(25) + silence(200)
+        chunks = [audio[i:i + 4096] for i in range(0, len(audio), 4096)]
+        websocket = AudioWebSocket(chunks, {"sample_rate": "16000", "vad": "true"})
+
+        await deepgram_api.websocket_live_transcribe(websocket)
+
+        assert 0 < len(service.audio) < len(audio) // 5
+
+    @pytest.mark.asyncio
+    async def test_vad_is_off_unless_requested(self, monkeypatch):
+        """Test that every frame is forwarded by default"""
+        service = RecordingLiveService()
+        monkeypatch.setattr(deepgram_api, "deepgram_service", service)
+        audio = silence(100)
+        websocket = AudioWebSocket([audio], {"sample_rate": "16000"})
+
+        await deepgram_api.websocket_live_transcribe(websocket)
+
+        assert service.audio == audio
@@ -0,0 +1,65 @@
+import json
+
+import pytest
+
+import app.services.websocket_manager as websocket_manager_module
+from app.services.translation_cache import TranslationCache
+from app.services.translation_engine import AsyncTranslationEngine, TranslationBackend
+from app.services.websocket_manager import ConnectionManager
+
+
+class FakeWebSocket:
+    """Records the text frames sent to one participant"""
+
+    def __init__(self):
+        self.sent = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        self.sent.append(json.loads(text))
+
+
+class CountingBackend(TranslationBackend):
+    def __init__(self):
+        self.calls = []
+
+    async def translate_batch(self, contents, source_language, target_language):
+        self.calls.append((list(contents), source_language, target_language))
+        return [f"[{target_language}] {text}" for text in contents]
+
+    async def detect_language(self, text):
+        return {"detected_language": "en", "confidence": 0.99, "is_reliable": True}
+
+
+class TestUtteranceFanOut:
+    """Test cases for server-side multi-target translation"""
+
+    @pytest.mark.asyncio
+    async def test_one_translation_per_language(self, monkeypatch):
+        """Test that a room translates once per distinct language and each user gets only theirs"""
+        backend = CountingBackend()
+        engine = AsyncTranslationEngine(backend, cache=TranslationCache(use_redis=False))
+        monkeypatch.setattr(websocket_manager_module, "translation_engine", engine)
+
+        manager = ConnectionManager()
+        sockets = {}
+        languages = {"speaker": "en", "a": "es", "b": "es", "c": "fr", "d": "de", "e": "fr", "f": None}
+        for user_id, language in languages.items():
+            sockets[user_id] = FakeWebSocket()
+            user_settings = {"targetLanguage": language} if language else {}
+            await manager.connect(sockets[user_id], "room", user_id, user_settings)
+        for socket in sockets.values():
+            socket.sent.clear()
+
+        await manager.handle_utterance("room", "speaker", {"text": "next slide", "sourceLanguage": "en"})
+
+        assert sorted(call[2] for call in backend.calls) == ["de", "es", "fr"]
+        assert sockets["speaker"].sent == []
+        for user_id in ("a", "b", "c", "d", "e"):
+            message = sockets[user_id].sent[0]
+            assert message["type"] == "translation"
+            assert message["targetLanguage"] == languages[user_id]
+            assert message["translated"] == f"[{languages[user_id]}] next slide"
+        assert sockets["f"].sent[0]["translated"] == "Next slide."
@@ -0,0 +1,86 @@
+import json
+from array import array
+
+import pytest
+
+from app.api.v1 import deepgram as deepgram_api
+from app.services.transcription_cache import TranscriptionCache
+from app.utils.word_columns import WordColumns
+from tests.unit.test_audio_io import make_request
+from tests.unit.test_deepgram import make_response, make_service
+
+WORDS = [
+    {"word": "hola", "start": 0.1, "end": 0.4, "confidence": 0.99},
+    {"word": "a", "start": 0.4, "end": 0.5, "confidence": 0.9},
+    {"word": "todos", "start": 0.5, "end": 0.9, "confidence": 0.95}
+]
+
+
+class TestWordColumns:
+    """Test cases for WordColumns"""
+
+    def test_columns_round_trip_to_dicts(self):
+        """Test that per-word dicts survive conversion to columns and back"""
+        columns = WordColumns.from_words(WORDS)
+
+        assert len(columns) == 3
+        assert isinstance(columns.start, array) and columns.start.typecode == "d"
+        assert columns.to_dicts() == WORDS
+
+    def test_json_round_trip(self):
+        """Test that the serialized columns rebuild an equal structure"""
+        columns = WordColumns.from_words(WORDS)
+
+        data = json.loads(json.dumps(columns.to_json()))
+
+        assert data == {
+            "word": ["hola", "a", "todos"],
+            "start": [0.1, 0.4, 0.5],
+            "end": [0.4, 0.5, 0.9],
+            "confidence": [0.99, 0.9, 0.95]
+        }
+        assert WordColumns.from_json(data) == columns
+
+
+class TestColumnarTranscription:
+    """Test cases for the columns word format"""
+
+    @pytest.mark.asyncio
+    async def test_service_returns_columns_on_request(self):
+        """Test that columnar_words switches the words to WordColumns and nothing else"""
+        service = make_service(make_response())
+
+        objects = await service.transcribe_audio_data(b"audio", "es")
+        columns = await service.transcribe_audio_data(b"audio", "es", columnar_words=True)
+
+        assert isinstance(columns["words"], WordColumns)
+        assert columns["words"].to_dicts() == objects["words"]
+        assert {**columns, "words": None} == {**objects, "words": None}
+
+    @pytest.mark.asyncio
+    async def test_cached_result_serves_both_formats(self, tmp_path):
+        """Test that a result cached in one word format is returned in the other"""
+        service = make_service(make_response())
+        service.result_cache = TranscriptionCache(enabled=True, use_redis=False, cache_dir=str(tmp_path))
+
+        columns = await service.transcribe_audio_data(b"audio", "es", columnar_words=True)
+        objects = await service.transcribe_audio_data(b"audio", "es")
+
+        assert len(service._prerecorded.calls) == 1
+        assert objects["words"] == columns["words"].to_dicts()
+
+    @pytest.mark.asyncio
+    async def test_endpoint_serializes_columns(self, monkeypatch):
+        """Test that word_format=columns returns parallel arrays instead of word objects"""
+        service = make_service(make_response())
+        monkeypatch.setattr(deepgram_api, "deepgram_service", service)
+        request = make_request([b"audio"], query_string=b"word_format=columns")
+
+        response = await deepgram_api.transcribe_audio(
+            request, language="es", auto_detect=True, word_format="columns"
+        )
+
+        body = json.loads(response.body)
+        assert body["transcript"] == "hola a todos"
+        assert body["words"]["word"] == ["hola", "a", "todos"]
+        assert body["words"]["end"] == [0.4, 0.5, 0.9]
@@ -311,13 +311,16 @@ export const useDeepgram = () => {
       // Get user mic
       const stream = await navigator.mediaDevices.getUserMedia({ audio: true });
       audioStreamRef.current = stream;
-      // Open WebSocket
-      const ws = new WebSocket(`ws://localhost:8000/api/v1/deepgram/ws/live-transcribe?language=${inputLanguage}`);
-      ws.binaryType = 'arraybuffer';
-      wsRef.current = ws;
       // Setup audio context and processor
       const audioContext = new (window.AudioContext || (window as any).webkitAudioContext)();
       audioContextRef.current = audioContext;
+      // Open WebSocket, declaring the format of the PCM we send
+      const ws = new WebSocket(
+        `ws://localhost:8000/api/v1/deepgram/ws/live-transcribe?language=${inputLanguage}` +
+        `&encoding=linear16&sample_rate=${audioContext.sampleRate}&channels=1`
+      );
+      ws.binaryType = 'arraybuffer';
+      wsRef.current = ws;
       const source = audioContext.createMediaStreamSource(stream);
       const processor = audioContext.createScriptProcessor(4096, 1, 1);
       processorRef.current = processor;